@@ -15,10 +15,35 @@
  * @default translations/
  *
  * @param Auto Detect Translations
- * @desc 是否自動偵測並載入所有可用的翻譯檔案
+ * @desc 是否自動偵測可用的翻譯檔案 (優先讀取 translations/manifest.json)；
+ *       關閉時只使用預設語言，仍會讀取清單中該語言的地圖分片、翻譯包與壓縮檔
  * @type boolean
  * @default true
  *
+ * @param Translation Mode
+ * @desc 翻譯模式: simple (僅完整比對) 或 full (允許從完整訊息中提取子字串翻譯)
+ * @type select
+ * @option simple
+ * @option full
+ * @default simple
+ *
+ * @param Translation Cache Size
+ * @desc 每個語言快取的翻譯結果數量上限 (0 表示停用快取)
+ * @type number
+ * @min 0
+ * @default 5000
+ *
+ * @param Max Loaded Languages
+ * @desc 同時保留在記憶體中的語言字典數量上限，超過時釋放最久未使用的語言 (0 表示不限制)
+ * @type number
+ * @min 0
+ * @default 2
+ *
+ * @param Enable Profiling
+ * @desc 記錄翻譯各步驟的耗時與未翻譯的原文 (可用 TranslationManager.exportMissLog() 匯出)
+ * @type boolean
+ * @default false
+ *
  * @help
  * ============================================================================
  * 動態翻譯系統 - 支援 mtool 工具格式
@@ -65,14 +90,29 @@
  *
  * 使用方法:
  * 1. 使用 mtool 工具生成翻譯檔案並放在 translations/ 目錄中
- * 2. 系統會自動載入所有可用的翻譯檔案
+ * 2. 系統會讀取 translations/manifest.json (由 install_plugin.py 產生)
+ *    並只在啟動時載入目前語言，其他語言會在切換時才載入；
+ *    沒有 manifest 時則逐一嘗試載入常見語言的翻譯檔案
+ *    若使用 install_plugin.py shard 產生地圖分片，啟動時只載入共用分片，
+ *    並在切換地圖時載入該地圖的分片
+ *    若使用 install_plugin.py pack 產生二進位翻譯包 (.dtp)，會優先讀取翻譯包，
+ *    讀取失敗或環境不支援時改用 JSON
+ *    若使用 install_plugin.py compress 產生 gzip 壓縮檔 (.json.gz)，網頁版會讀取壓縮檔
+ *    並以 DecompressionStream 解壓縮，讀取失敗或環境不支援時改用 JSON
+ *    若使用 install_plugin.py prebake 產生 data_<語言>/ 資料目錄，
+ *    遊戲會直接讀取已翻譯的資料檔，對話文字不再於執行時查找翻譯
  * 3. 在選項選單中選擇語言，或使用腳本呼叫切換語言
  * 4. 所有介面文字會自動更新為新語言
  *
  * 腳本呼叫:
- *   TranslationManager.setLanguage('en');     // 切換到英文
+ *   TranslationManager.setLanguage('en');     // 切換到英文 (載入完成前維持原本的語言)
+ *   TranslationManager.setLanguage('en').then(function (switched) { ... }); // 切換完成後執行
  *   TranslationManager.getCurrentLanguage(); // 取得當前語言
  *   TranslationManager.getAvailableLanguages(); // 取得可用語言列表
+ *   TranslationManager.setProfiling(true);    // 開始記錄耗時與未翻譯的原文
+ *   TranslationManager.getStatus().profile;   // 各步驟的呼叫次數與耗時
+ *   TranslationManager.exportMissLog();       // 匯出未翻譯的原文與出現次數
+ *   TranslationManager.saveMissLog();         // 將上述記錄存成 JSON 檔
  *
  * 外掛命令:
  *   SetLanguage en    // 切換到英文
@@ -90,136 +130,1418 @@
     var translationPath = parameters['Translation Path'] || 'translations/';
     var autoDetectTranslations = parameters['Auto Detect Translations'] === 'true';
     var translationMode = parameters['Translation Mode'] || 'simple'; // simple, full
+    var translationCacheSize = parameters['Translation Cache Size'] !== undefined && parameters['Translation Cache Size'] !== ''
+        ? Number(parameters['Translation Cache Size']) : 5000;
+    var maxLoadedLanguages = parameters['Max Loaded Languages'] !== undefined && parameters['Max Loaded Languages'] !== ''
+        ? Number(parameters['Max Loaded Languages']) : 2;
+    var enableProfiling = parameters['Enable Profiling'] === 'true';
+
+    // 高精度計時（不支援時退回 Date.now）
+    var now = typeof performance !== 'undefined' && performance.now
+        ? function () { return performance.now(); }
+        : function () { return Date.now(); };
+
+    // BinaryDictionary 類別 - 讀取 install_plugin.py pack 產生的二進位翻譯檔 (.dtp)
+    // 字串以 UTF-8 或 UTF-16LE 存放在去重複的字串表中，查找時才解碼，
+    // 不會為每個項目建立物件屬性；格式說明見 install_plugin.py 的 PACK_* 常數
+    var BinaryDictionary = function (buffer) {
+        if (!buffer || buffer.byteLength < BinaryDictionary.HEADER_SIZE) {
+            throw new Error('翻譯包格式錯誤: 檔案過小');
+        }
+        var header = new DataView(buffer, 0, BinaryDictionary.HEADER_SIZE);
+        var magic = String.fromCharCode(header.getUint8(0), header.getUint8(1), header.getUint8(2), header.getUint8(3));
+        if (magic !== BinaryDictionary.MAGIC || header.getUint16(4, true) !== BinaryDictionary.VERSION) {
+            throw new Error('翻譯包格式錯誤: 不支援的檔頭');
+        }
+
+        var flags = header.getUint16(6, true);
+        var count = header.getUint32(8, true);
+        var stringCount = header.getUint32(12, true);
+        var bucketCount = header.getUint32(16, true);
+        var dataLength = header.getUint32(20, true);
+        var offset = BinaryDictionary.HEADER_SIZE;
+        if (offset + (stringCount + 1 + count * 3 + bucketCount) * 4 + dataLength > buffer.byteLength) {
+            throw new Error('翻譯包格式錯誤: 檔案不完整');
+        }
+
+        this._count = count;
+        this._offsets = new Uint32Array(buffer, offset, stringCount + 1);
+        offset += (stringCount + 1) * 4;
+        this._entries = new Uint32Array(buffer, offset, count * 2); // [key 字串編號, 譯文字串編號]
+        offset += count * 8;
+        this._sorted = new Uint32Array(buffer, offset, count); // 依 key 排序的項目編號
+        offset += count * 4;
+        this._buckets = new Uint32Array(buffer, offset, bucketCount); // 雜湊表（項目編號 + 1）
+        offset += bucketCount * 4;
+        this._data = new Uint8Array(buffer, offset, dataLength);
+        this._decoder = new TextDecoder(flags & BinaryDictionary.FLAG_UTF16 ? 'utf-16le' : 'utf-8');
+        this._extra = new Map(); // 以 set() 新增的項目
+    };
+
+    BinaryDictionary.MAGIC = 'DTPK';
+    BinaryDictionary.VERSION = 1;
+    BinaryDictionary.HEADER_SIZE = 64;
+    BinaryDictionary.FLAG_UTF16 = 1;
+
+    // 需要 TextDecoder，且 Uint32Array 直接讀取 little-endian 資料
+    BinaryDictionary.isSupported = function () {
+        return typeof TextDecoder !== 'undefined' && typeof ArrayBuffer !== 'undefined' &&
+            new Uint8Array(new Uint32Array([1]).buffer)[0] === 1;
+    };
+
+    // 32 位元 FNV-1a（以 UTF-16 單位計算，與 install_plugin.py 的 pack_hash 相同）
+    BinaryDictionary.hash = function (text) {
+        var hash = 0x811c9dc5;
+        for (var i = 0; i < text.length; i++) {
+            hash = Math.imul(hash ^ text.charCodeAt(i), 0x01000193);
+        }
+        return hash >>> 0;
+    };
+
+    BinaryDictionary.prototype._string = function (id) {
+        return this._decoder.decode(this._data.subarray(this._offsets[id], this._offsets[id + 1]));
+    };
+
+    // 找出 key 的項目編號：有雜湊表時以雜湊查找，否則在排序表上二分搜尋
+    BinaryDictionary.prototype._find = function (key) {
+        var buckets = this._buckets;
+        var entries = this._entries;
+        if (buckets.length > 0) {
+            var mask = buckets.length - 1;
+            var slot = BinaryDictionary.hash(key) & mask;
+            while (buckets[slot] !== 0) {
+                var id = buckets[slot] - 1;
+                if (this._string(entries[id * 2]) === key) return id;
+                slot = (slot + 1) & mask;
+            }
+            return -1;
+        }
+
+        var sorted = this._sorted;
+        var low = 0;
+        var high = sorted.length - 1;
+        while (low <= high) {
+            var middle = (low + high) >>> 1;
+            var candidate = this._string(entries[sorted[middle] * 2]);
+            if (candidate === key) return sorted[middle];
+            if (candidate < key) {
+                low = middle + 1;
+            } else {
+                high = middle - 1;
+            }
+        }
+        return -1;
+    };
+
+    BinaryDictionary.prototype.get = function (key) {
+        if (this._extra.size > 0 && this._extra.has(key)) return this._extra.get(key);
+        var id = this._find(key);
+        return id === -1 ? undefined : this._string(this._entries[id * 2 + 1]);
+    };
+
+    BinaryDictionary.prototype.has = function (key) {
+        return this._extra.has(key) || this._find(key) !== -1;
+    };
+
+    // 新增的項目存放在記憶體中（翻譯包本身唯讀）
+    BinaryDictionary.prototype.set = function (key, value) {
+        this._extra.set(key, value);
+    };
+
+    BinaryDictionary.prototype.delete = function (key) {
+        this._extra.delete(key);
+    };
+
+    // 依原始檔案順序對每個 key 呼叫 callback(key, ref)，key 逐一解碼且不保留
+    // ref 為翻譯包中的項目編號（新增的項目則為 key 本身），可用 keyAt(ref) 重新取得 key
+    BinaryDictionary.prototype.forEachKey = function (callback, thisArg) {
+        for (var id = 0; id < this._count; id++) {
+            callback.call(thisArg, this._string(this._entries[id * 2]), id);
+        }
+        this._extra.forEach(function (_value, key) {
+            if (this._find(key) === -1) callback.call(thisArg, key, key);
+        }, this);
+    };
+
+    BinaryDictionary.prototype.keyAt = function (ref) {
+        return typeof ref === 'number' ? this._string(this._entries[ref * 2]) : ref;
+    };
+
+    // 依原始檔案順序列出所有 key（每次呼叫都重新解碼，只有子字串索引需要保留全部 key）
+    BinaryDictionary.prototype.keys = function () {
+        var keys = [];
+        this.forEachKey(function (key) {
+            keys.push(key);
+        });
+        return keys;
+    };
+
+    BinaryDictionary.prototype.size = function () {
+        var size = this._count;
+        this._extra.forEach(function (_value, key) {
+            if (this._find(key) === -1) size++;
+        }, this);
+        return size;
+    };
+
+    // 字典存取：一般物件 (JSON) 與 BinaryDictionary 共用
+    var hasOwn = Object.prototype.hasOwnProperty;
+
+    var dictionaryGet = function (dictionary, key) {
+        if (dictionary instanceof BinaryDictionary) return dictionary.get(key);
+        return hasOwn.call(dictionary, key) ? dictionary[key] : undefined;
+    };
+
+    var dictionaryHas = function (dictionary, key) {
+        if (dictionary instanceof BinaryDictionary) return dictionary.has(key);
+        return hasOwn.call(dictionary, key);
+    };
+
+    var dictionaryKeys = function (dictionary) {
+        return dictionary instanceof BinaryDictionary ? dictionary.keys() : Object.keys(dictionary);
+    };
+
+    // 逐一列出 key 而不保留完整的 key 陣列：callback(key, ref)，ref 以 dictionaryKeyAt 換回 key
+    var dictionaryForEachKey = function (dictionary, callback, thisArg) {
+        if (dictionary instanceof BinaryDictionary) {
+            dictionary.forEachKey(callback, thisArg);
+            return;
+        }
+        for (var key in dictionary) {
+            if (hasOwn.call(dictionary, key)) callback.call(thisArg, key, key);
+        }
+    };
+
+    var dictionaryKeyAt = function (dictionary, ref) {
+        return dictionary instanceof BinaryDictionary ? dictionary.keyAt(ref) : ref;
+    };
+
+    var dictionarySize = function (dictionary) {
+        return dictionary instanceof BinaryDictionary ? dictionary.size() : Object.keys(dictionary).length;
+    };
+
+    var isDecompressionSupported = function () {
+        return typeof fetch === 'function' && typeof DecompressionStream === 'function' &&
+            typeof Response === 'function' && typeof TextDecoder !== 'undefined' &&
+            !(typeof location !== 'undefined' && location.protocol === 'file:');
+    };
+
+    // JsonParseWorker - 在 Web Worker 中解碼並解析大型 JSON 翻譯檔，避免主執行緒停頓
+    // 檔案內容以 ArrayBuffer 轉移給 Worker（不複製），解析結果以結構化複製傳回
+    var JsonParseWorker = {
+        _worker: null,
+        _jobs: {},
+        _nextId: 1,
+        _disabled: false
+    };
+
+    JsonParseWorker.SOURCE = [
+        'self.onmessage = function (event) {',
+        '    var message = event.data;',
+        '    try {',
+        '        var text = new TextDecoder("utf-8").decode(new Uint8Array(message.buffer));',
+        '        self.postMessage({ id: message.id, result: JSON.parse(text) });',
+        '    } catch (e) {',
+        '        self.postMessage({ id: message.id, error: String(e && e.message || e) });',
+        '    }',
+        '};'
+    ].join('\n');
+
+    JsonParseWorker.isSupported = function () {
+        return !JsonParseWorker._disabled && typeof Worker !== 'undefined' && typeof Blob !== 'undefined' &&
+            typeof URL !== 'undefined' && typeof URL.createObjectURL === 'function' &&
+            typeof TextDecoder !== 'undefined';
+    };
+
+    JsonParseWorker._getWorker = function () {
+        if (!JsonParseWorker._worker) {
+            var url = URL.createObjectURL(new Blob([JsonParseWorker.SOURCE], { type: 'text/javascript' }));
+            var worker = new Worker(url);
+            worker.onmessage = function (event) {
+                var message = event.data;
+                var job = JsonParseWorker._jobs[message.id];
+                if (!job) return;
+                delete JsonParseWorker._jobs[message.id];
+                job(message.error ? new Error(message.error) : null, message.result, false);
+            };
+            // Worker 無法執行（例如被安全性原則阻擋）時停用，未完成的工作交由呼叫端改在主執行緒處理
+            worker.onerror = function (event) {
+                console.warn('翻譯解析 Worker 無法使用，改在主執行緒解析:', event && event.message);
+                JsonParseWorker._disabled = true;
+                JsonParseWorker._worker = null;
+                var jobs = JsonParseWorker._jobs;
+                JsonParseWorker._jobs = {};
+                Object.keys(jobs).forEach(function (id) {
+                    jobs[id](new Error('Worker unavailable'), null, true);
+                });
+                worker.terminate();
+            };
+            JsonParseWorker._worker = worker;
+        }
+        return JsonParseWorker._worker;
+    };
+
+    // 交給 Worker 解析，無法建立 Worker 時回傳 false（buffer 仍可使用）
+    // callback(error, result, workerFailed)：workerFailed 為 true 時 buffer 已轉移，需重新讀取檔案
+    JsonParseWorker.parse = function (buffer, callback) {
+        var worker;
+        try {
+            worker = JsonParseWorker._getWorker();
+        } catch (e) {
+            console.warn('無法建立翻譯解析 Worker，改在主執行緒解析:', e);
+            JsonParseWorker._disabled = true;
+            return false;
+        }
+        var id = JsonParseWorker._nextId++;
+        JsonParseWorker._jobs[id] = callback;
+        worker.postMessage({ id: id, buffer: buffer }, [buffer]);
+        return true;
+    };
+
+    // SubstringIndex 類別 - full 模式使用的子字串索引
+    // 以 bigram 倒排索引找出候選 key，並依原字典的 key 順序驗證，
+    // 因此結果與逐一掃描所有 key 的結果相同
+    var SubstringIndex = function (dictionary) {
+        this.dictionary = dictionary;
+        this._keys = dictionaryKeys(dictionary);
+        this._bigrams = new Map(); // bigram -> 依序排列的 key 編號
+        this._unigrams = new Map(); // 單一字元 -> 最前面兩個包含它的 key 編號
+        this._build();
+    };
+
+    SubstringIndex.prototype._build = function () {
+        var keys = this._keys;
+        var bigrams = this._bigrams;
+        var unigrams = this._unigrams;
+
+        for (var id = 0; id < keys.length; id++) {
+            var key = keys[id];
+            var previous = -1;
+            for (var i = 0; i < key.length; i++) {
+                var code = key.charCodeAt(i);
+
+                var firstIds = unigrams.get(code);
+                if (!firstIds) {
+                    unigrams.set(code, [id]);
+                } else if (firstIds.length < 2 && firstIds[firstIds.length - 1] !== id) {
+                    firstIds.push(id);
+                }
+
+                if (previous !== -1) {
+                    var gram = previous * 65536 + code;
+                    var postings = bigrams.get(gram);
+                    if (!postings) {
+                        bigrams.set(gram, [id]);
+                    } else if (postings[postings.length - 1] !== id) {
+                        postings.push(id);
+                    }
+                }
+                previous = code;
+            }
+        }
+
+        // 轉為定型陣列以降低常駐記憶體
+        bigrams.forEach(function (postings, gram) {
+            bigrams.set(gram, Int32Array.from(postings));
+        });
+    };
+
+    // 依字典順序找出第一個包含 text（且不等於 text）的 key
+    // 回傳 { key: 完整 key, index: text 在 key 中的位置 }，找不到則回傳 null
+    SubstringIndex.prototype.find = function (text) {
+        var keys = this._keys;
+        var candidates;
+
+        if (text.length === 1) {
+            candidates = this._unigrams.get(text.charCodeAt(0));
+        } else {
+            // 以出現次數最少的 bigram 作為候選清單
+            for (var i = 0; i + 1 < text.length; i++) {
+                var postings = this._bigrams.get(text.charCodeAt(i) * 65536 + text.charCodeAt(i + 1));
+                if (!postings) return null;
+                if (!candidates || postings.length < candidates.length) {
+                    candidates = postings;
+                }
+            }
+        }
+        if (!candidates) return null;
+
+        for (var j = 0; j < candidates.length; j++) {
+            var key = keys[candidates[j]];
+            if (key !== text) {
+                var keyIndex = key.indexOf(text);
+                if (keyIndex !== -1) {
+                    return { key: key, index: keyIndex };
+                }
+            }
+        }
+        return null;
+    };
+
+    // MessageKeyIndex 類別 - 多行 key 的索引
+    // 以 key 第一行的雜湊對應到所有以該行開頭的多行 key（行數多者優先），
+    // 讓訊息中任一段連續的行都能一步找到對應的多行翻譯
+    // 只記錄 key 參照（翻譯包為項目編號），不保留 key 字串，比對時才取回 key
+    var MessageKeyIndex = function (dictionary) {
+        this.dictionary = dictionary;
+        this._keys = new Map(); // 第一行的雜湊 -> [{ ref, lineCount }]
+
+        dictionaryForEachKey(dictionary, function (key, ref) {
+            var newline = key.indexOf('\n');
+            if (newline === -1) return;
+
+            var hash = BinaryDictionary.hash(key.substring(0, newline));
+            var candidates = this._keys.get(hash);
+            if (!candidates) {
+                candidates = [];
+                this._keys.set(hash, candidates);
+            }
+            candidates.push({ ref: ref, lineCount: key.split('\n').length });
+        }, this);
+
+        this._keys.forEach(function (candidates) {
+            candidates.sort(function (a, b) { return b.lineCount - a.lineCount; });
+        });
+    };
+
+    // 找出從 lines[start] 開始、完全相符的最長多行 key，回傳 { key, lineCount }
+    MessageKeyIndex.prototype.match = function (lines, start) {
+        var candidates = this._keys.get(BinaryDictionary.hash(lines[start]));
+        if (!candidates) return null;
+
+        for (var i = 0; i < candidates.length; i++) {
+            var candidate = candidates[i];
+            if (start + candidate.lineCount > lines.length) continue;
+            var key = dictionaryKeyAt(this.dictionary, candidate.ref);
+            if (lines.slice(start, start + candidate.lineCount).join('\n') === key) {
+                return { key: key, lineCount: candidate.lineCount };
+            }
+        }
+        return null;
+    };
+
+    // NormalizedKeyIndex 類別 - 忽略控制字元與空白差異的 key 索引
+    // 正規化形式：去除頭尾空白、移除控制字元 (\C[n]、\N[n]、\V[n]、\{ 等)、
+    // 行內連續空白合併為一個空格並去除每行頭尾的空格；換行保持不變，單行文字不會對應到多行 key
+    // 只記錄本身不是正規化形式的 key，正規化形式的 key 直接查字典
+    // 以正規化形式的雜湊對應到 key 參照（翻譯包為項目編號），不保留 key 字串
+    var NormalizedKeyIndex = function (dictionary) {
+        this.dictionary = dictionary;
+        this._keys = new Map(); // 正規化形式的雜湊 -> [key 參照]
+
+        dictionaryForEachKey(dictionary, function (key, ref) {
+            var normalized = NormalizedKeyIndex.normalize(key);
+            if (normalized === key || !normalized) return;
+
+            var hash = BinaryDictionary.hash(normalized);
+            var candidates = this._keys.get(hash);
+            if (!candidates) {
+                candidates = [];
+                this._keys.set(hash, candidates);
+            }
+            candidates.push(ref);
+        }, this);
+    };
+
+    // RPG Maker 控制字元：字母加參數 (\C[1]、\FS[20])、單一字母 (\G) 與符號 (\{ \} \$ \. \| \! \> \< \^ \\)
+    NormalizedKeyIndex.ESCAPE_CODES = /\\(?:[A-Za-z]+\[[^\]\n]*\]|[A-Za-z]|[{}$.|!><^\\])/g;
+
+    NormalizedKeyIndex.normalize = function (text) {
+        return text.trim().replace(NormalizedKeyIndex.ESCAPE_CODES, '')
+            .replace(/[^\S\n]+/g, ' ').replace(/ ?\n ?/g, '\n').replace(/^ | $/g, '');
+    };
+
+    // 找出正規化後相同的 key，並將原文的控制字元放回譯文；找不到或無法放回時回傳 undefined
+    NormalizedKeyIndex.prototype.find = function (text) {
+        var normalized = NormalizedKeyIndex.normalize(text);
+        if (!normalized) return undefined;
+
+        var codes = NormalizedKeyIndex._findCodes(text);
+        var candidates = this._keys.get(BinaryDictionary.hash(normalized)) || [];
+        // 控制字元數量相同的 key 優先，其次是不含控制字元的 key
+        for (var i = 0; i < candidates.length; i++) {
+            var key = dictionaryKeyAt(this.dictionary, candidates[i]);
+            if (key === text || NormalizedKeyIndex.normalize(key) !== normalized) continue;
+            var keyCodes = NormalizedKeyIndex._findCodes(key);
+            if (keyCodes.length === codes.length) {
+                return this._replaceCodes(dictionaryGet(this.dictionary, key), keyCodes, codes);
+            }
+        }
+        if (normalized !== text && dictionaryHas(this.dictionary, normalized)) {
+            return NormalizedKeyIndex._wrapCodes(dictionaryGet(this.dictionary, normalized), text, codes);
+        }
+        return undefined;
+    };
+
+    // 依出現順序列出文字中的控制字元 [{ code, index }]
+    NormalizedKeyIndex._findCodes = function (text) {
+        var codes = [];
+        text.replace(NormalizedKeyIndex.ESCAPE_CODES, function (code, index) {
+            codes.push({ code: code, index: index });
+            return code;
+        });
+        return codes;
+    };
+
+    // key 與原文的控制字元數量相同：將譯文中 key 的控制字元依序換成原文對應位置的控制字元
+    NormalizedKeyIndex.prototype._replaceCodes = function (translation, keyCodes, codes) {
+        if (typeof translation !== 'string') return undefined;
+        var used = [];
+        return translation.replace(NormalizedKeyIndex.ESCAPE_CODES, function (code) {
+            for (var i = 0; i < keyCodes.length; i++) {
+                if (!used[i] && keyCodes[i].code === code) {
+                    used[i] = true;
+                    return codes[i].code;
+                }
+            }
+            return code;
+        });
+    };
+
+    // key 不含控制字元：原文的控制字元都在開頭或結尾時才放回譯文的開頭與結尾
+    NormalizedKeyIndex._wrapCodes = function (translation, text, codes) {
+        if (typeof translation !== 'string') return undefined;
+        var prefix = '';
+        var suffix = '';
+        var position = 0;
+        var count = 0;
+        while (count < codes.length && !text.substring(position, codes[count].index).trim()) {
+            prefix += codes[count].code;
+            position = codes[count].index + codes[count].code.length;
+            count++;
+        }
+        var end = text.length;
+        for (var i = codes.length - 1; i >= count; i--) {
+            if (text.substring(codes[i].index + codes[i].code.length, end).trim()) break;
+            suffix = codes[i].code + suffix;
+            end = codes[i].index;
+            count++;
+        }
+        return count === codes.length ? prefix + translation + suffix : undefined;
+    };
+
+    // TranslationCache 類別 - 有容量上限的 LRU 翻譯結果快取
+    // 同時快取命中、未命中與子字串提取的結果
+    var TranslationCache = function (dictionary, capacity) {
+        this.dictionary = dictionary;
+        this._capacity = capacity;
+        this._entries = new Map();
+    };
+
+    TranslationCache.prototype.get = function (text) {
+        var entries = this._entries;
+        var result = entries.get(text);
+        if (result !== undefined) {
+            // 移到最後面，標記為最近使用
+            entries.delete(text);
+            entries.set(text, result);
+        }
+        return result;
+    };
+
+    // 寫入快取，回傳被淘汰的項目數量
+    TranslationCache.prototype.set = function (text, result) {
+        var entries = this._entries;
+        if (this._capacity <= 0) return 0;
+
+        entries.set(text, result);
+        if (entries.size > this._capacity) {
+            // Map 依插入順序迭代，第一個即為最久未使用的項目
+            entries.delete(entries.keys().next().value);
+            return 1;
+        }
+        return 0;
+    };
+
+    TranslationCache.prototype.size = function () {
+        return this._entries.size;
+    };
 
     // TranslationManager 類別 - 支援 mtool 工具的 key-value 格式
     var TranslationManager = function () {
         this._currentLanguage = defaultLanguage;
         this._translations = {}; // key-value 格式的翻譯字典
+        this._languageUsage = []; // 已載入語言的使用順序（最後一個為最近使用）
+        this._evictedLanguages = []; // 已釋放、切換時需要重新載入的語言
+        this._languageEvictions = 0;
+        this._pendingLoads = {}; // 載入中的語言與等待的 callback
+        this._loadQueue = []; // 等待載入的語言
+        this._activeLoads = 0;
+        this._languageRequest = null; // 最後一次要求切換的語言
         this._originalTexts = {}; // 記錄原文的映射
+        this._termSource = null; // $dataSystem 用語的原文快照
+        this._termTables = {}; // 各語言已翻譯的用語表
         this._isInitialized = false;
         this._refreshCallbacks = [];
+        this._drawnWindows = new Set(); // 目前場景中畫過翻譯文字的視窗
+        this._drawnScene = null;
+        this._dirtyWindows = []; // 切換語言後等待重新繪製的視窗
+        this._pendingReads = []; // 已讀取、尚未被視窗畫出的翻譯結果（依讀取順序）
+        this._drawingWindow = null; // 正在繪製文字的視窗
         this._availableLanguages = [];
         this._enableSubstringExtraction = translationMode === 'full';
+        this._substringIndexes = {}; // 各語言的子字串索引 (full 模式)
+        this._messageIndexes = {}; // 各語言的多行 key 索引
+        this._normalizedIndexes = {}; // 各語言忽略控制字元與空白差異的 key 索引
+        this._translationCaches = {}; // 各語言的翻譯結果快取
+        this._cacheStats = { hits: 0, misses: 0, evictions: 0 };
+        this._manifest = null; // translations/manifest.json 的語言資訊
+        this._mapShards = {}; // 各語言已載入的地圖分片（項目存放在分片字典，不寫入語言字典）
+        this._currentMapId = 0;
+        this._bootManifest = undefined; // 載入資料庫前讀取的翻譯清單
+        this._dataDirectories = {}; // 各語言預先烘焙的資料目錄 (data_<語言>/)
+        this._dataLanguage = null; // 目前資料庫所屬的語言（null 表示原始 data/）
+        this._dataTarget = null; // 正在載入或已載入的資料語言
+        this._dataSwitchId = 0;
+        this._profile = null; // 啟用效能記錄時的計時與未翻譯記錄
+        if (enableProfiling) this.setProfiling(true);
+    };
+
+    // 同時保留在記憶體中的地圖分片數量（目前地圖與上一張地圖）
+    TranslationManager.MAX_MAP_SHARDS = 2;
+
+    // 切換語言後每個畫面更新最多用於重新繪製視窗的時間（毫秒，至少繪製一個視窗）
+    TranslationManager.REFRESH_FRAME_BUDGET = 4;
+
+    // 等待視窗畫出的翻譯結果數量上限（超過兩倍時一次捨棄較早讀取的結果）
+    TranslationManager.MAX_PENDING_READS = 256;
+
+    // 同時載入的翻譯檔數量上限
+    TranslationManager.MAX_CONCURRENT_LOADS = 2;
+
+    // JSON 翻譯檔超過此大小 (bytes) 時在 Worker 中解析
+    TranslationManager.WORKER_PARSE_THRESHOLD = 1024 * 1024;
+
+    // 每個語言最多記錄的未翻譯原文數量
+    TranslationManager.MAX_MISS_LOG_ENTRIES = 10000;
+
+    // 開啟或關閉效能記錄（關閉時清除已記錄的資料）
+    TranslationManager.prototype.setProfiling = function (enabled) {
+        if (!enabled) {
+            this._profile = null;
+        } else if (!this._profile) {
+            this._profile = { timers: {}, misses: {}, startedAt: Date.now() };
+        }
+    };
+
+    // 累計一個步驟的呼叫次數與耗時（毫秒）
+    TranslationManager.prototype._recordTiming = function (name, start) {
+        var timer = this._profile.timers[name];
+        if (!timer) {
+            timer = this._profile.timers[name] = { count: 0, total: 0, max: 0 };
+        }
+        var elapsed = now() - start;
+        timer.count++;
+        timer.total += elapsed;
+        if (elapsed > timer.max) timer.max = elapsed;
+    };
+
+    // 記錄字典中沒有的原文與出現次數
+    TranslationManager.prototype._recordMiss = function (language, text) {
+        var log = this._profile.misses[language];
+        if (!log) {
+            log = this._profile.misses[language] = new Map();
+        }
+        var count = log.get(text);
+        if (count !== undefined) {
+            log.set(text, count + 1);
+        } else if (log.size < TranslationManager.MAX_MISS_LOG_ENTRIES) {
+            log.set(text, 1);
+        }
+    };
+
+    // 取得效能記錄摘要（未啟用時為 null）
+    TranslationManager.prototype.getProfile = function () {
+        if (!this._profile) return null;
+
+        var timers = {};
+        var profileTimers = this._profile.timers;
+        Object.keys(profileTimers).forEach(function (name) {
+            var timer = profileTimers[name];
+            timers[name] = {
+                count: timer.count,
+                total: timer.total,
+                max: timer.max,
+                average: timer.count ? timer.total / timer.count : 0
+            };
+        });
+
+        var misses = { unique: 0, total: 0 };
+        var profileMisses = this._profile.misses;
+        Object.keys(profileMisses).forEach(function (language) {
+            profileMisses[language].forEach(function (count) {
+                misses.unique++;
+                misses.total += count;
+            });
+        });
+
+        return { startedAt: this._profile.startedAt, timers: timers, misses: misses };
+    };
+
+    // 匯出未翻譯的原文記錄，依出現次數排序
+    TranslationManager.prototype.exportMissLog = function () {
+        var languages = {};
+        var profileMisses = this._profile ? this._profile.misses : {};
+        Object.keys(profileMisses).forEach(function (language) {
+            var entries = [];
+            profileMisses[language].forEach(function (count, text) {
+                entries.push({ text: text, count: count });
+            });
+            entries.sort(function (a, b) { return b.count - a.count; });
+            languages[language] = entries;
+        });
+
+        return {
+            version: 1,
+            game: $dataSystem && $dataSystem.gameTitle ? $dataSystem.gameTitle : '',
+            startedAt: this._profile ? this._profile.startedAt : null,
+            exportedAt: Date.now(),
+            languages: languages
+        };
+    };
+
+    // 初始化翻譯管理器
+    TranslationManager.prototype.initialize = function () {
+        if (this._isInitialized) return;
+
+        this._buildOriginalTextMapping();
+        if (autoDetectTranslations) {
+            this._detectAvailableLanguages();
+            return;
+        }
+
+        // 不自動偵測時只使用預設語言，但仍讀取翻譯清單中該語言的地圖分片、翻譯包與壓縮檔
+        this._availableLanguages = [defaultLanguage];
+        this._readManifest(function (manifest) {
+            this._setManifest(manifest);
+            this.loadLanguage(defaultLanguage, function () {
+                this._isInitialized = true;
+                this._applyTranslations();
+                this._switchDataSet(this._currentLanguage);
+            }.bind(this));
+        }.bind(this));
+    };
+
+    // 建立原文對映（從 TextManager 和系統資料建立），並記錄用語原文供各語言建立用語表
+    TranslationManager.prototype._buildOriginalTextMapping = function () {
+        this._originalTexts = {};
+        this._termSource = { basic: [], param: [], command: [], message: {}, currencyUnit: '' };
+        this._termTables = {};
+
+        // 從 $dataSystem.terms 建立原文對映
+        if ($dataSystem && $dataSystem.terms) {
+            var terms = $dataSystem.terms;
+            for (var category in terms) {
+                if (terms.hasOwnProperty(category)) {
+                    for (var id in terms[category]) {
+                        if (terms[category].hasOwnProperty(id)) {
+                            var originalText = terms[category][id];
+                            if (originalText) {
+                                this._originalTexts[originalText] = { category: category, id: id };
+                            }
+                        }
+                    }
+                }
+            }
+
+            // TextManager 方法名稱與 terms 欄位的對應
+            this._termSource.basic = (terms.basic || []).slice();
+            this._termSource.param = (terms.params || []).slice();
+            this._termSource.command = (terms.commands || []).slice();
+            this._termSource.message = Object.assign({}, terms.messages);
+        }
+
+        // 記錄貨幣單位
+        if ($dataSystem && $dataSystem.currencyUnit) {
+            this._originalTexts[$dataSystem.currencyUnit] = { category: 'currencyUnit', id: 'currencyUnit' };
+            this._termSource.currencyUnit = $dataSystem.currencyUnit;
+        }
+    };
+
+    // 取得目前語言的用語表：每個語言只翻譯一次所有用語，TextManager 只需讀取陣列與物件
+    // 字典尚未載入時回傳原文，且不保留結果
+    TranslationManager.prototype._getTermTable = function () {
+        var table = this._termTables[this._currentLanguage];
+        if (table) return table;
+
+        if (!this._termSource) this._buildOriginalTextMapping();
+        var source = this._termSource;
+        if (!this._isInitialized || !this._translations[this._currentLanguage]) {
+            return source;
+        }
+
+        var self = this;
+        var translateTerm = function (text) {
+            return text ? self.translate(text) : '';
+        };
+        table = {
+            basic: source.basic.map(translateTerm),
+            param: source.param.map(translateTerm),
+            command: source.command.map(translateTerm),
+            message: {},
+            currencyUnit: translateTerm(source.currencyUnit)
+        };
+        Object.keys(source.message).forEach(function (id) {
+            table.message[id] = translateTerm(source.message[id]);
+        });
+        this._termTables[this._currentLanguage] = table;
+        return table;
+    };
+
+    // 自動偵測可用的語言檔案
+    TranslationManager.prototype._detectAvailableLanguages = function () {
+        this._readManifest(function (manifest) {
+            if (manifest) {
+                this._initializeFromManifest(manifest);
+            } else {
+                this._probeAvailableLanguages();
+            }
+        }.bind(this));
+    };
+
+    // 取得翻譯清單：載入資料庫前已讀取過清單時不再重新下載
+    TranslationManager.prototype._readManifest = function (callback) {
+        if (this._bootManifest !== undefined) {
+            callback(this._bootManifest);
+        } else {
+            this._loadManifest(callback);
+        }
+    };
+
+    // 載入 translations/manifest.json，失敗時以 null 呼叫 callback
+    TranslationManager.prototype._loadManifest = function (callback) {
+        var filename = translationPath + 'manifest.json';
+        var xhr = new XMLHttpRequest();
+
+        xhr.open('GET', filename);
+        xhr.overrideMimeType('application/json');
+        xhr.onload = function () {
+            var manifest = null;
+            if (xhr.status < 400) {
+                try {
+                    manifest = JSON.parse(xhr.responseText);
+                } catch (e) {
+                    console.error('翻譯清單解析失敗:', filename, e);
+                }
+            }
+            if (manifest && !Array.isArray(manifest.languages)) {
+                console.warn('翻譯清單格式錯誤:', filename);
+                manifest = null;
+            }
+            callback(manifest);
+        };
+
+        xhr.onerror = function () {
+            callback(null);
+        };
+
+        xhr.send();
+    };
+
+    // 記錄翻譯清單中各語言的檔案資訊，回傳清單中的語言代碼（沒有清單時為 null）
+    TranslationManager.prototype._setManifest = function (manifest) {
+        this._setDataDirectories(manifest);
+        if (!manifest) return null;
+
+        this._manifest = {};
+        manifest.languages.forEach(function (entry) {
+            if (entry && entry.code) {
+                this._manifest[entry.code] = entry;
+            }
+        }, this);
+        return Object.keys(this._manifest);
+    };
+
+    // 依據翻譯清單設定可用語言，並只載入啟動時需要的語言
+    TranslationManager.prototype._initializeFromManifest = function (manifest) {
+        this._availableLanguages = this._setManifest(manifest);
+
+        var language = this._getStartupLanguage();
+        var finish = function () {
+            this._isInitialized = true;
+            this._applyTranslations();
+            this._switchDataSet(this._currentLanguage);
+        }.bind(this);
+
+        if (!language) {
+            this._availableLanguages = [defaultLanguage];
+            finish();
+            return;
+        }
+
+        this._currentLanguage = language;
+        this.loadLanguage(language, finish);
+    };
+
+    // 啟動語言：玩家設定的語言 > 預設語言 > 清單中的第一個語言
+    TranslationManager.prototype._getStartupLanguage = function () {
+        var candidates = [ConfigManager.language, defaultLanguage];
+        for (var i = 0; i < candidates.length; i++) {
+            if (candidates[i] && this._availableLanguages.indexOf(candidates[i]) !== -1) {
+                return candidates[i];
+            }
+        }
+        return this._availableLanguages[0] || null;
+    };
+
+    // 沒有翻譯清單時，逐一嘗試載入常見語言的翻譯檔案
+    TranslationManager.prototype._probeAvailableLanguages = function () {
+        var testFiles = ['zh', 'en', 'ja', 'ko', 'fr', 'de', 'es', 'pt', 'ru'];
+        var loadedCount = 0;
+
+        testFiles.forEach(function (lang) {
+            this.loadLanguage(lang, function (success) {
+                loadedCount++;
+                if (success && this._availableLanguages.indexOf(lang) === -1) {
+                    this._availableLanguages.push(lang);
+                }
+
+                // 當所有測試完成後，載入預設語言
+                if (loadedCount === testFiles.length) {
+                    if (this._availableLanguages.length === 0) {
+                        this._availableLanguages = [defaultLanguage];
+                    }
+
+                    this._isInitialized = true;
+                    this._applyTranslations();
+                }
+            }.bind(this));
+        }.bind(this));
+    };
+
+    // 記錄清單中各語言預先烘焙的資料目錄
+    TranslationManager.prototype._setDataDirectories = function (manifest) {
+        this._dataDirectories = {};
+        if (!manifest) return;
+        manifest.languages.forEach(function (entry) {
+            if (entry && entry.code && entry.data) {
+                this._dataDirectories[entry.code] = entry.data;
+            }
+        }, this);
+    };
+
+    // 在載入資料庫前讀取翻譯清單，決定資料檔要從哪個目錄讀取
+    TranslationManager.prototype.prepareDataSet = function (callback) {
+        this._loadManifest(function (manifest) {
+            this._bootManifest = manifest;
+            this._setDataDirectories(manifest);
+            var language = ConfigManager.language || defaultLanguage;
+            this._dataLanguage = this._dataDirectories[language] ? language : null;
+            this._dataTarget = this._dataLanguage;
+            callback();
+        }.bind(this));
+    };
+
+    // 目前資料庫使用的預先烘焙資料目錄（null 表示原始 data/）
+    TranslationManager.prototype.getDataDirectory = function () {
+        return this._dataLanguage ? this._dataDirectories[this._dataLanguage] : null;
+    };
+
+    // 資料庫是否已是目前語言的譯文（對話不需再查找翻譯）
+    TranslationManager.prototype.isDataPrebaked = function () {
+        return this._dataLanguage !== null && this._dataLanguage === this._currentLanguage;
+    };
+
+    // 切換到該語言的資料目錄（沒有則使用原始 data/），所有檔案載入完成後才替換資料庫
+    TranslationManager.prototype._switchDataSet = function (language) {
+        var target = this._dataDirectories[language] ? language : null;
+        if (target === this._dataTarget) return;
+
+        var directory = target ? this._dataDirectories[target] : 'data/';
+        var files = (DataManager._databaseFiles || []).slice();
+        if (typeof $gameMap !== 'undefined' && $gameMap && $gameMap.mapId() > 0) {
+            files.push({ name: '$dataMap', src: 'Map' + ('000' + $gameMap.mapId()).slice(-3) + '.json' });
+        }
+
+        var switchId = ++this._dataSwitchId;
+        var results = {};
+        var remaining = files.length;
+        var failed = false;
+        this._dataTarget = target;
+
+        var finish = function () {
+            if (switchId !== this._dataSwitchId) return;
+            if (failed) {
+                this._dataTarget = this._dataLanguage;
+                return;
+            }
+            files.forEach(function (file) {
+                window[file.name] = results[file.name];
+                DataManager.onLoad(results[file.name]);
+            });
+            this._dataLanguage = target;
+        }.bind(this);
+
+        var done = function () {
+            remaining--;
+            if (remaining === 0) finish();
+        };
+
+        if (remaining === 0) {
+            finish();
+            return;
+        }
+
+        files.forEach(function (file) {
+            var url = directory + file.src;
+            var xhr = new XMLHttpRequest();
+            xhr.open('GET', url);
+            xhr.overrideMimeType('application/json');
+            xhr.onload = function () {
+                if (xhr.status < 400) {
+                    try {
+                        results[file.name] = JSON.parse(xhr.responseText);
+                    } catch (e) {
+                        console.error('資料檔解析失敗:', url, e);
+                        failed = true;
+                    }
+                } else {
+                    console.warn('資料檔載入失敗:', url, '狀態碼:', xhr.status);
+                    failed = true;
+                }
+                done();
+            };
+            xhr.onerror = function () {
+                console.warn('無法載入資料檔:', url);
+                failed = true;
+                done();
+            };
+            xhr.send();
+        });
+    };
+
+    // 取得語言的翻譯檔案路徑（有地圖分片時只載入共用分片）
+    TranslationManager.prototype._getLanguageFile = function (language) {
+        var shards = this._getShardInfo(language);
+        if (shards && shards.core) {
+            return translationPath + shards.core;
+        }
+        return translationPath + language + '.json';
+    };
+
+    TranslationManager.prototype._getShardInfo = function (language) {
+        var entry = this._manifest && this._manifest[language];
+        return entry && entry.shards ? entry.shards : null;
+    };
+
+    // 二進位翻譯包路徑：清單中有 pack 且環境支援時使用（地圖分片仍使用 JSON）
+    TranslationManager.prototype._getPackFile = function (language) {
+        var entry = this._manifest && this._manifest[language];
+        if (!entry || !entry.pack || entry.shards || !BinaryDictionary.isSupported()) {
+            return null;
+        }
+        return translationPath + entry.pack;
+    };
+
+    // gzip 壓縮檔路徑：清單中有壓縮檔、環境支援 fetch 與 DecompressionStream，且不是從本機檔案執行時使用
+    // （NW.js 版本從 file:// 讀取，未壓縮的 JSON 不需要經過網路）
+    TranslationManager.prototype._getCompressedFile = function (language) {
+        var entry = this._manifest && this._manifest[language];
+        if (!entry || !entry.compressed || !entry.compressed.gzip || entry.shards || !isDecompressionSupported()) {
+            return null;
+        }
+        return translationPath + entry.compressed.gzip;
+    };
+
+    // 載入指定語言的翻譯，回傳以是否成功 resolve 的 Promise
+    // 同一語言同時只會載入一次，同時進行的載入數量受 MAX_CONCURRENT_LOADS 限制
+    TranslationManager.prototype.loadLanguage = function (language, callback) {
+        var pending = this._pendingLoads[language];
+        if (pending) {
+            if (callback) pending.callbacks.push(callback);
+            return pending.promise;
+        }
+
+        pending = this._pendingLoads[language] = { callbacks: callback ? [callback] : [] };
+        pending.promise = new Promise(function (resolve) {
+            pending.resolve = resolve;
+        });
+        this._loadQueue.push(language);
+        this._drainLoadQueue();
+        return pending.promise;
+    };
+
+    // 在上限內開始等待中的載入
+    TranslationManager.prototype._drainLoadQueue = function () {
+        while (this._loadQueue.length > 0 && this._activeLoads < TranslationManager.MAX_CONCURRENT_LOADS) {
+            var language = this._loadQueue.shift();
+            this._activeLoads++;
+            this._fetchLanguage(language, this._finishLoad.bind(this, language));
+        }
+    };
+
+    TranslationManager.prototype._finishLoad = function (language, success) {
+        var pending = this._pendingLoads[language];
+        delete this._pendingLoads[language];
+        this._activeLoads--;
+        pending.callbacks.forEach(function (callback) {
+            callback(success);
+        });
+        pending.resolve(success);
+        this._drainLoadQueue();
+    };
+
+    // 讀取語言的翻譯檔：優先讀取二進位翻譯包，失敗時改用 JSON
+    TranslationManager.prototype._fetchLanguage = function (language, callback) {
+        var filename = this._getPackFile(language);
+        if (!filename) {
+            this._loadJsonLanguage(language, callback);
+            return;
+        }
+
+        var xhr = new XMLHttpRequest();
+        var fetchStart = this._profile ? now() : 0;
+
+        xhr.open('GET', filename);
+        xhr.responseType = 'arraybuffer';
+        xhr.onload = function () {
+            if (this._profile) this._recordTiming('loadLanguage.fetch', fetchStart);
+            if (xhr.status < 400) {
+                var dictionary = null;
+                try {
+                    var parseStart = this._profile ? now() : 0;
+                    dictionary = new BinaryDictionary(xhr.response);
+                    if (this._profile) this._recordTiming('loadLanguage.parse', parseStart);
+                } catch (e) {
+                    console.warn('翻譯包讀取失敗，改用 JSON:', filename, e);
+                }
+                if (dictionary) {
+                    this._setDictionary(language, dictionary);
+                    callback(true);
+                    return;
+                }
+            } else {
+                console.warn('翻譯包載入失敗，改用 JSON:', filename, '狀態碼:', xhr.status);
+            }
+            this._loadJsonLanguage(language, callback);
+        }.bind(this);
+
+        xhr.onerror = function () {
+            console.warn('無法載入翻譯包，改用 JSON:', filename);
+            this._loadJsonLanguage(language, callback);
+        }.bind(this);
+
+        xhr.send();
     };
 
-    // 初始化翻譯管理器
-    TranslationManager.prototype.initialize = function () {
-        if (this._isInitialized) return;
+    // 設定語言的字典，並重設由字典衍生的分片、索引與快取
+    TranslationManager.prototype._setDictionary = function (language, translations) {
+        this._translations[language] = translations;
+        this._touchLanguage(language);
+        this._evictLanguages(language);
+        this._mapShards[language] = { maps: [], keys: {}, pending: {}, dictionary: {}, indexes: {} };
+        this._invalidateDictionary(language);
+        if (this._enableSubstringExtraction) {
+            this._getSubstringIndex(language);
+        }
+        if (this._currentMapId > 0) {
+            this._loadMapShard(language, this._currentMapId);
+        }
+        console.log('翻譯載入成功:', language, dictionarySize(translations), '個項目');
+    };
 
-        this._buildOriginalTextMapping();
-        if (autoDetectTranslations) {
-            this._detectAvailableLanguages();
+    // 載入 JSON 格式的翻譯檔案（支援 Worker 時大型檔案在 Worker 中解析）
+    // 清單中有 gzip 壓縮檔且環境支援時先讀取壓縮檔；plain 為 true 時直接讀取 JSON
+    TranslationManager.prototype._loadJsonLanguage = function (language, callback, plain) {
+        var compressed = plain ? null : this._getCompressedFile(language);
+        if (compressed) {
+            this._loadCompressedLanguage(language, compressed, callback);
+            return;
+        }
+
+        var filename = this._getLanguageFile(language);
+        var xhr = new XMLHttpRequest();
+        var fetchStart = this._profile ? now() : 0;
+        var useWorker = JsonParseWorker.isSupported();
+
+        xhr.open('GET', filename);
+        if (useWorker) {
+            xhr.responseType = 'arraybuffer';
         } else {
-            this._availableLanguages = [defaultLanguage];
-            this.loadLanguage(defaultLanguage, function () {
-                this._isInitialized = true;
-                this._applyTranslations();
-            }.bind(this));
+            xhr.overrideMimeType('application/json');
         }
+        xhr.onload = function () {
+            if (this._profile) this._recordTiming('loadLanguage.fetch', fetchStart);
+            if (xhr.status >= 400) {
+                console.warn('翻譯檔案載入失敗:', filename, '狀態碼:', xhr.status);
+                callback(false);
+                return;
+            }
+            this._parseJsonLanguage(language, filename, useWorker ? xhr.response : null, xhr.responseText, callback);
+        }.bind(this);
+
+        xhr.onerror = function () {
+            console.warn('無法載入翻譯檔案:', filename);
+            callback(false);
+        };
+
+        xhr.send();
     };
 
-    // 建立原文對映（從 TextManager 和系統資料建立）
-    TranslationManager.prototype._buildOriginalTextMapping = function () {
-        this._originalTexts = {};
+    // 解析 JSON 翻譯檔內容並設定字典：有 buffer 時解碼 buffer（大型檔案交給 Worker），否則解析 text
+    TranslationManager.prototype._parseJsonLanguage = function (language, filename, buffer, text, callback) {
+        var parseStart = this._profile ? now() : 0;
+        var onParsed = function (error, translations) {
+            if (error) {
+                console.error('翻譯檔案解析失敗:', filename, error);
+                callback(false);
+                return;
+            }
+            if (this._profile) this._recordTiming('loadLanguage.parse', parseStart);
+            this._setDictionary(language, translations);
+            callback(true);
+        }.bind(this);
 
-        // 從 $dataSystem.terms 建立原文對映
-        if ($dataSystem && $dataSystem.terms) {
-            var terms = $dataSystem.terms;
-            for (var category in terms) {
-                if (terms.hasOwnProperty(category)) {
-                    for (var id in terms[category]) {
-                        if (terms[category].hasOwnProperty(id)) {
-                            var originalText = terms[category][id];
-                            if (originalText) {
-                                this._originalTexts[originalText] = { category: category, id: id };
-                            }
-                        }
-                    }
+        if (buffer && buffer.byteLength >= TranslationManager.WORKER_PARSE_THRESHOLD &&
+            JsonParseWorker.isSupported() &&
+            JsonParseWorker.parse(buffer, function (error, translations, workerFailed) {
+                if (workerFailed) {
+                    // buffer 已轉移給 Worker，重新讀取並在主執行緒解析
+                    this._loadJsonLanguage(language, callback);
+                } else {
+                    onParsed(error, translations);
                 }
-            }
+            }.bind(this))) {
+            return;
         }
 
-        // 記錄貨幣單位
-        if ($dataSystem && $dataSystem.currencyUnit) {
-            this._originalTexts[$dataSystem.currencyUnit] = { category: 'currencyUnit', id: 'currencyUnit' };
+        var translations;
+        try {
+            translations = JSON.parse(buffer ? new TextDecoder('utf-8').decode(new Uint8Array(buffer)) : text);
+        } catch (e) {
+            onParsed(e);
+            return;
         }
+        onParsed(null, translations);
     };
 
-    // 自動偵測可用的語言檔案
-    TranslationManager.prototype._detectAvailableLanguages = function () {
-        var testFiles = ['zh', 'en', 'ja', 'ko', 'fr', 'de', 'es', 'pt', 'ru'];
-        var loadedCount = 0;
+    // 以 fetch 讀取 gzip 壓縮檔，下載的同時以 DecompressionStream 串流解壓縮
+    // 任何失敗（例如伺服器沒有壓縮檔）都改為讀取 JSON
+    TranslationManager.prototype._loadCompressedLanguage = function (language, filename, callback) {
+        var fetchStart = this._profile ? now() : 0;
 
-        testFiles.forEach(function (lang) {
-            this.loadLanguage(lang, function (success) {
-                loadedCount++;
-                if (success && this._availableLanguages.indexOf(lang) === -1) {
-                    this._availableLanguages.push(lang);
-                }
+        fetch(filename).then(function (response) {
+            if (!response.ok) {
+                throw new Error('狀態碼: ' + response.status);
+            }
+            // 伺服器以 Content-Encoding: gzip 傳送 .gz 檔時，瀏覽器已經解壓縮
+            if (/gzip/i.test(response.headers.get('Content-Encoding') || '') || !response.body) {
+                return response.arrayBuffer();
+            }
+            return new Response(response.body.pipeThrough(new DecompressionStream('gzip'))).arrayBuffer();
+        }).then(function (buffer) {
+            if (this._profile) this._recordTiming('loadLanguage.fetch', fetchStart);
+            this._parseJsonLanguage(language, filename, buffer, null, callback);
+        }.bind(this), function (error) {
+            console.warn('壓縮翻譯檔載入失敗，改用 JSON:', filename, error);
+            this._loadJsonLanguage(language, callback, true);
+        }.bind(this));
+    };
 
-                // 當所有測試完成後，載入預設語言
-                if (loadedCount === testFiles.length) {
-                    if (this._availableLanguages.length === 0) {
-                        this._availableLanguages = [defaultLanguage];
-                    }
+    // 字典內容變更後，捨棄由字典衍生的索引與快取
+    TranslationManager.prototype._invalidateDictionary = function (language) {
+        delete this._substringIndexes[language];
+        delete this._messageIndexes[language];
+        delete this._normalizedIndexes[language];
+        delete this._termTables[language];
+        this._clearTranslationCache(language);
+    };
 
-                    this._isInitialized = true;
-                    this._applyTranslations();
-                }
-            }.bind(this));
-        }.bind(this));
+    // 將語言標記為最近使用
+    TranslationManager.prototype._touchLanguage = function (language) {
+        var position = this._languageUsage.indexOf(language);
+        if (position !== -1) this._languageUsage.splice(position, 1);
+        this._languageUsage.push(language);
+
+        position = this._evictedLanguages.indexOf(language);
+        if (position !== -1) this._evictedLanguages.splice(position, 1);
     };
 
-    // 載入指定語言的翻譯檔案
-    TranslationManager.prototype.loadLanguage = function (language, callback) {
-        var filename = translationPath + language + '.json';
+    // 釋放最久未使用的語言字典，只保留 maxLoadedLanguages 個
+    // 目前語言與 keep 指定的語言（剛載入的語言）不會被釋放
+    TranslationManager.prototype._evictLanguages = function (keep) {
+        if (maxLoadedLanguages <= 0) return;
+
+        // 直接寫入 _translations 的語言視為最久未使用
+        var usage = this._languageUsage;
+        Object.keys(this._translations).forEach(function (language) {
+            if (usage.indexOf(language) === -1) usage.unshift(language);
+        });
+
+        var resident = Object.keys(this._translations).length;
+        for (var i = 0; i < usage.length && resident > maxLoadedLanguages;) {
+            var language = usage[i];
+            if (language === this._currentLanguage || language === keep || !this._translations[language]) {
+                i++;
+                continue;
+            }
+            usage.splice(i, 1);
+            this._unloadLanguage(language);
+            resident--;
+        }
+    };
+
+    // 移除語言字典與由字典衍生的分片、索引與快取；可用語言列表不變
+    TranslationManager.prototype._unloadLanguage = function (language) {
+        delete this._translations[language];
+        delete this._mapShards[language];
+        this._invalidateDictionary(language);
+        if (this._evictedLanguages.indexOf(language) === -1) {
+            this._evictedLanguages.push(language);
+        }
+        this._languageEvictions++;
+        console.log('釋放翻譯字典:', language);
+    };
+
+    // 地圖切換時載入新地圖的分片
+    TranslationManager.prototype.onMapChange = function (mapId) {
+        this._currentMapId = mapId;
+        this._loadMapShard(this._currentLanguage, mapId);
+    };
+
+    // 目前地圖的分片是否已載入（或不需要載入）
+    TranslationManager.prototype.isMapShardReady = function () {
+        var state = this._mapShards[this._currentLanguage];
+        return !state || !state.pending[this._currentMapId];
+    };
+
+    // 載入地圖分片到該語言的分片字典：分片字典有自己的小型索引，
+    // 語言字典的索引不會因為切換地圖而重新建立
+    TranslationManager.prototype._loadMapShard = function (language, mapId) {
+        var shards = this._getShardInfo(language);
+        var state = this._mapShards[language];
+        var dictionary = this._translations[language];
+        var file = shards && shards.maps ? shards.maps[mapId] : null;
+        if (!file || !state || !dictionary || state.pending[mapId]) return;
+
+        if (state.keys[mapId]) {
+            // 已載入：標記為最近使用
+            state.maps.splice(state.maps.indexOf(mapId), 1);
+            state.maps.push(mapId);
+            return;
+        }
+
+        var filename = translationPath + file;
         var xhr = new XMLHttpRequest();
+        state.pending[mapId] = true;
 
         xhr.open('GET', filename);
         xhr.overrideMimeType('application/json');
         xhr.onload = function () {
+            delete state.pending[mapId];
+            // 載入期間語言已重新載入或被移除
+            if (this._translations[language] !== dictionary || this._mapShards[language] !== state) return;
+
             if (xhr.status < 400) {
                 try {
-                    var translations = JSON.parse(xhr.responseText);
-                    this._translations[language] = translations;
-                    console.log('翻譯載入成功:', language, Object.keys(translations).length, '個項目');
-                    console.log('載入的翻譯項目範例:', Object.keys(translations).slice(0, 5));
-                    if (callback) callback(true);
+                    var shard = JSON.parse(xhr.responseText);
+                    // 只記錄分片新增的 key，共用分片的項目優先且不會被移除
+                    var keys = [];
+                    for (var key in shard) {
+                        if (shard.hasOwnProperty(key) && !dictionaryHas(dictionary, key) && !hasOwn.call(state.dictionary, key)) {
+                            state.dictionary[key] = shard[key];
+                            keys.push(key);
+                        }
+                    }
+                    state.keys[mapId] = keys;
+                    state.maps.push(mapId);
+                    this._evictMapShards(language);
+                    this._onMapShardsChanged(language);
                 } catch (e) {
-                    console.error('翻譯檔案解析失敗:', filename, e);
-                    if (callback) callback(false);
+                    console.error('地圖分片解析失敗:', filename, e);
                 }
             } else {
-                console.warn('翻譯檔案載入失敗:', filename, '狀態碼:', xhr.status);
-                if (callback) callback(false);
+                console.warn('地圖分片載入失敗:', filename, '狀態碼:', xhr.status);
             }
         }.bind(this);
 
         xhr.onerror = function () {
-            console.warn('無法載入翻譯檔案:', filename);
-            if (callback) callback(false);
+            delete state.pending[mapId];
+            console.warn('無法載入地圖分片:', filename);
         };
 
         xhr.send();
     };
 
-    // 設定當前語言
+    // 移除最久未使用的地圖分片，只保留 MAX_MAP_SHARDS 個
+    TranslationManager.prototype._evictMapShards = function (language) {
+        var state = this._mapShards[language];
+        while (state.maps.length > TranslationManager.MAX_MAP_SHARDS) {
+            var mapId = state.maps.shift();
+            var keys = state.keys[mapId];
+            for (var i = 0; i < keys.length; i++) {
+                delete state.dictionary[keys[i]];
+            }
+            delete state.keys[mapId];
+        }
+    };
+
+    // 分片字典變更後只捨棄分片字典的索引，以及可能含有舊結果的快取與用語表
+    TranslationManager.prototype._onMapShardsChanged = function (language) {
+        this._mapShards[language].indexes = {};
+        delete this._termTables[language];
+        this._clearTranslationCache(language);
+    };
+
+    // 取得已載入地圖分片的字典（沒有分片項目時回傳 null）
+    TranslationManager.prototype._getShardDictionary = function (language) {
+        var state = this._mapShards[language];
+        return state && state.maps.length > 0 ? state.dictionary : null;
+    };
+
+    // 取得分片字典的索引（分片變更時重新建立，分片字典通常只有數百個項目）
+    TranslationManager.prototype._getShardIndex = function (language, name, Index) {
+        if (!this._getShardDictionary(language)) return null;
+        var indexes = this._mapShards[language].indexes;
+        if (!indexes[name]) {
+            indexes[name] = new Index(this._mapShards[language].dictionary);
+        }
+        return indexes[name];
+    };
+
+    // 查找 key 的譯文：語言字典優先，其次是已載入的地圖分片
+    TranslationManager.prototype._getEntry = function (language, key) {
+        var value = dictionaryGet(this._translations[language], key);
+        if (value === undefined) {
+            var shards = this._getShardDictionary(language);
+            if (shards && hasOwn.call(shards, key)) value = shards[key];
+        }
+        return value;
+    };
+
+    // 設定當前語言，回傳以是否切換成功 resolve 的 Promise
+    // 新語言載入完成前維持顯示原本的語言；載入期間再次切換時以最後一次要求為準
     TranslationManager.prototype.setLanguage = function (language) {
-        if (this._currentLanguage === language) return;
+        this._languageRequest = language;
+        if (this._currentLanguage === language) return Promise.resolve(true);
+
+        if (this._translations[language]) {
+            this._activateLanguage(language);
+            return Promise.resolve(true);
+        }
 
-        if (!this._translations[language]) {
+        // 尚未載入或已被釋放的語言在切換時重新載入
+        return new Promise(function (resolve) {
             this.loadLanguage(language, function (success) {
-                if (success) {
-                    this._currentLanguage = language;
-                    this._applyTranslations();
-                    this._refreshAllWindows();
+                if (success && this._languageRequest === language) {
+                    this._activateLanguage(language);
+                    resolve(true);
+                } else {
+                    resolve(false);
                 }
             }.bind(this));
-        } else {
-            this._currentLanguage = language;
-            this._applyTranslations();
-            this._refreshAllWindows();
-        }
+        }.bind(this));
+    };
+
+    // 切換到已載入的語言，並釋放超過上限的其他語言
+    TranslationManager.prototype._activateLanguage = function (language) {
+        this._currentLanguage = language;
+        this._touchLanguage(language);
+        this._evictLanguages();
+        this._clearTranslationCache();
+        this._applyTranslations();
+        this._switchDataSet(language);
+        this._refreshAllWindows();
     };
 
     // 取得當前語言
@@ -232,6 +1554,65 @@
         return this._availableLanguages.slice();
     };
 
+    // 取得指定語言的子字串索引（字典變更時重新建立）
+    TranslationManager.prototype._getSubstringIndex = function (language) {
+        var dictionary = this._translations[language];
+        if (!dictionary) return null;
+
+        var index = this._substringIndexes[language];
+        if (!index || index.dictionary !== dictionary) {
+            index = new SubstringIndex(dictionary);
+            this._substringIndexes[language] = index;
+        }
+        return index;
+    };
+
+    // 取得指定語言的多行 key 索引（字典變更時重新建立）
+    TranslationManager.prototype._getMessageIndex = function (language) {
+        var dictionary = this._translations[language];
+        if (!dictionary) return null;
+
+        var index = this._messageIndexes[language];
+        if (!index || index.dictionary !== dictionary) {
+            index = new MessageKeyIndex(dictionary);
+            this._messageIndexes[language] = index;
+        }
+        return index;
+    };
+
+    // 取得指定語言的正規化 key 索引（第一次完整比對失敗時才建立，字典變更時重新建立）
+    TranslationManager.prototype._getNormalizedIndex = function (language) {
+        var dictionary = this._translations[language];
+        if (!dictionary) return null;
+
+        var index = this._normalizedIndexes[language];
+        if (!index || index.dictionary !== dictionary) {
+            index = new NormalizedKeyIndex(dictionary);
+            this._normalizedIndexes[language] = index;
+        }
+        return index;
+    };
+
+    // 取得指定語言的翻譯結果快取（字典變更時重新建立）
+    TranslationManager.prototype._getTranslationCache = function (language) {
+        var dictionary = this._translations[language];
+        var cache = this._translationCaches[language];
+        if (!cache || cache.dictionary !== dictionary) {
+            cache = new TranslationCache(dictionary, translationCacheSize);
+            this._translationCaches[language] = cache;
+        }
+        return cache;
+    };
+
+    // 清除翻譯結果快取（未指定語言時清除全部）
+    TranslationManager.prototype._clearTranslationCache = function (language) {
+        if (language === undefined) {
+            this._translationCaches = {};
+        } else {
+            delete this._translationCaches[language];
+        }
+    };
+
     // 提取對應的翻譯部分
     TranslationManager.prototype._extractCorrespondingTranslation = function (originalPart, fullKey, fullTranslation, keyIndex) {
         // 專門處理 RPG Maker 中的訊息分割情況
@@ -318,6 +1699,23 @@
 
     // 翻譯文字（支援 mtool 工具的 key-value 格式）
     TranslationManager.prototype.translate = function (originalText) {
+        if (!this._profile) {
+            return this._noteRead(this._translate(originalText));
+        }
+
+        var start = now();
+        var result = this._translate(originalText);
+        this._recordTiming('translate', start);
+
+        var language = this._currentLanguage;
+        if (result === originalText && originalText && this._isInitialized && this._translations[language] &&
+            this._getEntry(language, originalText) === undefined) {
+            this._recordMiss(language, originalText);
+        }
+        return this._noteRead(result);
+    };
+
+    TranslationManager.prototype._translate = function (originalText) {
         if (!originalText || !this._isInitialized) {
             return originalText;
         }
@@ -327,46 +1725,114 @@
             return originalText;
         }
 
+        var cache = this._getTranslationCache(this._currentLanguage);
+        var result = cache.get(originalText);
+        if (result !== undefined) {
+            this._cacheStats.hits++;
+            return result;
+        }
+
+        this._cacheStats.misses++;
+        result = this._lookupTranslation(originalText, currentTranslations);
+        this._cacheStats.evictions += cache.set(originalText, result);
+        return result;
+    };
+
+    // 在字典中查找翻譯（不經過快取）：每個步驟先查語言字典，再查已載入的地圖分片
+    TranslationManager.prototype._lookupTranslation = function (originalText, currentTranslations) {
+        var language = this._currentLanguage;
+
         // 直接查找翻譯
-        var translatedText = currentTranslations[originalText];
+        var translatedText = this._getEntry(language, originalText);
         if (translatedText !== undefined) {
-            // 調試：記錄成功翻譯的文字
-            if (Math.random() < 0.01) { // 只記錄 1% 的翻譯以避免刷屏
-                console.log('翻譯:', originalText.substring(0, 50) + (originalText.length > 50 ? '...' : ''), '->', translatedText.substring(0, 50) + (translatedText.length > 50 ? '...' : ''));
-            }
             return translatedText;
         }
 
         // 如果找不到完整翻譯，嘗試清理可能的格式差異後再查找
         var cleanedText = originalText.trim();
         if (cleanedText !== originalText) {
-            translatedText = currentTranslations[cleanedText];
+            translatedText = this._getEntry(language, cleanedText);
             if (translatedText !== undefined) {
                 return translatedText;
             }
         }
 
+        // 忽略控制字元與空白差異後查找
+        translatedText = this._getNormalizedIndex(language).find(originalText);
+        var shardIndex = translatedText === undefined ? this._getShardIndex(language, 'normalized', NormalizedKeyIndex) : null;
+        if (shardIndex) {
+            translatedText = shardIndex.find(originalText);
+        }
+        if (translatedText !== undefined) {
+            return translatedText;
+        }
+
         // 處理單行文字的特殊情況 (Substring Extraction)
         if (this._enableSubstringExtraction && originalText.indexOf('\n') === -1) {
-            // 查找包含此文字的完整訊息翻譯
-            for (var key in currentTranslations) {
-                if (currentTranslations.hasOwnProperty(key)) {
-                    // 如果原文是某個完整訊息的子字串，嘗試提取對應的翻譯部分
-                    var keyIndex = key.indexOf(originalText);
-                    if (keyIndex !== -1 && key !== originalText) { // 排除已經檢查過的直接匹配
-                        var translatedKey = currentTranslations[key];
-                        // 正確提取對應的翻譯部分，保持相對位置
-                        var translatedPart = this._extractCorrespondingTranslation(originalText, key, translatedKey, keyIndex);
-                        // console.log('子字串翻譯找到:', originalText, '->', translatedPart, '(來自完整訊息)');
-                        return translatedPart;
-                    }
-                }
+            // 透過索引查找包含此文字的完整訊息翻譯
+            var match = this._getSubstringIndex(language).find(originalText);
+            var source = currentTranslations;
+            shardIndex = match ? null : this._getShardIndex(language, 'substring', SubstringIndex);
+            if (shardIndex) {
+                match = shardIndex.find(originalText);
+                source = shardIndex.dictionary;
+            }
+            if (match) {
+                // 正確提取對應的翻譯部分，保持相對位置
+                var start = this._profile ? now() : 0;
+                var extracted = this._extractCorrespondingTranslation(originalText, match.key, dictionaryGet(source, match.key), match.index);
+                if (this._profile) this._recordTiming('extractCorrespondingTranslation', start);
+                return extracted;
             }
         }
 
         return originalText;
     };
 
+    // 翻譯整則訊息（每行一個元素）：先查整則訊息，找不到時由上而下
+    // 以多行 key 索引比對連續的行，剩下的行再逐行翻譯
+    // 多行訊息的整則查找不記錄為未翻譯，只記錄逐行翻譯後仍未翻譯的行
+    TranslationManager.prototype.translateMessage = function (lines) {
+        var text = lines.join('\n');
+        if (!this._isInitialized || !this._translations[this._currentLanguage]) {
+            return text;
+        }
+
+        var start = this._profile ? now() : 0;
+        var result = lines.length > 1 ? this._translate(text) : this.translate(text);
+        if (result === text && lines.length > 1) {
+            var translatedLines = [];
+            var i = 0;
+            while (i < lines.length) {
+                var match = this._matchMessageKey(lines, i);
+                if (match) {
+                    translatedLines.push(this.translate(match.key));
+                    i += match.lineCount;
+                } else {
+                    // 空行保持原樣
+                    translatedLines.push(lines[i].trim() ? this.translate(lines[i]) : lines[i]);
+                    i++;
+                }
+            }
+            result = translatedLines.join('\n');
+        }
+
+        if (this._profile) this._recordTiming('translateMessage', start);
+        return this._noteRead(result);
+    };
+
+    // 找出從 lines[start] 開始、完全相符的最長多行 key（語言字典與地圖分片中較長者）
+    TranslationManager.prototype._matchMessageKey = function (lines, start) {
+        var language = this._currentLanguage;
+        var match = this._getMessageIndex(language).match(lines, start);
+        var shardIndex = this._getShardIndex(language, 'message', MessageKeyIndex);
+        var shardMatch = shardIndex ? shardIndex.match(lines, start) : null;
+        if (shardMatch && (!match || shardMatch.lineCount > match.lineCount)) {
+            return shardMatch;
+        }
+        return match;
+    };
+
     // 取得翻譯系統狀態（用於調試）
     TranslationManager.prototype.getStatus = function () {
         return {
@@ -374,15 +1840,43 @@
             currentLanguage: this._currentLanguage,
             availableLanguages: this._availableLanguages,
             loadedTranslations: Object.keys(this._translations),
+            loadingLanguages: Object.keys(this._pendingLoads),
+            languageCache: {
+                capacity: maxLoadedLanguages,
+                resident: Object.keys(this._translations).sort((a, b) => {
+                    return this._languageUsage.indexOf(a) - this._languageUsage.indexOf(b);
+                }),
+                evicted: this._evictedLanguages.slice(),
+                evictions: this._languageEvictions
+            },
+            manifestLoaded: this._manifest !== null,
+            mapShards: this._mapShards[this._currentLanguage] ? this._mapShards[this._currentLanguage].maps.slice() : [],
+            windows: {
+                tracked: this._drawnWindows.size,
+                pending: this._dirtyWindows.length
+            },
+            dataDirectory: this.getDataDirectory(),
+            dictionaryFormat: this._translations[this._currentLanguage] instanceof BinaryDictionary ? 'pack' : 'json',
             translationCount: this._availableLanguages.reduce((count, lang) => {
-                return count + (this._translations[lang] ? Object.keys(this._translations[lang]).length : 0);
-            }, 0)
+                var shards = this._getShardDictionary(lang);
+                return count + (this._translations[lang] ? dictionarySize(this._translations[lang]) : 0) +
+                    (shards ? Object.keys(shards).length : 0);
+            }, 0),
+            cache: {
+                capacity: translationCacheSize,
+                size: this._translationCaches[this._currentLanguage] ? this._translationCaches[this._currentLanguage].size() : 0,
+                hits: this._cacheStats.hits,
+                misses: this._cacheStats.misses,
+                evictions: this._cacheStats.evictions
+            },
+            profile: this.getProfile()
         };
     };
 
     // 套用翻譯到 TextManager
     TranslationManager.prototype._applyTranslations = function () {
         if (!this._isInitialized) return;
+        var start = this._profile ? now() : 0;
 
         // 備份原始的 TextManager 方法
         if (!TextManager._originalBasic) {
@@ -395,57 +1889,62 @@
 
         var self = this;
 
-        // 覆蓋 TextManager 方法
+        // 覆蓋 TextManager 方法：從目前語言的用語表讀取，切換語言時自動改讀該語言的用語表
         TextManager.basic = function (basicId) {
-            var originalText = TextManager._originalBasic ? TextManager._originalBasic(basicId) : $dataSystem.terms.basic[basicId] || '';
-            return self.translate(originalText);
+            return self._noteRead(self._getTermTable().basic[basicId] || '');
         };
 
         TextManager.param = function (paramId) {
-            var originalText = TextManager._originalParam ? TextManager._originalParam(paramId) : $dataSystem.terms.params[paramId] || '';
-            return self.translate(originalText);
+            return self._noteRead(self._getTermTable().param[paramId] || '');
         };
 
         TextManager.command = function (commandId) {
-            var originalText = TextManager._originalCommand ? TextManager._originalCommand(commandId) : $dataSystem.terms.commands[commandId] || '';
-            return self.translate(originalText);
+            return self._noteRead(self._getTermTable().command[commandId] || '');
         };
 
         TextManager.message = function (messageId) {
-            var originalText = TextManager._originalMessage ? TextManager._originalMessage(messageId) : $dataSystem.terms.messages[messageId] || '';
-            return self.translate(originalText);
+            return self._noteRead(self._getTermTable().message[messageId] || '');
         };
 
-        // 處理動態屬性
+        // 處理動態屬性（用語表以外的方法仍逐次翻譯）
         if (TextManager._originalGetter) {
-            var originalGetter = TextManager._originalGetter;
             TextManager.getter = function (method, param) {
                 return {
                     get: function () {
-                        var originalText = this[method](param);
-                        return self.translate(originalText);
-                    }.bind(originalGetter(method, param))
+                        var table = self._getTermTable()[method];
+                        return table ? self._noteRead(table[param] || '') : self.translate(TextManager[method](param));
+                    },
+                    configurable: true
                 };
             };
         }
 
         // 處理貨幣單位
-        if (typeof TextManager.currencyUnit === 'object' && TextManager.currencyUnit.get) {
-            var originalCurrencyUnit = $dataSystem ? $dataSystem.currencyUnit : '';
+        var currencyUnit = Object.getOwnPropertyDescriptor(TextManager, 'currencyUnit');
+        if (currencyUnit && currencyUnit.configurable && (currencyUnit.get ||
+            (typeof TextManager.currencyUnit === 'object' && TextManager.currencyUnit.get))) {
             Object.defineProperty(TextManager, 'currencyUnit', {
                 get: function () {
-                    return self.translate(originalCurrencyUnit);
+                    return self._noteRead(self._getTermTable().currencyUnit);
                 },
                 configurable: true
             });
         }
+
+        if (this._profile) this._recordTiming('applyTranslations', start);
     };
 
-    // 重新整理所有視窗
+    // 語言變更後重新整理：將畫過翻譯文字的視窗標記為需要重新繪製，並分散在之後的畫面更新中處理
     TranslationManager.prototype._refreshAllWindows = function () {
-        if (SceneManager._scene) {
-            SceneManager._scene._refreshAllWindows();
-        }
+        var start = this._profile ? now() : 0;
+        var dirty = this._dirtyWindows;
+        this._getDrawnWindows().forEach(function (target) {
+            if (dirty.indexOf(target) === -1) dirty.push(target);
+        });
+        // 顯示中的視窗優先重新繪製
+        dirty.sort(function (a, b) {
+            return (b.visible !== false) - (a.visible !== false);
+        });
 
         // 呼叫所有註冊的重新整理回呼
         this._refreshCallbacks.forEach(function (callback) {
@@ -453,6 +1952,76 @@
                 callback();
             }
         });
+
+        if (this._profile) this._recordTiming('refreshAllWindows', start);
+    };
+
+    // 目前場景的視窗記錄（切換場景時重設，舊場景的視窗不會被保留）
+    TranslationManager.prototype._getDrawnWindows = function () {
+        var scene = SceneManager._scene || null;
+        if (this._drawnScene !== scene) {
+            this._drawnScene = scene;
+            this._drawnWindows = new Set();
+            this._dirtyWindows = [];
+        }
+        return this._drawnWindows;
+    };
+
+    // 記錄讀取的翻譯結果（translate、translateMessage 或 TextManager 用語）並原樣回傳
+    // 在視窗繪製文字的過程中讀取時直接記錄該視窗，否則等待畫出這段文字的視窗認領
+    TranslationManager.prototype._noteRead = function (text) {
+        if (this._drawingWindow) {
+            this._getDrawnWindows().add(this._drawingWindow);
+        } else if (text) {
+            // 只做陣列 push，translate 的熱路徑不做雜湊或搬移
+            var pending = this._pendingReads;
+            var max = TranslationManager.MAX_PENDING_READS;
+            if (pending.push(text) > max * 2) pending.splice(0, pending.length - max);
+        }
+        return text;
+    };
+
+    // 視窗繪製文字時呼叫：畫出的文字包含已讀取的翻譯結果時記錄此視窗，並移除被認領的結果
+    // 其他視窗畫出不含這些結果的文字不會影響記錄
+    TranslationManager.prototype.onWindowDrawText = function (target, text) {
+        var pending = this._pendingReads;
+        if (pending.length === 0 || text === undefined || text === null) return;
+        text = String(text);
+        var kept = 0;
+        for (var i = 0; i < pending.length; i++) {
+            if (text.indexOf(pending[i]) === -1) pending[kept++] = pending[i];
+        }
+        if (kept === pending.length) return;
+        pending.length = kept;
+        this._getDrawnWindows().add(target);
+    };
+
+    // 繪製視窗文字：先認領畫出的翻譯結果，繪製過程中讀取的翻譯也記錄到此視窗
+    TranslationManager.prototype.drawWindowText = function (target, text, draw) {
+        this.onWindowDrawText(target, text);
+        var previous = this._drawingWindow;
+        this._drawingWindow = target;
+        try {
+            return draw();
+        } finally {
+            this._drawingWindow = previous;
+        }
+    };
+
+    // 每個畫面更新時重新繪製部分標記的視窗
+    TranslationManager.prototype.updateWindowRefresh = function () {
+        if (this._dirtyWindows.length === 0) return;
+        this._getDrawnWindows(); // 場景已切換時捨棄舊場景的視窗
+        var dirty = this._dirtyWindows;
+        var start = now();
+        while (dirty.length > 0) {
+            var target = dirty.shift();
+            if (typeof target.refresh === 'function') {
+                target.refresh();
+            }
+            if (now() - start >= TranslationManager.REFRESH_FRAME_BUDGET) break;
+        }
+        if (this._profile) this._recordTiming('refreshWindows', start);
     };
 
     // 註冊重新整理回呼
@@ -472,6 +2041,7 @@
 
     // 建立全域實例
     window.TranslationManager = TranslationManager;
+    TranslationManager.BinaryDictionary = BinaryDictionary;
     window.$translationManager = new TranslationManager();
 
     // 在 DataManager 載入完成後初始化翻譯管理器
@@ -480,22 +2050,86 @@
         _DataManager_onLoad.call(this, object);
 
         if (object === $dataSystem) {
+            // 切換資料目錄後系統資料已替換，重新記錄用語原文
+            if ($translationManager._isInitialized) {
+                $translationManager._buildOriginalTextMapping();
+            }
             // 系統資料載入完成後初始化翻譯管理器
             $translationManager.initialize();
         }
     };
 
-    // 擴展 Scene_Base 來支援視窗重新整理
-    var _Scene_Base_create = Scene_Base.prototype.create;
-    Scene_Base.prototype.create = function () {
-        _Scene_Base_create.call(this);
-        this._refreshAllWindows = this._refreshAllWindows || function () {
-            this.children.forEach(function (child) {
-                if (child.refresh && typeof child.refresh === 'function') {
-                    child.refresh();
-                }
-            });
-        };
+    // 載入資料庫前先讀取翻譯清單，以決定是否使用預先烘焙的資料目錄
+    var _DataManager_loadDatabase = DataManager.loadDatabase;
+    DataManager.loadDatabase = function () {
+        var self = this;
+        if (!window.$translationManager) {
+            _DataManager_loadDatabase.call(this);
+            return;
+        }
+        $translationManager.prepareDataSet(function () {
+            _DataManager_loadDatabase.call(self);
+        });
+    };
+
+    // 從目前語言的資料目錄讀取資料檔（'data/' + '../data_zh/' + 檔名）
+    var _DataManager_loadDataFile = DataManager.loadDataFile;
+    DataManager.loadDataFile = function (name, src) {
+        var directory = window.$translationManager ? $translationManager.getDataDirectory() : null;
+        if (directory && src.indexOf('Test_') !== 0) {
+            src = '../' + directory + src;
+        }
+        _DataManager_loadDataFile.call(this, name, src);
+    };
+
+    // 載入地圖資料時一併載入該地圖的翻譯分片
+    var _DataManager_loadMapData = DataManager.loadMapData;
+    DataManager.loadMapData = function (mapId) {
+        _DataManager_loadMapData.call(this, mapId);
+        if (mapId > 0 && window.$translationManager) {
+            $translationManager.onMapChange(mapId);
+        }
+    };
+
+    // 地圖分片載入完成前，地圖場景視為尚未載入
+    var _DataManager_isMapLoaded = DataManager.isMapLoaded;
+    DataManager.isMapLoaded = function () {
+        return _DataManager_isMapLoaded.call(this) &&
+            (!window.$translationManager || $translationManager.isMapShardReady());
+    };
+
+    // 擴展 Scene_Base：每個畫面更新時重新繪製部分切換語言後標記的視窗
+    var _Scene_Base_update = Scene_Base.prototype.update;
+    Scene_Base.prototype.update = function () {
+        _Scene_Base_update.call(this);
+        if (window.$translationManager) {
+            window.$translationManager.updateWindowRefresh();
+        }
+    };
+
+    // 擴展 Window_Base：記錄畫過翻譯文字的視窗（包含 WindowLayer 中的視窗）
+    var _Window_Base_drawText = Window_Base.prototype.drawText;
+    Window_Base.prototype.drawText = function (text, x, y, maxWidth, align) {
+        var self = this;
+        var args = arguments;
+        if (!window.$translationManager) {
+            return _Window_Base_drawText.apply(this, args);
+        }
+        return window.$translationManager.drawWindowText(this, text, function () {
+            return _Window_Base_drawText.apply(self, args);
+        });
+    };
+
+    var _Window_Base_drawTextEx = Window_Base.prototype.drawTextEx;
+    Window_Base.prototype.drawTextEx = function (text, x, y) {
+        var self = this;
+        var args = arguments;
+        if (!window.$translationManager) {
+            return _Window_Base_drawTextEx.apply(this, args);
+        }
+        return window.$translationManager.drawWindowText(this, text, function () {
+            return _Window_Base_drawTextEx.apply(self, args);
+        });
     };
 
     // 擴展 Window_Options 來支援語言選擇
@@ -596,49 +2230,28 @@
     window.TranslationManager = TranslationManager;
     window.$translationManager = new TranslationManager();
 
-    // 覆蓋 Game_Message 的 add 方法來支援翻譯
-    var _Game_Message_add = Game_Message.prototype.add;
-    Game_Message.prototype.add = function (text) {
-        if (window.$translationManager && window.$translationManager._isInitialized) {
-            text = window.$translationManager.translate(text);
-        }
-        _Game_Message_add.call(this, text);
-    };
-
-    // 覆蓋 Window_Message 的 startMessage 方法來支援多行翻譯
-    var _Window_Message_startMessage = Window_Message.prototype.startMessage;
-    Window_Message.prototype.startMessage = function () {
-        _Window_Message_startMessage.call(this);
-
-        // 如果翻譯系統已初始化，處理多行文字翻譯
-        if (window.$translationManager && window.$translationManager._isInitialized) {
-            var originalText = this._textState.text;
-
-            // 首先嘗試翻譯完整的多行文字
-            var fullTranslation = window.$translationManager.translate(originalText);
+    // 在組合訊息時翻譯一次（訊息視窗與捲動文字都經由 allText 取得內容），
+    // 結果依原文與語言快取在訊息上，重複呼叫不會再次查找
+    var _Game_Message_allText = Game_Message.prototype.allText;
+    Game_Message.prototype.allText = function () {
+        var text = _Game_Message_allText.call(this);
+        var manager = window.$translationManager;
 
-            // 如果完整翻譯成功，檢查是否包含換行符並正確處理
-            if (fullTranslation !== originalText) {
-                this._textState.text = fullTranslation;
-            } else {
-                // 如果完整翻譯失敗，嘗試按行翻譯（保持向後兼容）
-                var translatedLines = [];
-                var lines = originalText.split('\n');
-
-                for (var i = 0; i < lines.length; i++) {
-                    var line = lines[i];
-                    if (line.trim()) { // 只翻譯非空行
-                        var translatedLine = window.$translationManager.translate(line);
-                        translatedLines.push(translatedLine !== line ? translatedLine : line);
-                    } else {
-                        translatedLines.push(line); // 保留空行
-                    }
-                }
+        // 預先烘焙的資料已是譯文，不需查找
+        if (!manager || !manager._isInitialized || manager.isDataPrebaked()) {
+            return text;
+        }
 
-                // 重新組合翻譯後的文字
-                this._textState.text = translatedLines.join('\n');
-            }
+        var cached = this._translatedText;
+        var language = manager.getCurrentLanguage();
+        if (!cached || cached.source !== text || cached.language !== language) {
+            cached = this._translatedText = {
+                source: text,
+                language: language,
+                text: manager.translateMessage(text.split('\n'))
+            };
         }
+        return cached.text;
     };
 
     // 為構造函數添加靜態方法
@@ -670,6 +2283,43 @@
         return [];
     };
 
+    TranslationManager.setProfiling = function (enabled) {
+        if (window.$translationManager) {
+            window.$translationManager.setProfiling(enabled);
+        }
+    };
+
+    TranslationManager.exportMissLog = function () {
+        if (window.$translationManager) {
+            return window.$translationManager.exportMissLog();
+        }
+        return null;
+    };
+
+    // 將未翻譯記錄存成 JSON（NW.js 寫入遊戲目錄，瀏覽器則下載檔案）
+    TranslationManager.saveMissLog = function () {
+        var log = TranslationManager.exportMissLog();
+        if (!log) return null;
+
+        var filename = 'translation-misses-' + log.exportedAt + '.json';
+        var content = JSON.stringify(log, null, 2);
+        if (typeof Utils !== 'undefined' && Utils.isNwjs && Utils.isNwjs()) {
+            var fs = require('fs');
+            var path = require('path');
+            filename = path.join(path.dirname(process.mainModule.filename), filename);
+            fs.writeFileSync(filename, content);
+        } else if (typeof document !== 'undefined' && typeof Blob !== 'undefined') {
+            var link = document.createElement('a');
+            link.href = URL.createObjectURL(new Blob([content], { type: 'application/json' }));
+            link.download = filename;
+            link.click();
+            URL.revokeObjectURL(link.href);
+        } else {
+            console.log(content);
+        }
+        return filename;
+    };
+
     // 為 DTextPicture 外掛提供的方法
     TranslationManager.translateIfNeed = function (text, callback) {
         if (window.$translationManager && window.$translationManager._isInitialized) {
@@ -0,0 +1,102 @@
+// 基準線：以 --save 儲存結果，以 --compare 與已儲存的結果比較，數值變慢超過容許範圍即視為退步
+// 結果格式與 benchmarks/installer_bench.py 相同：
+//   { benchmark, runtime, date, results: { 案例: { 指標: 數值 } } }
+// 只比較以時間單位 (.s、.ms、.us) 結尾的指標，這些數值越小越好；其他指標（例如命中率）僅供參考
+// 變慢超過「基準值 × 容許比例 + 各單位的最小差異」才算退步
+var fs = require('fs');
+
+// 計時結果會隨機器負載變動；共用或負載不穩定的機器上可以用 --tolerance 放寬
+var DEFAULT_TOLERANCE = 0.5;
+// 每個案例重複量測的次數，結果取中位數
+var DEFAULT_RUNS = 3;
+var TIME_METRIC = /\.(s|ms|us)$/;
+// 容許的變慢為基準值乘以容許比例再加上此值：.s 與 .ms 為單次操作的時間，1 毫秒以內的差異是排程造成的；
+// .us 為每次呼叫的微秒數，不同行程之間的 JIT 與 GC 狀態會造成約 1 微秒的差異
+var MIN_DELTA = { s: 0.001, ms: 1, us: 1 };
+
+// 解析 --save PATH、--compare PATH、--tolerance N、--runs N，其餘參數依序放在 args
+exports.parseArgs = function (argv) {
+    var options = { save: null, compare: null, tolerance: DEFAULT_TOLERANCE, runs: DEFAULT_RUNS, args: [] };
+    for (var i = 0; i < argv.length; i++) {
+        if (argv[i] === '--save') {
+            options.save = argv[++i];
+        } else if (argv[i] === '--compare') {
+            options.compare = argv[++i];
+        } else if (argv[i] === '--tolerance') {
+            options.tolerance = parseFloat(argv[++i]);
+        } else if (argv[i] === '--runs') {
+            options.runs = Math.max(1, parseInt(argv[++i], 10) || DEFAULT_RUNS);
+        } else {
+            options.args.push(argv[i]);
+        }
+    }
+    return options;
+};
+
+// 回傳變慢超過容許範圍的指標 [{ name, baseline, current, ratio }]，只比較兩邊都有的時間指標
+exports.compare = function (baseline, current, tolerance) {
+    var regressions = [];
+    Object.keys(baseline.results).forEach(function (caseName) {
+        var metrics = current.results[caseName];
+        if (!metrics) return;
+        Object.keys(baseline.results[caseName]).forEach(function (metric) {
+            var before = baseline.results[caseName][metric];
+            var after = metrics[metric];
+            var unit = TIME_METRIC.exec(metric);
+            if (!unit || typeof after !== 'number' || !(before > 0)) return;
+            if (after > before * (1 + tolerance) + MIN_DELTA[unit[1]]) {
+                regressions.push({ name: caseName + ' ' + metric, baseline: before, current: after, ratio: after / before });
+            }
+        });
+    });
+    return regressions;
+};
+
+// 合併同一案例重複量測的結果：每個數值指標取中位數，單次偏慢或偏快的量測不影響結果
+exports.median = function (runs) {
+    var metrics = {};
+    Object.keys(runs[0]).forEach(function (metric) {
+        var values = runs.map(function (run) {
+            return run[metric];
+        }).sort(function (a, b) {
+            return a - b;
+        });
+        // 偶數次時取較小的中間值，保留實際量測到的數值
+        metrics[metric] = values[Math.floor((values.length - 1) / 2)];
+    });
+    return metrics;
+};
+
+// 輸出結果，並依選項儲存或比較；有退步時設定結束代碼為 1
+exports.finish = function (name, results, options) {
+    var report = {
+        benchmark: name,
+        runtime: 'node ' + process.version,
+        date: new Date().toISOString(),
+        results: results
+    };
+
+    Object.keys(results).forEach(function (caseName) {
+        console.log(caseName);
+        Object.keys(results[caseName]).forEach(function (metric) {
+            console.log('  ' + metric.padEnd(38) + results[caseName][metric]);
+        });
+    });
+
+    if (options.save) {
+        fs.writeFileSync(options.save, JSON.stringify(report, null, 2) + '\n');
+        console.log('Baseline written to ' + options.save);
+    }
+    if (options.compare) {
+        var baseline = JSON.parse(fs.readFileSync(options.compare, 'utf8'));
+        var regressions = exports.compare(baseline, report, options.tolerance);
+        regressions.forEach(function (regression) {
+            console.log('REGRESSION ' + regression.name + ': ' + regression.baseline + ' -> ' +
+                regression.current + ' (' + regression.ratio.toFixed(2) + 'x)');
+        });
+        console.log(regressions.length + ' regressions against ' + options.compare +
+            ' (tolerance ' + Math.round(options.tolerance * 100) + '%)');
+        if (regressions.length > 0) process.exitCode = 1;
+    }
+    return report;
+};
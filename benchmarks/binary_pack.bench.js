@@ -0,0 +1,119 @@
+// 二進位翻譯包基準測試：JSON.parse 的物件字典與 BinaryDictionary 的記憶體、載入與查找時間
+//
+// 用法: node --expose-gc benchmarks/binary_pack.bench.js [項目數量]
+// 需要 python3（以 install_plugin.py 產生翻譯包）
+var fs = require('fs');
+var os = require('os');
+var path = require('path');
+var childProcess = require('child_process');
+var env = require('./env');
+
+var entryCount = parseInt(process.argv[2], 10) || 200000;
+
+if (!global.gc) {
+    console.error('請以 node --expose-gc 執行（npm run bench:pack）');
+    process.exit(1);
+}
+
+var makeRandom = function (seed) {
+    return function () {
+        seed = (Math.imul(seed, 1103515245) + 12345) & 0x7fffffff;
+        return seed / 0x7fffffff;
+    };
+};
+var random = makeRandom(7);
+var randomText = function (length, base, range) {
+    var chars = [];
+    for (var i = 0; i < length; i++) {
+        chars.push(String.fromCharCode(base + Math.floor(random() * range)));
+    }
+    return chars.join('');
+};
+
+// 合成字典：日文原文、中文譯文，部分含控制字元、部分譯文與原文相同或重複
+var source = {};
+var keys = [];
+var sharedValues = [];
+for (var v = 0; v < 500; v++) {
+    sharedValues.push(randomText(2 + Math.floor(random() * 6), 0x4e00, 0x800));
+}
+for (var i = 0; i < entryCount; i++) {
+    var key = randomText(4 + Math.floor(random() * 36), 0x3041, 0x56);
+    if (i % 5 === 0) key = '\\C[' + (i % 8) + ']' + key + '\\C[0]';
+    var roll = random();
+    if (roll < 0.1) {
+        source[key] = key;
+    } else if (roll < 0.2) {
+        source[key] = sharedValues[Math.floor(random() * sharedValues.length)];
+    } else {
+        source[key] = randomText(key.length, 0x4e00, 0x800);
+    }
+    keys.push(key);
+}
+
+var workDir = fs.mkdtempSync(path.join(os.tmpdir(), 'dtp-bench-'));
+var jsonPath = path.join(workDir, 'zh.json');
+fs.writeFileSync(jsonPath, JSON.stringify(source));
+childProcess.execFileSync('python3', ['-c', 'import sys, install_plugin; install_plugin.pack_translation(sys.argv[1])', jsonPath], {
+    cwd: path.join(__dirname, '..'),
+    stdio: 'ignore'
+});
+var jsonText = fs.readFileSync(jsonPath, 'utf8');
+var packBytes = fs.readFileSync(path.join(workDir, 'zh.dtp'));
+fs.rmSync(workDir, { recursive: true, force: true });
+
+var tm = env.loadPlugin({}, {});
+var BinaryDictionary = tm.constructor.BinaryDictionary;
+
+var usedMb = function () {
+    global.gc();
+    var usage = process.memoryUsage();
+    return (usage.heapUsed + usage.arrayBuffers) / 1048576;
+};
+
+// 模擬 XHR 收到回應 (response) 後建立字典 (parse)：
+// peak 為回應仍被參照時的記憶體，retained 為只剩字典時的記憶體
+var load = function (response, parse) {
+    var base = usedMb();
+    var body = response();
+    var start = process.hrtime.bigint();
+    var value = parse(body);
+    var loadMs = Number(process.hrtime.bigint() - start) / 1e6;
+    var peak = usedMb() - base;
+    body = null;
+    return { value: value, loadMs: loadMs, peak: peak, retained: usedMb() - base };
+};
+
+var jsonBytes = Buffer.from(jsonText, 'utf8');
+jsonText = null;
+var json = load(function () { return jsonBytes.toString('utf8'); }, JSON.parse);
+var pack = load(function () {
+    var buffer = new ArrayBuffer(packBytes.length);
+    new Uint8Array(buffer).set(packBytes);
+    return buffer;
+}, function (buffer) { return new BinaryDictionary(buffer); });
+
+var queries = [];
+for (var q = 0; q < 10000; q++) {
+    queries.push(q % 2 ? keys[Math.floor(random() * keys.length)] : randomText(12, 0xac00, 0x100));
+}
+queries.forEach(function (text) {
+    var expected = Object.prototype.hasOwnProperty.call(json.value, text) ? json.value[text] : undefined;
+    if (pack.value.get(text) !== expected) {
+        throw new Error('BinaryDictionary result differs from JSON for: ' + text);
+    }
+});
+
+var jsonLookupMs = env.measure(function () {
+    queries.forEach(function (text) { return json.value[text]; });
+}, 500) / queries.length;
+var packLookupMs = env.measure(function () {
+    queries.forEach(function (text) { return pack.value.get(text); });
+}, 500) / queries.length;
+
+console.log('entries:                 ' + entryCount);
+console.log('file size (json / pack): ' + (jsonBytes.length / 1048576).toFixed(1) + ' MB / ' + (packBytes.length / 1048576).toFixed(1) + ' MB');
+console.log('peak (json / pack):      ' + json.peak.toFixed(1) + ' MB / ' + pack.peak.toFixed(1) + ' MB');
+console.log('retained (json / pack):  ' + json.retained.toFixed(1) + ' MB / ' + pack.retained.toFixed(1) + ' MB');
+console.log('load (json / pack):      ' + json.loadMs.toFixed(1) + ' ms / ' + pack.loadMs.toFixed(1) + ' ms');
+console.log('lookup (json / pack):    ' + (jsonLookupMs * 1000).toFixed(2) + ' us / ' + (packLookupMs * 1000).toFixed(2) + ' us');
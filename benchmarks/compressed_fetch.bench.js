@@ -0,0 +1,148 @@
+// 啟動時讀取翻譯檔的基準測試：在本機靜態伺服器上比較未壓縮 JSON 與 gzip 壓縮檔
+// （DecompressionStream 串流解壓縮）的讀取時間，並以限速模擬網路頻寬
+//
+// 用法: node benchmarks/compressed_fetch.bench.js [字典項目數量]
+var http = require('http');
+var zlib = require('zlib');
+var env = require('./env');
+var corpus = require('./corpus');
+
+var entryCount = parseInt(process.argv[2], 10) || 100000;
+var runs = 3;
+var rates = [0, 100, 20]; // Mbit/s，0 為不限速
+
+var random = corpus.makeRandom(11);
+
+// 由固定詞彙組成句子，壓縮率比完全隨機的字元更接近實際的翻譯檔
+var sourceWords = corpus.makeVocabulary(random, 3000, 0x3041, 0x56);
+var targetWords = corpus.makeVocabulary(random, 3000, 0x4e00, 0x800);
+var sentence = function (words) {
+    var parts = [];
+    var count = 2 + Math.floor(random() * 12);
+    for (var i = 0; i < count; i++) {
+        parts.push(words[Math.floor(random() * words.length)]);
+    }
+    return parts.join(random() < 0.2 ? '、' : '');
+};
+
+var dictionary = {};
+for (var i = 0; i < entryCount; i++) {
+    dictionary[sentence(sourceWords) + i] = sentence(targetWords);
+}
+var files = {
+    '/translations/zh.json': Buffer.from(JSON.stringify(dictionary, null, 2))
+};
+// 與 install_plugin.py compress 相同的壓縮等級
+files['/translations/zh.json.gz'] = zlib.gzipSync(files['/translations/zh.json'], { level: 9 });
+
+// 靜態伺服器：.gz 以 application/gzip 傳送（不加 Content-Encoding），與一般靜態伺服器相同
+var rate = 0;
+var server = http.createServer(function (request, response) {
+    var data = files[request.url];
+    if (!data) {
+        response.writeHead(404);
+        response.end();
+        return;
+    }
+    response.writeHead(200, {
+        'Content-Type': /\.gz$/.test(request.url) ? 'application/gzip' : 'application/json',
+        'Content-Length': data.length
+    });
+    if (!rate) {
+        response.end(data);
+        return;
+    }
+    var bytesPerMs = rate * 1e6 / 8 / 1000;
+    var start = Date.now();
+    var offset = 0;
+    var pump = function () {
+        var allowed = Math.min(data.length, Math.floor((Date.now() - start + 1) * bytesPerMs));
+        if (allowed > offset) {
+            response.write(data.subarray(offset, allowed));
+            offset = allowed;
+        }
+        if (offset < data.length) {
+            setTimeout(pump, 2);
+        } else {
+            response.end();
+        }
+    };
+    pump();
+});
+
+var median = function (values) {
+    var sorted = values.slice().sort(function (a, b) { return a - b; });
+    return sorted[Math.floor(sorted.length / 2)];
+};
+
+var timeRuns = function (fn) {
+    var times = [];
+    var next = function () {
+        if (times.length >= runs) return Promise.resolve(median(times));
+        var start = process.hrtime.bigint();
+        return fn().then(function () {
+            times.push(Number(process.hrtime.bigint() - start) / 1e6);
+            return next();
+        });
+    };
+    return next();
+};
+
+// 載入是非同步的，外掛的載入日誌無法只在單一呼叫中關閉
+var print = console.log;
+console.log = function () { };
+
+server.listen(0, '127.0.0.1', function () {
+    var base = 'http://127.0.0.1:' + server.address().port + '/translations/';
+    // 啟動時的預設語言載入經由模擬的 XHR，提供空字典
+    var startup = {};
+    startup[base + 'zh.json'] = {};
+    var tm = env.loadPlugin({ 'Translation Path': base, 'Max Loaded Languages': '0' }, startup);
+    tm._manifest = { zh: { code: 'zh', file: 'zh.json', compressed: { gzip: 'zh.json.gz' } } };
+
+    // 未壓縮：下載、解碼、解析並設定字典（與外掛在瀏覽器中以 XHR 讀取 JSON 的步驟相同）
+    var loadPlain = function () {
+        return fetch(base + 'zh.json').then(function (response) {
+            return response.arrayBuffer();
+        }).then(function (buffer) {
+            tm._setDictionary('zh', JSON.parse(new TextDecoder('utf-8').decode(new Uint8Array(buffer))));
+            if (tm.getStatus().translationCount !== entryCount) throw new Error('plain JSON load failed');
+        });
+    };
+    // 壓縮檔：外掛的 loadLanguage（fetch + DecompressionStream + 解析 + 設定字典）
+    var loadCompressed = function () {
+        return tm.loadLanguage('zh').then(function (success) {
+            if (!success || tm.getStatus().translationCount !== entryCount) throw new Error('gzip load failed');
+        });
+    };
+
+    var plainBytes = files['/translations/zh.json'].length;
+    var gzipBytes = files['/translations/zh.json.gz'].length;
+    print('dictionary entries: ' + entryCount);
+    print('zh.json:            ' + (plainBytes / 1048576).toFixed(2) + ' MB');
+    print('zh.json.gz:         ' + (gzipBytes / 1048576).toFixed(2) + ' MB (' +
+        (plainBytes / gzipBytes).toFixed(1) + 'x smaller)');
+
+    var results = [];
+    rates.reduce(function (chain, value) {
+        return chain.then(function () {
+            rate = value;
+            return timeRuns(loadPlain).then(function (plainMs) {
+                return timeRuns(loadCompressed).then(function (gzipMs) {
+                    results.push({ rate: value, plain: plainMs, gzip: gzipMs });
+                });
+            });
+        });
+    }, Promise.resolve()).then(function () {
+        results.forEach(function (result) {
+            var label = result.rate ? (result.rate + ' Mbit/s').padEnd(10) : 'unlimited ';
+            print(label + ' json ' + result.plain.toFixed(0).padStart(6) + ' ms   gzip ' +
+                result.gzip.toFixed(0).padStart(6) + ' ms   (' + (result.plain / result.gzip).toFixed(2) + 'x)');
+        });
+        server.close();
+    }).catch(function (error) {
+        console.error(error);
+        server.close();
+        process.exitCode = 1;
+    });
+});
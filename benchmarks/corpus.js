@@ -0,0 +1,112 @@
+// 基準測試用的合成 mtool 字典：日文原文、中文譯文，包含多行訊息、控制字元與 %1 參數
+// 相同的 seed 產生相同的字典，讓不同版本的結果可以互相比較
+var makeRandom = exports.makeRandom = function (seed) {
+    return function () {
+        seed = (Math.imul(seed, 1103515245) + 12345) & 0x7fffffff;
+        return seed / 0x7fffffff;
+    };
+};
+
+var randomText = exports.randomText = function (random, length, base, range) {
+    var chars = [];
+    for (var i = 0; i < length; i++) {
+        chars.push(String.fromCharCode(base + Math.floor(random() * range)));
+    }
+    return chars.join('');
+};
+
+// 由固定詞彙組成句子，字元分布比完全隨機的字元更接近實際的對話
+var makeVocabulary = exports.makeVocabulary = function (random, count, base, range) {
+    var words = [];
+    for (var i = 0; i < count; i++) {
+        words.push(randomText(random, 1 + Math.floor(random() * 4), base, range));
+    }
+    return words;
+};
+
+var PLACEHOLDERS = [
+    ['%1は', '%1'],
+    ['\\N[1]「', '\\N[1]「'],
+    ['\\C[2]', '\\C[2]'],
+    ['\\V[3]個の', '\\V[3]個'],
+    ['%2ダメージ', '%2傷害']
+];
+
+// 產生 count 個項目的字典與查找樣本：
+//   exact     字典中的 key
+//   trim      前後加上空白的 key（去除空白後命中）
+//   miss      不在字典中的文字（韓文字元）
+//   substring 多行 key 的一行或 key 的一部分（full 模式的子字串擷取）
+exports.makeCorpus = function (count, seed, sampleCount) {
+    var random = makeRandom(seed || 1);
+    sampleCount = sampleCount || 500;
+    var sourceWords = makeVocabulary(random, 4000, 0x3041, 0x56);
+    var targetWords = makeVocabulary(random, 4000, 0x4e00, 0x800);
+    var sentence = function (words, minWords) {
+        var parts = [];
+        var length = minWords + Math.floor(random() * 10);
+        for (var i = 0; i < length; i++) {
+            parts.push(words[Math.floor(random() * words.length)]);
+        }
+        return parts.join(random() < 0.3 ? '、' : '');
+    };
+
+    var dictionary = {};
+    var keys = [];
+    var multiLine = [];
+    while (keys.length < count) {
+        var key, value;
+        var kind = random();
+        if (kind < 0.15) {
+            // 對話視窗的多行訊息
+            var lines = 2 + Math.floor(random() * 3);
+            var keyLines = [];
+            var valueLines = [];
+            for (var l = 0; l < lines; l++) {
+                keyLines.push(sentence(sourceWords, 3));
+                valueLines.push(sentence(targetWords, 3));
+            }
+            key = keyLines.join('\n');
+            value = valueLines.join('\n');
+        } else if (kind < 0.3) {
+            var placeholder = PLACEHOLDERS[Math.floor(random() * PLACEHOLDERS.length)];
+            key = placeholder[0] + sentence(sourceWords, 2);
+            value = placeholder[1] + sentence(targetWords, 2);
+        } else {
+            key = sentence(sourceWords, 1);
+            value = sentence(targetWords, 1);
+        }
+        if (dictionary[key] !== undefined) continue;
+        dictionary[key] = value;
+        keys.push(key);
+        if (kind < 0.15) multiLine.push(key);
+    }
+
+    var pick = function (list) {
+        return list[Math.floor(random() * list.length)];
+    };
+    var samples = { exact: [], trim: [], miss: [], substring: [] };
+    for (var s = 0; s < sampleCount; s++) {
+        samples.exact.push(pick(keys));
+        samples.trim.push(' ' + pick(keys) + '\n');
+        samples.miss.push(randomText(random, 6 + Math.floor(random() * 20), 0xac00, 0x100));
+        if (s % 2 === 0 && multiLine.length > 0) {
+            var parts = pick(multiLine).split('\n');
+            samples.substring.push(parts[Math.floor(random() * parts.length)]);
+        } else {
+            var source = pick(keys);
+            var start = Math.floor(random() * (source.length / 2));
+            samples.substring.push(source.substring(start, start + 4 + Math.floor(random() * 6)));
+        }
+    }
+    return { dictionary: dictionary, keys: keys, samples: samples };
+};
+
+// 同一組 key 的另一種語言（語言切換用）
+exports.translateCorpus = function (dictionary, suffix) {
+    var translated = {};
+    Object.keys(dictionary).forEach(function (key) {
+        translated[key] = dictionary[key] + suffix;
+    });
+    return translated;
+};
@@ -0,0 +1,51 @@
+// 基準測試環境 - 沿用 tests/setup.js 的 RPG Maker 模擬環境，不依賴 Jest
+global.jest = global.jest || { fn: function () { return function () { }; } };
+require('../tests/setup');
+
+// 以指定的參數與翻譯資料重新載入外掛，回傳新的 $translationManager
+exports.loadPlugin = function (parameters, mockData) {
+    var base = {
+        'Default Language': 'zh',
+        'Translation Path': 'translations/',
+        'Auto Detect Translations': 'false',
+        'Translation Mode': 'simple'
+    };
+    PluginManager.parameters = function () {
+        return Object.assign({}, base, parameters || {});
+    };
+    XMLHttpRequest.prototype.mockData = mockData || {};
+
+    var log = console.log;
+    console.log = function () { };
+    try {
+        global.loadPlugin();
+    } finally {
+        console.log = log;
+    }
+    return window.$translationManager;
+};
+
+// 在不輸出外掛日誌的情況下執行 fn
+exports.quiet = function (fn) {
+    var log = console.log;
+    console.log = function () { };
+    try {
+        return fn();
+    } finally {
+        console.log = log;
+    }
+};
+
+// 執行 fn 直到累積至少 minMs 毫秒，回傳每次呼叫的平均毫秒數
+exports.measure = function (fn, minMs) {
+    minMs = minMs || 200;
+    var iterations = 0;
+    var start = process.hrtime.bigint();
+    var elapsed = 0;
+    while (elapsed < minMs) {
+        fn();
+        iterations++;
+        elapsed = Number(process.hrtime.bigint() - start) / 1e6;
+    }
+    return elapsed / iterations;
+};
@@ -0,0 +1,201 @@
+# Installer benchmark: install_translation and update_plugins_js on synthetic
+# projects with large mtool dictionaries and long plugins.js files.
+#
+# Usage: python3 benchmarks/installer_bench.py [ENTRIES,...] [--save PATH] [--compare PATH] [--tolerance 0.5]
+#   Defaults to 1000,10000,100000 entries. Results use the same JSON format as
+#   benchmarks/baseline.js; metrics ending in .s/.ms/.us are compared, lower is better,
+#   and a metric regresses when it exceeds baseline * (1 + tolerance) + MIN_DELTA for its unit.
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from install_plugin import (  # noqa: E402
+    install_translation,
+    load_install_state,
+    save_install_state,
+    update_plugins_js,
+)
+
+# Timings drift with machine load; raise --tolerance on shared machines
+DEFAULT_TOLERANCE = 0.5
+# Allowed on top of the relative tolerance: 1 ms of timer and scheduler noise, whatever the metric's unit
+MIN_DELTA = {"s": 0.001, "ms": 1.0, "us": 1000.0}
+TIME_METRIC = re.compile(r"\.(s|ms|us)$")
+PLUGIN_COUNT = 500
+RUNS = 3
+
+PLACEHOLDERS = [("%1は", "%1"), ("\\N[1]「", "\\N[1]「"), ("\\C[2]", "\\C[2]"), ("\\V[3]個の", "\\V[3]個"), ("%2ダメージ", "%2傷害")]
+
+
+def make_dictionary(count, seed=1):
+    # Same shape as benchmarks/corpus.js: Japanese keys, Chinese values,
+    # multi-line messages and keys with escape codes or %1 placeholders
+    rng = random.Random(seed)
+
+    def vocabulary(base, span):
+        return ["".join(chr(base + rng.randrange(span)) for _ in range(1 + rng.randrange(4))) for _ in range(4000)]
+
+    source_words, target_words = vocabulary(0x3041, 0x56), vocabulary(0x4E00, 0x800)
+
+    def sentence(words, min_words):
+        return ("、" if rng.random() < 0.3 else "").join(rng.choice(words) for _ in range(min_words + rng.randrange(10)))
+
+    dictionary = {}
+    while len(dictionary) < count:
+        kind = rng.random()
+        if kind < 0.15:
+            lines = 2 + rng.randrange(3)
+            key = "\n".join(sentence(source_words, 3) for _ in range(lines))
+            value = "\n".join(sentence(target_words, 3) for _ in range(lines))
+        elif kind < 0.3:
+            source, target = rng.choice(PLACEHOLDERS)
+            key, value = source + sentence(source_words, 2), target + sentence(target_words, 2)
+        else:
+            key, value = sentence(source_words, 1), sentence(target_words, 1)
+        dictionary.setdefault(key, value)
+    return dictionary
+
+
+def make_plugins_js(count):
+    plugins = [
+        {
+            "name": f"Plugin{i:04d}",
+            "status": True,
+            "description": f"プラグイン {i}",
+            "parameters": {f"Param{j}": str(j * i) for j in range(8)},
+        }
+        for i in range(count)
+    ]
+    lines = ",\n".join(json.dumps(plugin, ensure_ascii=False) for plugin in plugins)
+    return f"// Generated by RPG Maker.\nvar $plugins =\n[\n{lines}\n];\n"
+
+
+def make_project(root, dictionary):
+    # Exported layout plus the files install_translation skips or rejects
+    www = Path(root) / "www"
+    (www / "js" / "plugins").mkdir(parents=True)
+    (Path(root) / "package.json").write_text('{"name": "game"}', encoding="utf-8")
+    (Path(root) / "notes.json").write_text(json.dumps([1, 2, 3]), encoding="utf-8")
+    (Path(root) / "game_zh.json").write_text(json.dumps(dictionary, ensure_ascii=False, indent=2), encoding="utf-8")
+    return str(root), str(www)
+
+
+def timed(fn, setup=None, runs=RUNS):
+    # Median milliseconds of fn() over runs; setup() runs untimed before each call
+    times = []
+    for _ in range(runs):
+        if setup:
+            setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn()
+            times.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(times), 3)
+
+
+def bench_project(entries, work_dir):
+    dictionary = make_dictionary(entries)
+    project = os.path.join(work_dir, f"project_{entries}")
+    os.makedirs(project)
+    target_dir, www_dir = make_project(project, dictionary)
+    plugins_js = os.path.join(www_dir, "js", "plugins.js")
+    plugins_source = make_plugins_js(PLUGIN_COUNT)
+    translation_size = os.path.getsize(os.path.join(target_dir, "game_zh.json"))
+
+    def reset_translations():
+        shutil.rmtree(os.path.join(www_dir, "translations"), ignore_errors=True)
+
+    def reset_plugins_js():
+        Path(plugins_js).write_text(plugins_source, encoding="utf-8")
+
+    metrics = {"translation.mb": round(translation_size / 1048576, 3)}
+    metrics["install_translation.ms"] = timed(lambda: install_translation(target_dir, www_dir), reset_translations)
+
+    # Incremental: a second run with the state of the first finds nothing to do
+    state = load_install_state(www_dir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        install_translation(target_dir, www_dir, state)
+        save_install_state(state)
+    metrics["install_translation.incremental.ms"] = timed(lambda: install_translation(target_dir, www_dir, state))
+
+    metrics["update_plugins_js.register.ms"] = timed(lambda: update_plugins_js(www_dir), reset_plugins_js)
+    metrics["update_plugins_js.registered.ms"] = timed(lambda: update_plugins_js(www_dir))
+    with contextlib.redirect_stdout(io.StringIO()):
+        update_plugins_js(www_dir, state)
+    metrics["update_plugins_js.incremental.ms"] = timed(lambda: update_plugins_js(www_dir, state))
+    return metrics
+
+
+def compare_results(baseline, current, tolerance):
+    # Time metrics that got slower than the baseline by more than the tolerance
+    regressions = []
+    for case, metrics in baseline["results"].items():
+        for metric, before in metrics.items():
+            after = current["results"].get(case, {}).get(metric)
+            unit = TIME_METRIC.search(metric)
+            if not unit or not isinstance(after, (int, float)) or not before > 0:
+                continue
+            if after > before * (1 + tolerance) + MIN_DELTA[unit.group(1)]:
+                regressions.append({"name": f"{case} {metric}", "baseline": before, "current": after, "ratio": after / before})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark install_translation and update_plugins_js.")
+    parser.add_argument("sizes", nargs="?", default="1000,10000,100000", help="dictionary sizes, comma separated")
+    parser.add_argument("--save", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", help="compare against a saved baseline; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"allowed slowdown before a metric counts as a regression (default: {DEFAULT_TOLERANCE})")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for entries in (int(size) for size in args.sizes.split(",")):
+            results[f"{entries} entries"] = bench_project(entries, work_dir)
+
+    report = {
+        "benchmark": "installer",
+        "runtime": f"python {platform.python_version()}",
+        "date": datetime.now(timezone.utc).isoformat(),
+        "results": results,
+    }
+    for case, metrics in results.items():
+        print(case)
+        for metric, value in metrics.items():
+            print(f"  {metric:<38}{value}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.save}")
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare_results(json.load(f), report, args.tolerance)
+        for regression in regressions:
+            print(
+                f"REGRESSION {regression['name']}: {regression['baseline']} -> {regression['current']} "
+                f"({regression['ratio']:.2f}x)"
+            )
+        print(f"{len(regressions)} regressions against {args.compare} (tolerance {args.tolerance:.0%})")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+// 查找引擎基準測試：以 1k 到 1M 個項目的合成字典量測 translate()、載入、_applyTranslations 與語言切換
+//
+// 用法: node benchmarks/lookup.bench.js [項目數量,...] [--save PATH] [--compare PATH] [--tolerance 0.5] [--runs 3]
+//   預設量測 1000,10000,100000 個項目；1000000 個項目需要較大的堆積，
+//   例如 node --max-old-space-size=6000 benchmarks/lookup.bench.js 1000000
+//   .us 為每次呼叫的微秒數（translate 每一輪先清除快取，量測實際查找），.ms 為毫秒
+//   每個項目數量重複量測 --runs 次，各指標取中位數
+var env = require('./env');
+var corpus = require('./corpus');
+var baseline = require('./baseline');
+
+var options = baseline.parseArgs(process.argv.slice(2));
+var sizes = (options.args[0] || '1000,10000,100000').split(',').map(function (size) {
+    return parseInt(size, 10);
+});
+
+// 與 RPG Maker MV 的 System.json 相同數量的用語
+var makeTerms = function (keys) {
+    var terms = { basic: [], params: [], commands: [], messages: {} };
+    for (var i = 0; i < 106; i++) {
+        var key = keys[i % keys.length];
+        if (i < 10) terms.basic.push(key);
+        else if (i < 20) terms.params.push(key);
+        else if (i < 46) terms.commands.push(key);
+        else terms.messages['message' + i] = key;
+    }
+    return terms;
+};
+
+var readTerms = function () {
+    var terms = $dataSystem.terms;
+    var length = 0;
+    for (var b = 0; b < terms.basic.length; b++) length += TextManager.basic(b).length;
+    for (var p = 0; p < terms.params.length; p++) length += TextManager.param(p).length;
+    for (var c = 0; c < terms.commands.length; c++) length += TextManager.command(c).length;
+    Object.keys(terms.messages).forEach(function (id) {
+        length += TextManager.message(id).length;
+    });
+    return length;
+};
+
+var round = function (value) {
+    return Math.round(value * 1000) / 1000;
+};
+
+// 取 5 次量測中最快的一次，避免偶發的 GC 停頓被記錄成退步
+var best = function (fn) {
+    var fastest = Infinity;
+    for (var i = 0; i < 5; i++) {
+        fastest = Math.min(fastest, env.measure(fn, 80));
+    }
+    return fastest;
+};
+
+// 每一輪先清除快取再查找所有樣本，回傳每次呼叫的微秒數
+var measureTranslate = function (tm, texts) {
+    var ms = best(function () {
+        tm._clearTranslationCache();
+        for (var i = 0; i < texts.length; i++) {
+            tm.translate(texts[i]);
+        }
+    });
+    return round(ms * 1000 / texts.length);
+};
+
+var hitRate = function (tm, texts) {
+    tm._clearTranslationCache();
+    var hits = texts.filter(function (text) {
+        return tm.translate(text) !== text;
+    }).length;
+    return hits / texts.length;
+};
+
+var loadManager = function (mode, mockData) {
+    return env.loadPlugin({ 'Translation Mode': mode, 'Max Loaded Languages': '0' }, mockData);
+};
+
+// 載入語言 3 次，回傳最快的 [解析毫秒數, 載入總毫秒數]（總時間包含模擬 XHR 序列化字典的時間）
+var timeLoad = function (tm, language) {
+    var parse = Infinity;
+    var total = Infinity;
+    for (var i = 0; i < 3; i++) {
+        tm.setProfiling(true);
+        var start = process.hrtime.bigint();
+        env.quiet(function () {
+            tm.loadLanguage(language, function () { });
+        });
+        total = Math.min(total, Number(process.hrtime.bigint() - start) / 1e6);
+        parse = Math.min(parse, tm.getProfile().timers['loadLanguage.parse'].total);
+        tm.setProfiling(false);
+    }
+    return [round(parse), round(total)];
+};
+
+// 以同一份字典量測一輪所有指標
+var measureSize = function (size, data) {
+    var metrics = {};
+
+    var tm = loadManager('simple', { zh: data.dictionary, en: corpus.translateCorpus(data.dictionary, '!') });
+    var zhLoad = timeLoad(tm, 'zh');
+    metrics['loadLanguage.parse.ms'] = zhLoad[0];
+    metrics['loadLanguage.total.ms'] = zhLoad[1];
+    env.quiet(function () {
+        tm.loadLanguage('en', function () { });
+    });
+    tm._currentLanguage = 'zh';
+    tm._isInitialized = true;
+    tm._buildOriginalTextMapping();
+
+    if (hitRate(tm, data.samples.exact) !== 1 || hitRate(tm, data.samples.trim) !== 1 || hitRate(tm, data.samples.miss) !== 0) {
+        throw new Error('unexpected lookup results for ' + size + ' entries');
+    }
+    metrics['translate.exact.us'] = measureTranslate(tm, data.samples.exact);
+    metrics['translate.trim.us'] = measureTranslate(tm, data.samples.trim);
+    metrics['translate.miss.us'] = measureTranslate(tm, data.samples.miss);
+    metrics['applyTranslations.us'] = round(best(function () {
+        tm._applyTranslations();
+    }) * 1000);
+    // 切換到另一個已載入的語言，並讀取一次所有用語（切換後視窗重新繪製時會讀取）
+    var languages = ['en', 'zh'];
+    var switches = 0;
+    metrics['switchLanguage.us'] = round(best(function () {
+        tm.setLanguage(languages[switches++ % 2]);
+        readTerms();
+    }) * 1000);
+    tm = null;
+
+    // full 模式：子字串擷取
+    var full = loadManager('full', { zh: data.dictionary });
+    env.quiet(function () {
+        full.loadLanguage('zh', function () { });
+    });
+    full._currentLanguage = 'zh';
+    full._isInitialized = true;
+    metrics['translate.substring.us'] = measureTranslate(full, data.samples.substring);
+    metrics['substring.hitRate'] = round(hitRate(full, data.samples.substring));
+    return metrics;
+};
+
+var results = {};
+sizes.forEach(function (size) {
+    var data = corpus.makeCorpus(size, 1);
+    global.$dataSystem = { terms: makeTerms(data.keys), currencyUnit: 'G' };
+    var runs = [];
+    for (var run = 0; run < options.runs; run++) {
+        runs.push(measureSize(size, data));
+    }
+    results[size + ' entries'] = baseline.median(runs);
+});
+
+baseline.finish('lookup', results, options);
@@ -0,0 +1,76 @@
+// full 模式子字串查找基準測試：逐一掃描所有 key 與 SubstringIndex 的比較
+//
+// 用法: node benchmarks/substring_index.bench.js [項目數量]
+var env = require('./env');
+var corpus = require('./corpus');
+
+var entryCount = parseInt(process.argv[2], 10) || 150000;
+
+// 產生類似 mtool 輸出的合成字典（日文原文、中文譯文、部分為多行訊息）
+var random = corpus.makeRandom(42);
+var randomText = corpus.randomText;
+
+var dictionary = {};
+var keys = [];
+for (var i = 0; i < entryCount; i++) {
+    var key = randomText(random, 10 + Math.floor(random() * 40), 0x3041, 0x56);
+    var value = randomText(random, key.length, 0x4e00, 0x800);
+    if (i % 4 === 0) {
+        key += '\n' + randomText(random, 20, 0x30a1, 0x56);
+        value += '\n' + randomText(random, 20, 0x4e00, 0x800);
+    }
+    dictionary[key] = value;
+    keys.push(key);
+}
+
+var queries = [];
+for (var q = 0; q < 200; q++) {
+    var source = keys[Math.floor(random() * keys.length)].split('\n')[0];
+    var start = Math.floor(random() * (source.length / 2));
+    queries.push(source.substring(start, start + 4 + Math.floor(random() * 6))); // 命中
+    queries.push(randomText(random, 8, 0xac00, 0x100)); // 未命中 (韓文字元不在字典中)
+}
+
+var tm = env.loadPlugin({ 'Translation Mode': 'full' }, { zh: dictionary });
+
+env.quiet(function () {
+    tm.loadLanguage('zh', function () { });
+});
+tm.setLanguage('zh');
+
+var buildStart = process.hrtime.bigint();
+delete tm._substringIndexes.zh;
+tm._getSubstringIndex('zh');
+var buildMs = Number(process.hrtime.bigint() - buildStart) / 1e6;
+tm._isInitialized = true;
+
+// 原本 translate() 中逐一掃描 key 的實作
+var linearLookup = function (text) {
+    for (var key in dictionary) {
+        var keyIndex = key.indexOf(text);
+        if (keyIndex !== -1 && key !== text) {
+            return tm._extractCorrespondingTranslation(text, key, dictionary[key], keyIndex);
+        }
+    }
+    return text;
+};
+
+var indexedLookup = function (text) {
+    var match = tm._getSubstringIndex('zh').find(text);
+    return match ? tm._extractCorrespondingTranslation(text, match.key, dictionary[match.key], match.index) : text;
+};
+
+queries.forEach(function (text) {
+    if (linearLookup(text) !== indexedLookup(text)) {
+        throw new Error('SubstringIndex result differs from linear scan for: ' + text);
+    }
+});
+
+var linearMs = env.measure(function () { queries.forEach(linearLookup); }, 1000) / queries.length;
+var indexedMs = env.measure(function () { queries.forEach(indexedLookup); }, 1000) / queries.length;
+
+console.log('entries:                 ' + entryCount);
+console.log('index build:             ' + buildMs.toFixed(1) + ' ms');
+console.log('linear scan per lookup:  ' + linearMs.toFixed(4) + ' ms');
+console.log('indexed per lookup:      ' + indexedMs.toFixed(4) + ' ms');
+console.log('speedup:                 ' + (linearMs / indexedMs).toFixed(1) + 'x');
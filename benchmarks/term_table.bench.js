@@ -0,0 +1,75 @@
+// TextManager 用語讀取基準測試：每次呼叫 translate() 的包裝函式與預先翻譯的用語表的比較
+//
+// 用法: node benchmarks/term_table.bench.js [字典項目數量]
+var env = require('./env');
+var corpus = require('./corpus');
+
+var entryCount = parseInt(process.argv[2], 10) || 50000;
+
+var random = corpus.makeRandom(7);
+var randomText = corpus.randomText;
+
+// 與 RPG Maker MV 的 System.json 相同數量的用語
+var terms = { basic: [], params: [], commands: [], messages: {} };
+var dictionary = {};
+var addTerm = function (list, key) {
+    var text = randomText(random, 2 + Math.floor(random() * 10), 0x3041, 0x56);
+    list[key] = text;
+    dictionary[text] = randomText(random, text.length, 0x4e00, 0x800);
+};
+for (var b = 0; b < 10; b++) addTerm(terms.basic, b);
+for (var p = 0; p < 10; p++) addTerm(terms.params, p);
+for (var c = 0; c < 26; c++) addTerm(terms.commands, c);
+for (var m = 0; m < 60; m++) addTerm(terms.messages, 'message' + m);
+for (var i = 0; i < entryCount; i++) {
+    dictionary[randomText(random, 10 + Math.floor(random() * 40), 0x3041, 0x56)] = randomText(random, 20, 0x4e00, 0x800);
+}
+
+global.$dataSystem = { terms: terms, currencyUnit: 'G' };
+var messageIds = Object.keys(terms.messages);
+
+var tm = env.loadPlugin({}, { zh: dictionary });
+env.quiet(function () {
+    tm.loadLanguage('zh', function () { });
+});
+tm._isInitialized = true;
+tm._buildOriginalTextMapping();
+tm._applyTranslations();
+
+// 原本 _applyTranslations 安裝的包裝函式：每次讀取都經過 translate()
+var wrappers = {
+    basic: function (id) { return tm.translate(terms.basic[id] || ''); },
+    param: function (id) { return tm.translate(terms.params[id] || ''); },
+    command: function (id) { return tm.translate(terms.commands[id] || ''); },
+    message: function (id) { return tm.translate(terms.messages[id] || ''); }
+};
+
+// 一次重新整理讀取所有用語（選單與狀態視窗會重複讀取同一批用語）
+var readAll = function (source) {
+    var length = 0;
+    for (var b = 0; b < terms.basic.length; b++) length += source.basic(b).length;
+    for (var p = 0; p < terms.params.length; p++) length += source.param(p).length;
+    for (var c = 0; c < terms.commands.length; c++) length += source.command(c).length;
+    for (var m = 0; m < messageIds.length; m++) length += source.message(messageIds[m]).length;
+    return length;
+};
+
+if (readAll(wrappers) !== readAll(TextManager)) {
+    throw new Error('term table results differ from the translate() wrappers');
+}
+
+var termCount = terms.basic.length + terms.params.length + terms.commands.length + messageIds.length;
+var wrapperMs = env.measure(function () { readAll(wrappers); }, 1000);
+var tableMs = env.measure(function () { readAll(TextManager); }, 1000);
+
+var buildStart = process.hrtime.bigint();
+delete tm._termTables.zh;
+tm._getTermTable();
+var buildMs = Number(process.hrtime.bigint() - buildStart) / 1e6;
+
+console.log('terms:                   ' + termCount);
+console.log('dictionary entries:      ' + entryCount);
+console.log('table build:             ' + buildMs.toFixed(3) + ' ms');
+console.log('translate() per refresh: ' + (wrapperMs * 1000).toFixed(2) + ' us');
+console.log('term table per refresh:  ' + (tableMs * 1000).toFixed(2) + ' us');
+console.log('speedup:                 ' + (wrapperMs / tableMs).toFixed(1) + 'x');
@@ -1,9 +1,29 @@
 import sys
 import os
+import io
+import re
+import glob
+import time
 import shutil
+import struct
 import json
+import zlib
+import codecs
+import heapq
+import hashlib
+import argparse
+import tempfile
+import contextlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
+try:
+    import brotli  # optional, only needed for .br copies
+except ImportError:
+    brotli = None
+
 PLUGIN_CONFIG = {
     "name": "DynamicTranslation",
     "status": True,
@@ -15,16 +35,229 @@ PLUGIN_CONFIG = {
     },
 }
 
+MANIFEST_NAME = "manifest.json"
+STATE_NAME = ".dynamic_translation_state.json"
+COVERAGE_CACHE_NAME = ".dynamic_translation_coverage.json"
+
+# Displayable text fields of the RPG Maker database files
+DATABASE_TEXT_FIELDS = {
+    "Actors.json": ("name", "nickname", "profile"),
+    "Classes.json": ("name",),
+    "Skills.json": ("name", "description", "message1", "message2"),
+    "Items.json": ("name", "description"),
+    "Weapons.json": ("name", "description"),
+    "Armors.json": ("name", "description"),
+    "Enemies.json": ("name",),
+    "States.json": ("name", "message1", "message2", "message3", "message4"),
+}
+
+SYSTEM_TEXT_LISTS = ("elements", "skillTypes", "weaponTypes", "armorTypes", "equipTypes")
+
+# Data files with event text besides the database files and maps
+EVENT_DATA_FILES = ("System.json", "CommonEvents.json", "Troops.json")
+
+MAP_FILE_PATTERN = re.compile(r"^Map(\d+)\.json$")
+
+# Streaming JSON reader settings
+CHUNK_SIZE = 64 * 1024
+MAX_TOKEN_SIZE = 16 * 1024 * 1024
+SNIFF_ENTRIES = 32
+JSON_WHITESPACE = " \t\n\r"
+JSON_DELIMITERS = JSON_WHITESPACE + ",}]"
+
+_json_decoder = json.JSONDecoder()
+
+# RPG Maker escape codes, matched the same way as NormalizedKeyIndex in the plugin
+ESCAPE_CODE_PATTERN = re.compile(r"\\(?:[A-Za-z]+\[[^\]\n]*\]|[A-Za-z]|[{}$.|!><^\\])")
+ESCAPE_CODE_NAME = re.compile(r"\\([A-Za-z]+)")
+PLACEHOLDER_PATTERN = re.compile(r"%\d+")
+# Codes that insert game values (variables, actor/party names, currency); a
+# translation that drops one shows the wrong text
+VALUE_ESCAPE_CODES = ("V", "N", "P", "G")
+
+# Entries per validate work item and findings kept per file in the report
+VALIDATE_CHUNK_ENTRIES = 5000
+VALIDATE_MAX_ISSUES = 1000
+
+# Coverage reports list at most this many untranslated texts (all are counted)
+COVERAGE_MAX_TEXTS = 5000
+
+# Entries per sorted run of the merge command, runs merged at once (open
+# files) and conflicts kept in its report
+MERGE_RUN_ENTRIES = 100000
+MERGE_FAN_IN = 64
+MERGE_MAX_CONFLICTS = 1000
+
+# Binary translation pack (.dtp), read by BinaryDictionary in the plugin.
+# Little-endian; sections after the 64-byte header, in order:
+#   string offsets  (strings + 1) x u32, byte offsets into the string data
+#   entries         count x (u32 key string, u32 value string), in source order
+#   sorted          count x u32 entry ids, ordered by key in UTF-16 code units
+#   hash buckets    buckets x u32 (entry id + 1, 0 = empty), linear probing
+#   string data     deduplicated strings, UTF-8 or UTF-16LE (PACK_FLAG_UTF16)
+PACK_SUFFIX = ".dtp"
+PACK_MAGIC = b"DTPK"
+PACK_VERSION = 1
+PACK_HEADER = struct.Struct("<4sHHIIII32s")
+PACK_HEADER_SIZE = 64
+PACK_FLAG_UTF16 = 1
+PACK_ENCODINGS = {"utf-8": "utf-8", "utf-16": "utf-16-le"}
+
+# Precompressed copies of translations/<lang>.json for web deployments. The
+# plugin fetches the gzip copy and inflates it with DecompressionStream; brotli
+# copies are for web servers that serve precompressed files themselves.
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "br": ".br"}
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+
+class TranslationFileError(ValueError):
+    pass
+
+
+def _new_file_mode(dest_path):
+    # mkstemp creates 0600 files; keep the mode of the file being replaced,
+    # or what open() would have used for a new one
+    try:
+        return os.stat(dest_path).st_mode & 0o777
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def write_file_atomic(dest_path, data):
+    # Write to a temp file next to the destination, then rename it into place
+    fd, temp_path = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(dest_path) or ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(temp_path, _new_file_mode(dest_path))
+        os.replace(temp_path, dest_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def copy_file_atomic(source_path, dest_path):
+    fd, temp_path = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(dest_path) or ".")
+    try:
+        with os.fdopen(fd, "wb") as temp_file, open(source_path, "rb") as source_file:
+            shutil.copyfileobj(source_file, temp_file, CHUNK_SIZE)
+        shutil.copystat(source_path, temp_path)
+        os.replace(temp_path, dest_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+# Incremental install state: content hashes plus size/mtime of every file the
+# installer reads or writes, stored next to the game in www/
+def load_install_state(www_dir):
+    state = {"version": 1, "files": {}}
+    try:
+        with open(os.path.join(www_dir, STATE_NAME), "r", encoding="utf-8") as f:
+            saved = json.load(f)
+        if saved.get("version") == 1 and isinstance(saved.get("files"), dict):
+            state = saved
+    except (OSError, ValueError, AttributeError):
+        pass
+    state["root"] = str(www_dir)
+    return state
+
+
+def save_install_state(state):
+    saved = {key: value for key, value in state.items() if key != "root"}
+    data = json.dumps(saved, ensure_ascii=False, indent=2).encode("utf-8")
+    write_file_atomic(os.path.join(state["root"], STATE_NAME), data)
+
+
+def _state_key(state, file_path):
+    relative = os.path.relpath(os.path.abspath(file_path), os.path.abspath(state["root"]))
+    if relative.startswith(".."):
+        return os.path.abspath(file_path)
+    return relative.replace(os.sep, "/")
+
+
+def file_signature(file_path):
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def hash_file(file_path):
+    hasher = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            hasher.update(block)
+    return "sha256:" + hasher.hexdigest()
+
+
+def record_file(state, file_path, content_hash=None):
+    signature = file_signature(file_path)
+    if signature is None:
+        state["files"].pop(_state_key(state, file_path), None)
+        return None
+    signature["hash"] = content_hash or hash_file(file_path)
+    state["files"][_state_key(state, file_path)] = signature
+    return signature["hash"]
+
+
+def fingerprint(state, file_path):
+    # Content hash of a file; only re-hashed when its size or mtime changed
+    known = state["files"].get(_state_key(state, file_path))
+    signature = file_signature(file_path)
+    if known and signature and all(known.get(k) == v for k, v in signature.items()):
+        return known["hash"]
+    return record_file(state, file_path)
+
+
+def is_output_current(state, file_path, expected_hash=None):
+    # An output is current when it is unchanged since we wrote it and was
+    # produced from the expected content
+    known = state["files"].get(_state_key(state, file_path))
+    signature = file_signature(file_path)
+    if not known or not signature or any(known.get(k) != v for k, v in signature.items()):
+        return False
+    return expected_hash is None or known.get("hash") == expected_hash
+
+
+def directory_signature(directory, exclude=()):
+    entries = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for file in sorted(files):
+            if file in exclude or file.startswith(".tmp-"):
+                continue
+            file_path = os.path.join(root, file)
+            signature = file_signature(file_path)
+            if signature:
+                relative = os.path.relpath(file_path, directory).replace(os.sep, "/")
+                entries.append([relative, signature["size"], signature["mtime_ns"]])
+    return entries
+
 
 def get_paths():
     # Use pathlib.Path for better unicode path handling
-    if len(sys.argv) > 1:
-        arg_dir = sys.argv[1]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if args:
+        arg_dir = args[0]
         # Ensure proper unicode handling - pathlib handles this better than os.path
         target_path = Path(arg_dir).resolve()
     else:
         target_path = Path.cwd().resolve()
-    
+
+    target_dir, www_dir = resolve_project_paths(target_path)
+    script_path = Path(__file__).resolve().parent
+
+    # Return as strings for backward compatibility with rest of code
+    return target_dir, www_dir, str(script_path)
+
+
+def resolve_project_paths(target_path):
+    target_path = Path(target_path)
     if not target_path.is_dir():
         raise SystemExit(f"Invalid target directory: {target_path}")
 
@@ -33,19 +266,16 @@ def get_paths():
     www_path = target_path / "www"
     js_path_in_www = www_path / "js"
     js_path_direct = target_path / "js"
-    plugins_path_in_www = js_path_in_www / "plugins"
     plugins_path_direct = js_path_direct / "plugins"
     
     if www_path.is_dir() and js_path_in_www.is_dir():
         # Traditional structure: project/www/js/
         www_dir = www_path
-        js_path = js_path_in_www
     elif js_path_direct.is_dir():
         # Exported/flat structure: project/js/ (no www subdirectory)
         # Even without www, if js/plugins exists, we can install
         # Treat the project root as the "www" equivalent
         www_dir = target_path
-        js_path = js_path_direct
         if plugins_path_direct.is_dir():
             print("Note: Detected exported/flat RPG Maker project structure (no www subdirectory)")
         else:
@@ -60,13 +290,10 @@ def get_paths():
             "  - Exported structure: project/js/ (with or without plugins subdirectory)"
         )
 
-    script_path = Path(__file__).resolve().parent
-    
-    # Return as strings for backward compatibility with rest of code
-    return str(target_path), str(www_dir), str(script_path)
+    return str(target_path), str(www_dir)
 
 
-def copy_plugin_file(script_dir, target_dir):
+def copy_plugin_file(script_dir, target_dir, state=None):
     plugin_source = os.path.join(script_dir, "DynamicTranslation.js")
     plugin_dest_dir = os.path.join(target_dir, "js", "plugins")
     plugin_dest = os.path.join(plugin_dest_dir, "DynamicTranslation.js")
@@ -76,24 +303,41 @@ def copy_plugin_file(script_dir, target_dir):
         print(f"Creating plugins directory at {plugin_dest_dir}...")
         os.makedirs(plugin_dest_dir, exist_ok=True)
 
+    source_hash = None
+    if state is not None:
+        source_hash = fingerprint(state, plugin_source)
+        if is_output_current(state, plugin_dest, source_hash):
+            print("DynamicTranslation.js is up to date. Skipping copy.")
+            return False
+
     print("Copying DynamicTranslation.js...")
-    shutil.copy2(plugin_source, plugin_dest)
+    copy_file_atomic(plugin_source, plugin_dest)
+    if state is not None:
+        record_file(state, plugin_dest, source_hash)
     print("Plugin copied successfully.")
+    return True
 
 
-def update_plugins_js(target_dir):
+def update_plugins_js(target_dir, state=None):
     plugins_js_path = os.path.join(target_dir, "js", "plugins.js")
 
     if not os.path.exists(plugins_js_path):
         print("Warning: js/plugins.js not found. Skipping registration.")
         return
 
+    # Unchanged since it was last checked: the registration is still there
+    if state is not None and is_output_current(state, plugins_js_path):
+        print("plugins.js is up to date. Skipping update.")
+        return
+
     print("Updating plugins.js...")
     with open(plugins_js_path, "r", encoding="utf-8") as f:
         content = f.read()
 
     if '"name":"DynamicTranslation"' in content:
         print("DynamicTranslation is already in plugins.js. Skipping update.")
+        if state is not None:
+            record_file(state, plugins_js_path)
         return
 
     plugin_string = json.dumps(PLUGIN_CONFIG, ensure_ascii=False)
@@ -113,12 +357,164 @@ def update_plugins_js(target_dir):
 
     new_content = f"{before_bracket}\n{prefix}{plugin_string}\n{after_bracket}"
 
-    with open(plugins_js_path, "w", encoding="utf-8") as f:
-        f.write(new_content)
+    write_file_atomic(plugins_js_path, new_content.encode("utf-8"))
+    if state is not None:
+        record_file(state, plugins_js_path)
     print("plugins.js updated successfully.")
 
 
-def install_translation(target_dir, www_dir):
+def iter_text_chunks(file_path, chunk_size=CHUNK_SIZE, on_read=None):
+    # Decode a file incrementally; on_read receives every raw block (copy/hash)
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    with open(file_path, "rb") as f:
+        while True:
+            raw = f.read(chunk_size)
+            if raw and on_read is not None:
+                on_read(raw)
+            text = decoder.decode(raw, final=not raw)
+            if text:
+                yield text
+            if not raw:
+                return
+
+
+def iter_json_object_items(chunks, string_values=False):
+    # Yield (key, value) pairs of a top-level JSON object without loading the
+    # whole document; only the current token is kept in memory. With
+    # string_values, a value that does not start with a quote is rejected
+    # before it is decoded
+    chunks = iter(chunks)
+    state = {"buf": "", "pos": 0, "eof": False}
+
+    def fill(min_size=1):
+        # Append at least min_size characters (fewer at the end of the file)
+        # with a single copy of the unread buffer
+        new, size = [], 0
+        while size < min_size:
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                state["eof"] = True
+                break
+            new.append(chunk)
+            size += len(chunk)
+        if not new:
+            return False
+        state["buf"] = state["buf"][state["pos"]:] + "".join(new)
+        state["pos"] = 0
+        if len(state["buf"]) > MAX_TOKEN_SIZE + CHUNK_SIZE:
+            raise TranslationFileError("JSON token too large")
+        return True
+
+    def skip_whitespace():
+        while True:
+            buf, pos = state["buf"], state["pos"]
+            while pos < len(buf) and buf[pos] in JSON_WHITESPACE:
+                pos += 1
+            state["pos"] = pos
+            if pos < len(buf) or not fill():
+                return
+
+    def peek():
+        skip_whitespace()
+        if state["pos"] >= len(state["buf"]):
+            raise TranslationFileError("unexpected end of file")
+        return state["buf"][state["pos"]]
+
+    def expect(allowed):
+        char = peek()
+        if char not in allowed:
+            raise TranslationFileError(f"expected {' or '.join(allowed)} but found {char!r}")
+        state["pos"] += 1
+        return char
+
+    def read_value():
+        skip_whitespace()
+        while True:
+            try:
+                value, end = _json_decoder.raw_decode(state["buf"], state["pos"])
+            except json.JSONDecodeError as e:
+                # Retry only once the unread buffer has doubled, so a large
+                # token is decoded a logarithmic number of times
+                pending = len(state["buf"]) - state["pos"]
+                if state["eof"] or not fill(max(pending, 1)):
+                    raise TranslationFileError(str(e)) from None
+                continue
+            # A number or literal is only complete once a delimiter follows it
+            buf = state["buf"]
+            if (
+                not isinstance(value, (str, list, dict))
+                and (end == len(buf) or buf[end] not in JSON_DELIMITERS)
+                and not state["eof"]
+                and fill()
+            ):
+                continue
+            state["pos"] = end
+            return value
+
+    expect("{")
+    if peek() == "}":
+        state["pos"] += 1
+    else:
+        while True:
+            if peek() != '"':
+                raise TranslationFileError("object keys must be strings")
+            key = read_value()
+            expect(":")
+            if string_values and peek() != '"':
+                raise TranslationFileError("translation values must be strings")
+            yield key, read_value()
+            if expect(",}") == "}":
+                break
+
+    skip_whitespace()
+    if state["pos"] < len(state["buf"]):
+        raise TranslationFileError("extra data after the top-level object")
+
+
+def sniff_translation_file(file_path, max_entries=SNIFF_ENTRIES):
+    # Read only the first entries: a translation file is a flat object that
+    # maps strings to strings
+    count = 0
+    try:
+        for _ in iter_json_object_items(iter_text_chunks(file_path), string_values=True):
+            count += 1
+            if count >= max_entries:
+                break
+    except (TranslationFileError, UnicodeDecodeError):
+        return False
+    except OSError as e:
+        print(f"Warning: failed to read {file_path}: {e}")
+        return False
+    return count > 0
+
+
+def copy_translation_file(source_path, dest_path, hasher=None):
+    # Validate every entry while streaming the bytes to a temp file, then
+    # move it into place; an invalid source leaves dest_path untouched
+    dest_dir = os.path.dirname(dest_path)
+    fd, temp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=dest_dir)
+    try:
+        with os.fdopen(fd, "wb") as temp_file:
+
+            def on_read(raw):
+                temp_file.write(raw)
+                if hasher is not None:
+                    hasher.update(raw)
+
+            count = 0
+            chunks = iter_text_chunks(source_path, on_read=on_read)
+            for _ in iter_json_object_items(chunks, string_values=True):
+                count += 1
+        shutil.copystat(source_path, temp_path)
+        os.replace(temp_path, dest_path)
+        return count
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def install_translation(target_dir, www_dir, state=None):
     # translations folder should be relative to where HTML file is located
     # For traditional structure: www/translations/ (HTML is in www/)
     # For exported structure: translations/ (HTML is in project root, www_dir == target_dir)
@@ -128,48 +524,1540 @@ def install_translation(target_dir, www_dir):
     if not os.path.exists(translations_dir):
         os.makedirs(translations_dir, exist_ok=True)
 
-    files = os.listdir(target_dir)
-    for file in files:
+    # A file that disappears or cannot be stat'ed is not a candidate
+    files, paths, signatures = [], [], []
+    for file in os.listdir(target_dir):
         if not file.endswith(".json") or file in ["package.json", "package-lock.json"]:
             continue
+        path = os.path.join(target_dir, file)
+        signature = file_signature(path)
+        if signature is None:
+            continue
+        files.append(file)
+        paths.append(path)
+        signatures.append(signature)
+    dest_path = os.path.join(translations_dir, "zh.json")
+
+    # Same candidates as last time (by name, size and mtime): the choice and
+    # the copy would be identical
+    if state is not None:
+        candidates = [[file] + list(signature.values()) for file, signature in zip(files, signatures)]
+        previous = state.get("translation") or {}
+        if previous.get("candidates") == candidates:
+            source = previous.get("source")
+            if source is None:
+                print("Translation candidates unchanged. Skipping search.")
+                return False
+            if is_output_current(state, dest_path, fingerprint(state, os.path.join(target_dir, source))):
+                print(f"translations/zh.json is up to date with {source}. Skipping copy.")
+                return True
+        state["translation"] = {"candidates": candidates, "source": None}
 
-        file_path = os.path.join(target_dir, file)
+    # Sniffing stops at the first non-string value, so checking the
+    # candidates one by one in listing order is cheap
+    for file, file_path in zip(files, paths):
+        if not sniff_translation_file(file_path):
+            continue
+
+        print(f"Found potential translation file: {file}")
+        hasher = hashlib.sha256()
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except (json.JSONDecodeError, UnicodeDecodeError):
+            copy_translation_file(file_path, dest_path, hasher)
+        except (TranslationFileError, UnicodeDecodeError) as e:
+            print(f"Warning: {file} is not a valid translation file: {e}")
             continue
         except OSError as e:
-            print(f"Warning: failed to read {file_path}: {e}")
+            print(f"Warning: failed to copy {file_path}: {e}")
             continue
 
-        # Smoke test: check if it's a dict with at least one string value
-        if (
-            isinstance(data, dict)
-            and data
-            and any(isinstance(v, str) for v in data.values())
-        ):
-            print(f"Found potential translation file: {file}")
-
-            dest_path = os.path.join(translations_dir, "zh.json")
-            shutil.copy2(file_path, dest_path)
-            print(f"Installed {file} to translations/zh.json")
-            return True
+        if state is not None:
+            content_hash = "sha256:" + hasher.hexdigest()
+            record_file(state, file_path, content_hash)
+            record_file(state, dest_path, content_hash)
+            state["translation"]["source"] = file
+        print(f"Installed {file} to translations/zh.json")
+        return True
 
     print("No suitable translation file found in root directory.")
     return False
 
 
+def build_manifest_entry(file_path):
+    hasher = hashlib.sha256()
+    entries = sum(1 for _ in iter_json_object_items(iter_text_chunks(file_path, on_read=hasher.update)))
+
+    entry = {
+        "code": Path(file_path).stem,
+        "file": os.path.basename(file_path),
+        "size": os.path.getsize(file_path),
+        "entries": entries,
+        "hash": "sha256:" + hasher.hexdigest(),
+    }
+
+    shards = find_shards(os.path.dirname(file_path), entry["code"])
+    if shards:
+        entry["shards"] = shards
+
+    pack = find_pack(file_path, hasher.digest())
+    if pack:
+        entry["pack"] = pack
+
+    compressed = find_compressed(file_path, hasher.digest())
+    if compressed:
+        entry["compressed"] = compressed
+
+    # translations/ sits next to data/, so a prebaked data_<lang>/ is its sibling
+    data = find_prebaked_data(os.path.dirname(os.path.dirname(os.path.abspath(file_path))), entry["code"])
+    if data:
+        entry["data"] = data
+    return entry
+
+
+def find_shards(translations_dir, language):
+    # Shards written by compile_shards live in translations/<lang>/
+    shard_dir = os.path.join(translations_dir, language)
+    if not os.path.isfile(os.path.join(shard_dir, "core.json")):
+        return None
+
+    maps = {}
+    for file in sorted(os.listdir(shard_dir)):
+        match = MAP_FILE_PATTERN.match(file)
+        if match:
+            maps[str(int(match.group(1)))] = f"{language}/{file}"
+    return {"core": f"{language}/core.json", "maps": maps}
+
+
+def find_pack(file_path, source_digest):
+    # A pack is only listed while it was built from the current JSON file
+    pack_path = os.path.splitext(file_path)[0] + PACK_SUFFIX
+    try:
+        header = read_pack_header(pack_path)
+    except (OSError, ValueError):
+        return None
+    if header["source_sha256"] != source_digest:
+        print(f"Warning: {os.path.basename(pack_path)} is out of date; run the pack command again")
+        return None
+    return os.path.basename(pack_path)
+
+
+def find_compressed(file_path, source_digest):
+    # Like packs, compressed copies are only listed while they inflate to the current JSON file
+    compressed = {}
+    for fmt, suffix in COMPRESSION_SUFFIXES.items():
+        path = file_path + suffix
+        if not os.path.isfile(path):
+            continue
+        name = os.path.basename(path)
+        if fmt == "br" and brotli is None:
+            print(f"Warning: the brotli module is not installed; cannot check {name}, not listing it")
+            continue
+        try:
+            digest = hash_compressed_file(path, fmt)
+        except (OSError, TranslationFileError) as e:
+            print(f"Warning: failed to read {name}: {e}")
+            continue
+        if digest != source_digest:
+            print(f"Warning: {name} is out of date; run the compress command again")
+            continue
+        compressed[fmt] = name
+    return compressed
+
+
+def find_prebaked_data(www_dir, language):
+    # Data sets written by prebake_data live in data_<lang>/ next to data/
+    if os.path.isdir(os.path.join(www_dir, f"data_{language}")):
+        return f"data_{language}/"
+    return None
+
+
+def write_manifest(translations_dir, state=None):
+    # The plugin reads this file at startup instead of probing every language
+    manifest_path = os.path.join(translations_dir, MANIFEST_NAME)
+    if state is not None:
+        inputs = directory_signature(translations_dir, exclude=(MANIFEST_NAME,))
+        if state.get("manifest_inputs") == inputs and is_output_current(state, manifest_path):
+            print(f"translations/{MANIFEST_NAME} is up to date. Skipping.")
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+    languages = []
+    for file in sorted(os.listdir(translations_dir)):
+        if not file.endswith(".json") or file == MANIFEST_NAME:
+            continue
+
+        file_path = os.path.join(translations_dir, file)
+        try:
+            languages.append(build_manifest_entry(file_path))
+        except (ValueError, UnicodeDecodeError) as e:
+            print(f"Warning: skipping {file} in manifest: {e}")
+        except OSError as e:
+            print(f"Warning: failed to read {file_path}: {e}")
+
+    manifest = {"version": 1, "languages": languages}
+    write_file_atomic(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+    if state is not None:
+        state["manifest_inputs"] = inputs
+        record_file(state, manifest_path)
+
+    codes = ", ".join(entry["code"] for entry in languages) or "none"
+    print(f"Wrote translations/{MANIFEST_NAME} (languages: {codes})")
+    return manifest
+
+
+def iter_event_text_units(commands):
+    # Consecutive Show Text (401) / Show Scrolling Text (405) lines form one message
+    message = []
+    message_code = None
+    for command in commands or []:
+        if not isinstance(command, dict):
+            continue
+        code = command.get("code")
+        params = command.get("parameters") or []
+
+        if code in (401, 405) and params and isinstance(params[0], str):
+            if message and code != message_code:
+                yield message
+                message = []
+            message.append((params, 0))
+            message_code = code
+            continue
+
+        if message:
+            yield message
+            message = []
+
+        if code == 101 and len(params) > 4 and isinstance(params[4], str) and params[4]:
+            # MZ speaker name
+            yield [(params, 4)]
+        elif code == 102 and params and isinstance(params[0], list):
+            for index, choice in enumerate(params[0]):
+                if isinstance(choice, str):
+                    yield [(params[0], index)]
+        elif code == 402 and len(params) > 1 and isinstance(params[1], str):
+            yield [(params, 1)]
+        elif code in (320, 324, 325) and len(params) > 1 and isinstance(params[1], str):
+            yield [(params, 1)]
+
+    if message:
+        yield message
+
+
+def iter_text_units(filename, data):
+    # Yield every displayable string of a data/*.json file as a list of
+    # (container, key) slots; multi-line messages yield one slot per line
+    def field_units(container, fields):
+        for field in fields:
+            if isinstance(container.get(field), str) and container[field]:
+                yield [(container, field)]
+
+    def list_units(container):
+        for index, value in enumerate(container or []):
+            if isinstance(value, str) and value:
+                yield [(container, index)]
+
+    if filename in DATABASE_TEXT_FIELDS:
+        for item in data or []:
+            if isinstance(item, dict):
+                yield from field_units(item, DATABASE_TEXT_FIELDS[filename])
+
+    elif filename == "System.json" and isinstance(data, dict):
+        yield from field_units(data, ("gameTitle", "currencyUnit"))
+        for name in SYSTEM_TEXT_LISTS:
+            yield from list_units(data.get(name))
+        terms = data.get("terms") or {}
+        for category in ("basic", "params", "commands"):
+            yield from list_units(terms.get(category))
+        messages = terms.get("messages") or {}
+        yield from field_units(messages, list(messages))
+
+    elif filename == "CommonEvents.json":
+        for event in data or []:
+            if isinstance(event, dict):
+                yield from iter_event_text_units(event.get("list"))
+
+    elif filename == "Troops.json":
+        for troop in data or []:
+            if isinstance(troop, dict):
+                for page in troop.get("pages") or []:
+                    yield from iter_event_text_units(page.get("list"))
+
+    elif MAP_FILE_PATTERN.match(filename) and isinstance(data, dict):
+        yield from field_units(data, ("displayName",))
+        for event in data.get("events") or []:
+            if isinstance(event, dict):
+                for page in event.get("pages") or []:
+                    yield from iter_event_text_units(page.get("list"))
+
+
+def unit_text(unit):
+    return "\n".join(container[key] for container, key in unit)
+
+
+def unit_lookup_candidates(unit):
+    # Strings TranslationManager.translate could look up for this unit:
+    # the joined message, each line, and their trimmed forms
+    texts = [unit_text(unit)]
+    if len(unit) > 1:
+        texts.extend(container[key] for container, key in unit)
+    for text in list(texts):
+        texts.append(text.strip())
+    return texts
+
+
+def is_text_data_file(filename):
+    return bool(MAP_FILE_PATTERN.match(filename)) or filename in DATABASE_TEXT_FIELDS or filename in EVENT_DATA_FILES
+
+
+def load_data_file(data_dir, filename):
+    with open(os.path.join(data_dir, filename), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compile_shards(www_dir, language="zh", dictionary_path=None):
+    translations_dir = os.path.join(www_dir, "translations")
+    data_dir = os.path.join(www_dir, "data")
+    dictionary_path = dictionary_path or os.path.join(translations_dir, f"{language}.json")
+
+    with open(dictionary_path, "r", encoding="utf-8") as f:
+        dictionary = json.load(f)
+
+    # key -> set of owners: a map id, or "core" for database/common events
+    owners = {}
+    for filename in sorted(os.listdir(data_dir)):
+        if not is_text_data_file(filename):
+            continue
+        match = MAP_FILE_PATTERN.match(filename)
+
+        try:
+            data = load_data_file(data_dir, filename)
+        except (ValueError, OSError) as e:
+            print(f"Warning: failed to read data/{filename}: {e}")
+            continue
+
+        owner = int(match.group(1)) if match else "core"
+        for unit in iter_text_units(filename, data):
+            for text in unit_lookup_candidates(unit):
+                if text in dictionary:
+                    owners.setdefault(text, set()).add(owner)
+
+    # Keys used by exactly one map go to that map's shard; everything else,
+    # including keys no data file references (plugin or script text), stays in core
+    core = {}
+    maps = {}
+    for key, value in dictionary.items():
+        key_owners = owners.get(key)
+        if key_owners and len(key_owners) == 1 and "core" not in key_owners:
+            maps.setdefault(next(iter(key_owners)), {})[key] = value
+        else:
+            core[key] = value
+
+    shard_dir = os.path.join(translations_dir, language)
+    os.makedirs(shard_dir, exist_ok=True)
+    for file in os.listdir(shard_dir):
+        if MAP_FILE_PATTERN.match(file):
+            os.remove(os.path.join(shard_dir, file))
+
+    def write_shard(filename, entries):
+        with open(os.path.join(shard_dir, filename), "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False)
+
+    write_shard("core.json", core)
+    for map_id, entries in sorted(maps.items()):
+        write_shard(f"Map{map_id:03d}.json", entries)
+
+    print(f"Wrote {language} shards: core ({len(core)} entries) + {len(maps)} map shards")
+    write_manifest(translations_dir)
+    return {"core": len(core), "maps": {map_id: len(entries) for map_id, entries in maps.items()}}
+
+
+def lookup_translation(dictionary, text):
+    # Same lookup order as TranslationManager.translate: exact, then trimmed
+    if text in dictionary:
+        return dictionary[text]
+    stripped = text.strip()
+    if stripped != text and stripped in dictionary:
+        return dictionary[stripped]
+    return None
+
+
+def build_message_key_index(dictionary):
+    # First line -> multi-line keys starting with it, longest first; mirrors
+    # MessageKeyIndex in the plugin
+    index = {}
+    for key in dictionary:
+        if "\n" in key:
+            index.setdefault(key.split("\n", 1)[0], []).append(key)
+    for keys in index.values():
+        keys.sort(key=lambda key: -key.count("\n"))
+    return index
+
+
+def _write_translation(slots, translation):
+    # Spread a translation over the slots of the lines it replaces; extra
+    # lines stay in the last slot, where the message window breaks them on "\n"
+    lines = translation.split("\n")
+    if len(lines) > len(slots):
+        lines[len(slots) - 1:] = ["\n".join(lines[len(slots) - 1:])]
+    lines += [""] * (len(slots) - len(lines))
+
+    changed = 0
+    for (container, key), line in zip(slots, lines):
+        if container[key] != line:
+            container[key] = line
+            changed += 1
+    return changed
+
+
+def match_text_lines(lines, dictionary, message_index=None):
+    # Yield (start, count, translation) spans in the order TranslationManager.translateMessage
+    # tries them: the whole message, then multi-line keys over consecutive
+    # lines, then single lines; translation is None where nothing matches
+    translation = lookup_translation(dictionary, "\n".join(lines))
+    if translation is not None or len(lines) == 1:
+        yield 0, len(lines), translation
+        return
+
+    if message_index is None:
+        message_index = build_message_key_index(dictionary)
+    i = 0
+    while i < len(lines):
+        span = None
+        for key in message_index.get(lines[i], ()):
+            count = key.count("\n") + 1
+            if i + count <= len(lines) and "\n".join(lines[i:i + count]) == key:
+                span = (key, count)
+                break
+
+        if span:
+            yield i, span[1], dictionary[span[0]]
+            i += span[1]
+            continue
+
+        if lines[i].strip():
+            yield i, 1, lookup_translation(dictionary, lines[i])
+        i += 1
+
+
+def bake_text_unit(unit, dictionary, message_index=None):
+    # Translate one text unit in place and return how many slots changed
+    lines = [container[key] for container, key in unit]
+    changed = 0
+    for start, count, translation in match_text_lines(lines, dictionary, message_index):
+        if translation is not None:
+            changed += _write_translation(unit[start:start + count], translation)
+    return changed
+
+
+def prebake_data(www_dir, language="zh", dictionary_path=None):
+    # Apply the dictionary to a copy of data/ so the game can load translated
+    # data files for this language instead of translating text at runtime
+    translations_dir = os.path.join(www_dir, "translations")
+    data_dir = os.path.join(www_dir, "data")
+    out_dir = os.path.join(www_dir, f"data_{language}")
+    dictionary_path = dictionary_path or os.path.join(translations_dir, f"{language}.json")
+
+    with open(dictionary_path, "r", encoding="utf-8") as f:
+        dictionary = json.load(f)
+    message_index = build_message_key_index(dictionary)
+
+    os.makedirs(out_dir, exist_ok=True)
+    files = sorted(file for file in os.listdir(data_dir) if file.endswith(".json"))
+    for file in os.listdir(out_dir):
+        if file.endswith(".json") and file not in files:
+            os.remove(os.path.join(out_dir, file))
+
+    stats = {"files": 0, "units": 0, "translated": 0}
+    for filename in files:
+        source_path = os.path.join(data_dir, filename)
+        dest_path = os.path.join(out_dir, filename)
+        if not is_text_data_file(filename):
+            # Tilesets, animations, MapInfos...: no text, copied as is
+            copy_file_atomic(source_path, dest_path)
+            stats["files"] += 1
+            continue
+
+        try:
+            data = load_data_file(data_dir, filename)
+        except (ValueError, OSError) as e:
+            print(f"Warning: failed to read data/{filename}: {e}")
+            continue
+
+        for unit in iter_text_units(filename, data):
+            stats["units"] += 1
+            if bake_text_unit(unit, dictionary, message_index):
+                stats["translated"] += 1
+
+        write_file_atomic(dest_path, json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        stats["files"] += 1
+
+    print(
+        f"Wrote data_{language}/: {stats['files']} files, "
+        f"{stats['translated']} of {stats['units']} text units translated"
+    )
+    if os.path.isdir(translations_dir):
+        write_manifest(translations_dir)
+    return stats
+
+
+def prebake_command(argv):
+    parser = argparse.ArgumentParser(
+        prog="install_plugin.py prebake",
+        description="Write translated copies of data/*.json to data_<lang>/ for the plugin to load.",
+    )
+    parser.add_argument("project", nargs="?", default=".", help="RPG Maker project root")
+    parser.add_argument("--lang", action="append", help="language code, repeatable (default: zh)")
+    parser.add_argument("--dictionary", help="source dictionary (default: translations/<lang>.json)")
+    args = parser.parse_args(argv)
+
+    languages = args.lang or ["zh"]
+    if args.dictionary and len(languages) > 1:
+        parser.error("--dictionary can only be used with a single --lang")
+
+    _, www_dir = resolve_project_paths(Path(args.project).resolve())
+    for language in languages:
+        prebake_data(www_dir, language, args.dictionary)
+
+
+def aggregate_miss_logs(log_paths, language=None, dictionary=None):
+    # Merge miss logs exported by TranslationManager.exportMissLog() and rank
+    # the texts by how many playtests hit them, then by total hits
+    totals = {}
+    for log_path in log_paths:
+        try:
+            with open(log_path, "r", encoding="utf-8") as f:
+                log = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: skipping {log_path}: {e}")
+            continue
+        if not isinstance(log, dict) or not isinstance(log.get("languages"), dict):
+            print(f"Warning: skipping {log_path}: not a miss log")
+            continue
+
+        seen = set()
+        for code, entries in log["languages"].items():
+            if language and code != language:
+                continue
+            for entry in entries or []:
+                text = entry.get("text") if isinstance(entry, dict) else None
+                if not isinstance(text, str) or not text or (dictionary and text in dictionary):
+                    continue
+                item = totals.setdefault(text, {"text": text, "count": 0, "sessions": 0})
+                item["count"] += int(entry.get("count") or 0)
+                if text not in seen:
+                    seen.add(text)
+                    item["sessions"] += 1
+
+    return sorted(totals.values(), key=lambda item: (-item["sessions"], -item["count"], item["text"]))
+
+
+def misses_command(argv):
+    parser = argparse.ArgumentParser(
+        prog="install_plugin.py misses",
+        description="Aggregate exported translation-miss logs into a ranked to-translate list.",
+    )
+    parser.add_argument("logs", nargs="+", help="miss log files or glob patterns")
+    parser.add_argument("--lang", help="only count misses recorded for this language")
+    parser.add_argument("--dictionary", help="leave out texts this dictionary already translates")
+    parser.add_argument("--output", help="write the ranked texts as an mtool dictionary (text -> text)")
+    parser.add_argument("--top", type=int, default=20, help="number of texts to print (default: 20)")
+    args = parser.parse_args(argv)
+
+    log_paths = []
+    for pattern in args.logs:
+        log_paths.extend(sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern])
+
+    dictionary = None
+    if args.dictionary:
+        with open(args.dictionary, "r", encoding="utf-8") as f:
+            dictionary = json.load(f)
+
+    ranked = aggregate_miss_logs(log_paths, args.lang, dictionary)
+    print(f"{len(ranked)} untranslated texts from {len(log_paths)} logs")
+    for item in ranked[: args.top]:
+        text = item["text"].replace("\n", "\\n")
+        print(f"{item['sessions']:>5} {item['count']:>8}  {text[:60]}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({item["text"]: item["text"] for item in ranked}, f, ensure_ascii=False, indent=2)
+        print(f"Wrote {args.output}")
+
+
+def extract_text_lines(data_path):
+    # Worker for the coverage command: the text units of one data file as
+    # lists of lines, or an error message
+    filename = os.path.basename(data_path)
+    try:
+        data = load_data_file(os.path.dirname(data_path), filename)
+    except (ValueError, OSError) as e:
+        return None, str(e)
+    return [[container[key] for container, key in unit] for unit in iter_text_units(filename, data)], None
+
+
+def load_coverage_cache(www_dir):
+    try:
+        with open(os.path.join(www_dir, COVERAGE_CACHE_NAME), "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        if cache.get("version") == 1 and isinstance(cache.get("files"), dict):
+            return cache
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {"version": 1, "files": {}}
+
+
+def scan_text_lines(www_dir, jobs=None, incremental=True):
+    # Return ({filename: units or None}, {filename: error}, scanned count).
+    # With incremental, units extracted by an earlier run are reused for data
+    # files whose content hash is unchanged; only the rest go to the pool
+    data_dir = os.path.join(www_dir, "data")
+    filenames = sorted(file for file in os.listdir(data_dir) if is_text_data_file(file))
+    state = load_install_state(www_dir) if incremental else None
+    cache = load_coverage_cache(www_dir) if incremental else {"version": 1, "files": {}}
+
+    units, errors, hashes, pending = {}, {}, {}, []
+    for filename in filenames:
+        path = os.path.join(data_dir, filename)
+        if state is not None:
+            hashes[filename] = fingerprint(state, path)
+            cached = cache["files"].get(filename)
+            if cached and cached.get("hash") == hashes[filename]:
+                units[filename] = cached["units"]
+                continue
+        pending.append(filename)
+
+    paths = [os.path.join(data_dir, filename) for filename in pending]
+    workers = jobs or os.cpu_count() or 1
+    if workers == 1 or len(paths) <= 1:
+        results = [extract_text_lines(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(extract_text_lines, paths, chunksize=max(1, len(paths) // (workers * 4))))
+
+    for filename, (file_units, error) in zip(pending, results):
+        if error:
+            print(f"Warning: failed to read data/{filename}: {error}")
+            errors[filename] = error
+        units[filename] = file_units
+
+    # The cache is only rewritten when a data file was added, changed or removed
+    readable = [filename for filename in filenames if units[filename] is not None]
+    if state is not None and (pending or sorted(cache["files"]) != readable):
+        cache["files"] = {filename: {"hash": hashes[filename], "units": units[filename]} for filename in readable}
+        write_file_atomic(
+            os.path.join(www_dir, COVERAGE_CACHE_NAME),
+            json.dumps(cache, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        )
+        save_install_state(state)
+    return units, errors, len(pending)
+
+
+def load_map_names(data_dir):
+    try:
+        infos = load_data_file(data_dir, "MapInfos.json")
+    except (ValueError, OSError):
+        return {}
+    return {info["id"]: info.get("name") or "" for info in infos or [] if isinstance(info, dict) and "id" in info}
+
+
+def measure_coverage(www_dir, language="zh", dictionary_path=None, jobs=None, incremental=True,
+                     max_texts=COVERAGE_MAX_TEXTS):
+    # Report how many text units of every data file the dictionary translates,
+    # with the same exact/trim/multi-line rules the plugin applies at runtime
+    start = time.perf_counter()
+    dictionary_path = dictionary_path or os.path.join(www_dir, "translations", f"{language}.json")
+    with open(dictionary_path, "r", encoding="utf-8") as f:
+        dictionary = json.load(f)
+    message_index = build_message_key_index(dictionary)
+
+    units, errors, scanned = scan_text_lines(www_dir, jobs, incremental)
+    map_names = load_map_names(os.path.join(www_dir, "data"))
+
+    files = []
+    missing = {}
+    totals = {"units": 0, "translated": 0, "partial": 0, "untranslated": 0}
+    for filename in sorted(units):
+        file_units = units[filename]
+        if file_units is None:
+            files.append({"file": filename, "error": errors[filename]})
+            continue
+
+        counts = {"units": 0, "translated": 0, "partial": 0, "untranslated": 0}
+        for lines in file_units:
+            text = "\n".join(lines)
+            if not text.strip():
+                continue
+            counts["units"] += 1
+            if lookup_translation(dictionary, text) is not None:
+                counts["translated"] += 1
+                continue
+            spans = list(match_text_lines(lines, dictionary, message_index))
+            misses = [span for span in spans if span[2] is None]
+            if not misses:
+                counts["translated"] += 1
+                continue
+            counts["partial" if len(misses) < len(spans) else "untranslated"] += 1
+            for first, count, _ in misses:
+                text = "\n".join(lines[first:first + count])
+                item = missing.setdefault(text, {"text": text, "count": 0, "files": []})
+                item["count"] += 1
+                if filename not in item["files"]:
+                    item["files"].append(filename)
+
+        report = {"file": filename, **counts, "coverage": round(counts["translated"] / counts["units"], 4) if counts["units"] else 1.0}
+        match = MAP_FILE_PATTERN.match(filename)
+        if match:
+            report["map"] = int(match.group(1))
+            report["name"] = map_names.get(report["map"], "")
+        files.append(report)
+        for key in totals:
+            totals[key] += counts[key]
+
+    texts = sorted(missing.values(), key=lambda item: (-item["count"], item["text"]))
+    summary = {
+        "language": language,
+        "files": len(files),
+        "scanned": scanned,
+        **totals,
+        "coverage": round(totals["translated"] / totals["units"], 4) if totals["units"] else 1.0,
+        "untranslated_texts": len(texts),
+        "unreadable": len(errors),
+        "seconds": round(time.perf_counter() - start, 4),
+    }
+    return {"summary": summary, "files": files, "untranslated": texts[:max_texts], "truncated": len(texts) > max_texts}
+
+
+def coverage_command(argv):
+    parser = argparse.ArgumentParser(
+        prog="install_plugin.py coverage",
+        description="Report how much of the game's data/*.json text a translation covers, per map.",
+    )
+    parser.add_argument("project", nargs="?", default=".", help="RPG Maker project root")
+    parser.add_argument("--lang", default="zh", help="language code (default: zh)")
+    parser.add_argument("--dictionary", help="dictionary to check (default: translations/<lang>.json)")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--output", help="write the JSON report to this path")
+    parser.add_argument("--max-texts", type=int, default=COVERAGE_MAX_TEXTS,
+                        help=f"untranslated texts listed in the report (default: {COVERAGE_MAX_TEXTS}); all are counted")
+    parser.add_argument("--top", type=int, default=20, help="number of least covered files to print (default: 20)")
+    parser.add_argument("--no-cache", action="store_true", help=f"rescan every data file and skip {COVERAGE_CACHE_NAME}")
+    args = parser.parse_args(argv)
+
+    _, www_dir = resolve_project_paths(Path(args.project).resolve())
+    try:
+        result = measure_coverage(www_dir, args.lang, args.dictionary, args.jobs, not args.no_cache, args.max_texts)
+    except (OSError, ValueError) as e:
+        print(f"Error: could not read the {args.lang} dictionary: {e}")
+        return 1
+
+    summary = result["summary"]
+    covered = sorted((report for report in result["files"] if "error" not in report),
+                     key=lambda report: (report["coverage"], report["file"]))
+    for report in covered[: args.top]:
+        name = f"  {report['name']}" if report.get("name") else ""
+        print(f"{report['coverage']:7.1%} {report['translated']:>6}/{report['units']:<6} {report['file']}{name}")
+    print(
+        f"{args.lang}: {summary['translated']} of {summary['units']} text units translated ({summary['coverage']:.1%}), "
+        f"{summary['partial']} partial, {summary['untranslated_texts']} untranslated texts; "
+        f"scanned {summary['scanned']} of {summary['files']} files in {summary['seconds']:.2f}s"
+    )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"Report written to {args.output}")
+    return 1 if summary["unreadable"] else 0
+
+
+def pack_hash(text):
+    # 32-bit FNV-1a over UTF-16 code units, the same units JavaScript strings use
+    value = 0x811C9DC5
+    data = text.encode("utf-16-le", "surrogatepass")
+    for unit in struct.unpack(f"<{len(data) // 2}H", data):
+        value = ((value ^ unit) * 0x01000193) & 0xFFFFFFFF
+    return value
+
+
+def build_translation_pack(dictionary, source_digest=b"\0" * 32, hash_index=True, encoding="auto"):
+    strings = {}
+    unique = []
+
+    def intern(text):
+        string_id = strings.get(text)
+        if string_id is None:
+            string_id = strings[text] = len(unique)
+            unique.append(text)
+        return string_id
+
+    keys = list(dictionary)
+    entries = [(intern(key), intern(dictionary[key])) for key in keys]
+
+    # CJK text takes 3 bytes per character in UTF-8 but 2 in UTF-16; "auto"
+    # keeps whichever string table is smaller
+    if encoding == "auto":
+        utf8_size = sum(len(text.encode("utf-8", "surrogatepass")) for text in unique)
+        encoding = "utf-16" if sum(len(text) for text in unique) * 2 < utf8_size else "utf-8"
+    encoded = [text.encode(PACK_ENCODINGS[encoding], "surrogatepass") for text in unique]
+    flags = PACK_FLAG_UTF16 if encoding == "utf-16" else 0
+
+    offsets = [0]
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+
+    order = sorted(range(len(keys)), key=lambda i: keys[i].encode("utf-16-be", "surrogatepass"))
+
+    bucket_count = 0
+    buckets = []
+    if hash_index and keys:
+        bucket_count = 1
+        while bucket_count < len(keys) * 2:
+            bucket_count *= 2
+        buckets = [0] * bucket_count
+        mask = bucket_count - 1
+        for entry_id, key in enumerate(keys):
+            slot = pack_hash(key) & mask
+            while buckets[slot]:
+                slot = (slot + 1) & mask
+            buckets[slot] = entry_id + 1
+
+    header = PACK_HEADER.pack(
+        PACK_MAGIC, PACK_VERSION, flags, len(keys), len(encoded), bucket_count, offsets[-1], source_digest
+    )
+    return b"".join(
+        [
+            header.ljust(PACK_HEADER_SIZE, b"\0"),
+            struct.pack(f"<{len(offsets)}I", *offsets),
+            struct.pack(f"<{len(entries) * 2}I", *(string_id for entry in entries for string_id in entry)),
+            struct.pack(f"<{len(order)}I", *order),
+            struct.pack(f"<{len(buckets)}I", *buckets),
+        ]
+        + encoded
+    )
+
+
+def read_pack_header(pack_path):
+    with open(pack_path, "rb") as f:
+        data = f.read(PACK_HEADER_SIZE)
+    if len(data) < PACK_HEADER_SIZE:
+        raise ValueError("truncated pack header")
+    magic, version, flags, count, string_count, bucket_count, data_length, digest = PACK_HEADER.unpack_from(data)
+    if magic != PACK_MAGIC or version != PACK_VERSION:
+        raise ValueError("not a translation pack")
+    return {
+        "encoding": "utf-16" if flags & PACK_FLAG_UTF16 else "utf-8",
+        "entries": count,
+        "strings": string_count,
+        "buckets": bucket_count,
+        "string_bytes": data_length,
+        "source_sha256": digest,
+    }
+
+
+def pack_translation(source_path, dest_path=None, hash_index=True, encoding="auto"):
+    # Compile an mtool JSON dictionary into <name>.dtp next to it
+    dest_path = dest_path or os.path.splitext(source_path)[0] + PACK_SUFFIX
+    hasher = hashlib.sha256()
+    dictionary = {}
+    for key, value in iter_json_object_items(iter_text_chunks(source_path, on_read=hasher.update)):
+        if not isinstance(value, str):
+            raise TranslationFileError("translation values must be strings")
+        dictionary[key] = value
+
+    data = build_translation_pack(dictionary, hasher.digest(), hash_index, encoding)
+    write_file_atomic(dest_path, data)
+    header = read_pack_header(dest_path)
+    print(
+        f"Packed {os.path.basename(source_path)} -> {os.path.basename(dest_path)}: "
+        f"{len(dictionary)} entries, {header['encoding']} strings, {os.path.getsize(source_path)} -> {len(data)} bytes"
+    )
+    return header
+
+
+def pack_command(argv):
+    parser = argparse.ArgumentParser(
+        prog="install_plugin.py pack",
+        description="Compile installed translations into binary packs (translations/<lang>.dtp).",
+    )
+    parser.add_argument("project", nargs="?", default=".", help="RPG Maker project root")
+    parser.add_argument("--lang", action="append", help="language code, repeatable (default: every installed language)")
+    parser.add_argument("--no-hash-index", action="store_true", help="omit the hash index; lookups use binary search")
+    parser.add_argument(
+        "--encoding",
+        choices=["auto", *PACK_ENCODINGS],
+        default="auto",
+        help="string table encoding (default: auto, whichever is smaller)",
+    )
+    args = parser.parse_args(argv)
+
+    _, www_dir = resolve_project_paths(Path(args.project).resolve())
+    translations_dir = os.path.join(www_dir, "translations")
+    languages = args.lang or [
+        Path(file).stem
+        for file in sorted(os.listdir(translations_dir))
+        if file.endswith(".json") and file != MANIFEST_NAME
+    ]
+    for language in languages:
+        pack_translation(
+            os.path.join(translations_dir, f"{language}.json"),
+            hash_index=not args.no_hash_index,
+            encoding=args.encoding,
+        )
+    write_manifest(translations_dir)
+
+
+def _open_compressor(fmt):
+    # Return (compress(chunk), flush()) for a streaming compressor
+    if fmt == "gzip":
+        # wbits=31 writes a gzip header with a zero mtime, so copies are reproducible
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        return compressor.compress, compressor.flush
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    return compressor.process, compressor.finish
+
+
+def compress_translation(source_path, formats=("gzip",)):
+    # Write <file>.gz (and <file>.br) next to the JSON file, streaming in chunks
+    sizes = {}
+    for fmt in formats:
+        dest_path = source_path + COMPRESSION_SUFFIXES[fmt]
+        compress, flush = _open_compressor(fmt)
+        fd, temp_path = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(dest_path) or ".")
+        try:
+            with os.fdopen(fd, "wb") as temp_file, open(source_path, "rb") as source_file:
+                for chunk in iter(partial(source_file.read, CHUNK_SIZE), b""):
+                    temp_file.write(compress(chunk))
+                temp_file.write(flush())
+            os.chmod(temp_path, _new_file_mode(dest_path))
+            os.replace(temp_path, dest_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        sizes[fmt] = os.path.getsize(dest_path)
+
+    described = ", ".join(f"{COMPRESSION_SUFFIXES[fmt]} {size}" for fmt, size in sizes.items())
+    print(f"Compressed {os.path.basename(source_path)}: {os.path.getsize(source_path)} bytes -> {described} bytes")
+    return sizes
+
+
+def hash_compressed_file(path, fmt):
+    # sha256 of the decompressed content, without holding it in memory
+    if fmt == "gzip":
+        decompressor = zlib.decompressobj(31)
+        decompress, is_finished = decompressor.decompress, lambda: decompressor.eof
+    else:
+        decompressor = brotli.Decompressor()
+        decompress, is_finished = decompressor.process, decompressor.is_finished
+
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        try:
+            for chunk in iter(partial(f.read, CHUNK_SIZE), b""):
+                hasher.update(decompress(chunk))
+        except OSError:
+            raise
+        except Exception as e:  # zlib.error or brotli.error
+            raise TranslationFileError(f"corrupt {fmt} data: {e}") from e
+    if not is_finished():
+        raise TranslationFileError(f"truncated {fmt} data")
+    return hasher.digest()
+
+
+def compress_command(argv):
+    parser = argparse.ArgumentParser(
+        prog="install_plugin.py compress",
+        description="Write precompressed copies of installed translations (translations/<lang>.json.gz).",
+    )
+    parser.add_argument("project", nargs="?", default=".", help="RPG Maker project root")
+    parser.add_argument("--lang", action="append", help="language code, repeatable (default: every installed language)")
+    parser.add_argument("--brotli", action="store_true", help="also write .br copies (needs the brotli module)")
+    args = parser.parse_args(argv)
+    if args.brotli and brotli is None:
+        parser.error("--brotli needs the brotli module (pip install brotli)")
+
+    _, www_dir = resolve_project_paths(Path(args.project).resolve())
+    translations_dir = os.path.join(www_dir, "translations")
+    languages = args.lang or [
+        Path(file).stem
+        for file in sorted(os.listdir(translations_dir))
+        if file.endswith(".json") and file != MANIFEST_NAME
+    ]
+    formats = ("gzip", "br") if args.brotli else ("gzip",)
+    for language in languages:
+        compress_translation(os.path.join(translations_dir, f"{language}.json"), formats)
+    write_manifest(translations_dir)
+
+
+def find_escape_codes(text):
+    # Upper-cased and sorted, so that \v[1] and \V[1] compare equal
+    return sorted(ESCAPE_CODE_PATTERN.findall(text.upper())) if "\\" in text else []
+
+
+def split_escape_codes(codes):
+    # Return (value codes, formatting codes)
+    value_codes, format_codes = [], []
+    for code in codes:
+        name = ESCAPE_CODE_NAME.match(code)
+        if name and name.group(1) in VALUE_ESCAPE_CODES:
+            value_codes.append(code)
+        else:
+            format_codes.append(code)
+    return value_codes, format_codes
+
+
+def validate_entry(key, value):
+    # Return (code, severity, message) tuples for one translation entry
+    if not isinstance(value, str):
+        return [("value-type", "error", f"value is {type(value).__name__}, expected a string")]
+
+    issues = []
+    if "%" in key or "%" in value:
+        key_placeholders = set(PLACEHOLDER_PATTERN.findall(key))
+        value_placeholders = set(PLACEHOLDER_PATTERN.findall(value))
+        if key_placeholders != value_placeholders:
+            details = []
+            missing = sorted(key_placeholders - value_placeholders)
+            extra = sorted(value_placeholders - key_placeholders)
+            if missing:
+                details.append("missing " + " ".join(missing))
+            if extra:
+                details.append("unexpected " + " ".join(extra))
+            issues.append(("placeholder", "error", "; ".join(details)))
+
+    key_codes = find_escape_codes(key)
+    value_codes = find_escape_codes(value)
+    if key_codes != value_codes:
+        key_values, key_formats = split_escape_codes(key_codes)
+        value_values, value_formats = split_escape_codes(value_codes)
+        if key_values != value_values:
+            issues.append(("escape-code", "error", f"value codes {' '.join(value_values) or '(none)'} "
+                           f"do not match {' '.join(key_values) or '(none)'}"))
+        else:
+            issues.append(("escape-code", "warning", f"formatting codes {' '.join(value_formats) or '(none)'} "
+                           f"do not match {' '.join(key_formats) or '(none)'}"))
+
+    key_lines = key.count("\n")
+    value_lines = value.count("\n")
+    if key_lines != value_lines:
+        issues.append(("line-count", "warning", f"translation has {value_lines + 1} lines, source has {key_lines + 1}"))
+    return issues
+
+
+def validate_entries(entries):
+    # Worker: check a chunk of (key, value) pairs
+    issues = []
+    for key, value in entries:
+        for code, severity, message in validate_entry(key, value):
+            issues.append({"key": key, "code": code, "severity": severity, "message": message})
+    return issues
+
+
+def validate_translation_file(file_path, executor=None, max_issues=VALIDATE_MAX_ISSUES,
+                              chunk_entries=VALIDATE_CHUNK_ENTRIES, max_pending=4):
+    # Stream the file in chunks and check them on the executor; at most
+    # max_pending chunks and max_issues findings are held in memory
+    report = {
+        "path": str(file_path),
+        "entries": 0,
+        "errors": 0,
+        "warnings": 0,
+        "codes": {},
+        "issues": [],
+        "truncated": False,
+        "error": None,
+    }
+
+    def collect(issues):
+        for issue in issues:
+            report["errors" if issue["severity"] == "error" else "warnings"] += 1
+            report["codes"][issue["code"]] = report["codes"].get(issue["code"], 0) + 1
+            if len(report["issues"]) < max_issues:
+                report["issues"].append(issue)
+            else:
+                report["truncated"] = True
+
+    pending = deque()
+
+    def submit(chunk):
+        report["entries"] += len(chunk)
+        if executor is None:
+            collect(validate_entries(chunk))
+            return
+        pending.append(executor.submit(validate_entries, chunk))
+        if len(pending) >= max_pending:
+            collect(pending.popleft().result())
+
+    # Entries read before a syntax error are still checked
+    chunk = []
+    try:
+        for item in iter_json_object_items(iter_text_chunks(file_path)):
+            chunk.append(item)
+            if len(chunk) >= chunk_entries:
+                submit(chunk)
+                chunk = []
+    except (TranslationFileError, UnicodeDecodeError, OSError) as e:
+        report["error"] = str(e)
+    if chunk:
+        submit(chunk)
+    while pending:
+        collect(pending.popleft().result())
+    return report
+
+
+def expand_translation_paths(patterns):
+    # Directories expand to their translation files; globs to matching files
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(
+                path for path in glob.glob(os.path.join(pattern, "*.json")) if os.path.basename(path) != MANIFEST_NAME
+            )
+        elif glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern))
+        else:
+            matches = [pattern]
+        for path in matches:
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+
+def validate_translation_files(paths, jobs=None, max_issues=VALIDATE_MAX_ISSUES, chunk_entries=VALIDATE_CHUNK_ENTRIES):
+    start = time.perf_counter()
+    if jobs == 1:
+        files = [validate_translation_file(path, None, max_issues, chunk_entries) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            max_pending = (jobs or os.cpu_count() or 1) * 2
+            files = [validate_translation_file(path, pool, max_issues, chunk_entries, max_pending) for path in paths]
+
+    summary = {
+        "files": len(files),
+        "entries": sum(report["entries"] for report in files),
+        "errors": sum(report["errors"] for report in files),
+        "warnings": sum(report["warnings"] for report in files),
+        "unreadable": sum(1 for report in files if report["error"]),
+        "seconds": round(time.perf_counter() - start, 4),
+    }
+    return {"summary": summary, "files": files}
+
+
+def validate_command(argv):
+    parser = argparse.ArgumentParser(
+        prog="install_plugin.py validate",
+        description="Check translation files for broken placeholders, escape codes, line counts and values.",
+    )
+    parser.add_argument("files", nargs="+", help="translation files, directories or glob patterns")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--max-issues", type=int, default=VALIDATE_MAX_ISSUES,
+                        help=f"findings listed per file (default: {VALIDATE_MAX_ISSUES}); all are counted")
+    parser.add_argument("--output", help="write the JSON report to this path instead of stdout")
+    parser.add_argument("--strict", action="store_true", help="fail on warnings as well as errors")
+    args = parser.parse_args(argv)
+
+    paths = expand_translation_paths(args.files)
+    if not paths:
+        parser.error("no translation files found")
+
+    result = validate_translation_files(paths, args.jobs, args.max_issues)
+    summary = result["summary"]
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(
+            f"Validated {summary['entries']} entries in {summary['files']} files: "
+            f"{summary['errors']} errors, {summary['warnings']} warnings. Report written to {args.output}"
+        )
+    else:
+        json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+
+    failed = summary["errors"] or summary["unreadable"] or (args.strict and summary["warnings"])
+    return 1 if failed else 0
+
+
+def _write_merge_run(entries, run_dir, sort_key=None):
+    # Sort a batch of [key, source, seq, value] entries (or entries ordered by
+    # sort_key) and spill it to disk
+    entries.sort(key=sort_key or _merge_entry_key)
+    fd, run_path = tempfile.mkstemp(prefix="run-", suffix=".jsonl", dir=run_dir)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False))
+            f.write("\n")
+    return run_path
+
+
+def _iter_merge_run(run_path):
+    with open(run_path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def _merge_entry_key(entry):
+    return entry[0], entry[1], entry[2]
+
+
+def _merge_position_key(entry):
+    # [source, seq, key, value] entries, in the order the keys first appeared
+    return entry[0], entry[1]
+
+
+def _combine_merge_runs(runs, run_dir, fan_in=MERGE_FAN_IN, sort_key=None):
+    # Merge runs in groups until at most fan_in remain, so the final k-way
+    # merge never holds more than fan_in files open
+    sort_key = sort_key or _merge_entry_key
+    while len(runs) > fan_in:
+        combined = []
+        for start in range(0, len(runs), fan_in):
+            group = runs[start:start + fan_in]
+            if len(group) == 1:
+                combined.append(group[0])
+                continue
+            fd, run_path = tempfile.mkstemp(prefix="run-", suffix=".jsonl", dir=run_dir)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for entry in heapq.merge(*[_iter_merge_run(path) for path in group], key=sort_key):
+                    f.write(json.dumps(entry, ensure_ascii=False))
+                    f.write("\n")
+            for path in group:
+                os.remove(path)
+            combined.append(run_path)
+        runs = combined
+    return runs
+
+
+def _iter_key_groups(entries):
+    # Group consecutive entries of a key-sorted stream
+    group = []
+    for entry in entries:
+        if group and entry[0] != group[0][0]:
+            yield group
+            group = []
+        group.append(entry)
+    if group:
+        yield group
+
+
+def merge_translation_files(source_paths, dest_path, prefer="last", run_entries=MERGE_RUN_ENTRIES,
+                            max_conflicts=MERGE_MAX_CONFLICTS, fan_in=MERGE_FAN_IN):
+    # External merge sort: every source is streamed into sorted runs on disk
+    # and the runs are k-way merged by key to pick each key's winner. The
+    # winners are sorted again by where the key first appeared, so the output
+    # keeps the first source's order followed by new keys as they appear; full
+    # translation mode scans keys in dictionary order, so sorting by key would
+    # change which substring translations apply.
+    # prefer="last" lets later sources override earlier ones (base, DLC,
+    # patch); prefer="first" keeps the earliest. Within one source a repeated
+    # key keeps its last value and its first position, as JSON.parse does in
+    # the plugin.
+    report = {
+        "output": str(dest_path),
+        "sources": [str(path) for path in source_paths],
+        "entries": 0,
+        "source_entries": [0] * len(source_paths),
+        "conflicts": 0,
+        "conflict_list": [],
+        "truncated": False,
+    }
+    dest_dir = os.path.dirname(dest_path) or "."
+    os.makedirs(dest_dir, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(prefix=".merge-", dir=dest_dir) as run_dir:
+        runs = []
+        batch = []
+        for index, source_path in enumerate(source_paths):
+            try:
+                for seq, (key, value) in enumerate(iter_json_object_items(iter_text_chunks(source_path))):
+                    if not isinstance(value, str):
+                        raise TranslationFileError(f"value of {key!r} is not a string")
+                    batch.append([key, index, seq, value])
+                    report["source_entries"][index] += 1
+                    if len(batch) >= run_entries:
+                        runs.append(_write_merge_run(batch, run_dir))
+                        batch = []
+            except (TranslationFileError, UnicodeDecodeError) as e:
+                raise TranslationFileError(f"{source_path}: {e}") from None
+        if batch:
+            runs.append(_write_merge_run(batch, run_dir))
+            batch = []
+        report["runs"] = len(runs)
+        runs = _combine_merge_runs(runs, run_dir, fan_in)
+
+        # Resolve each key, then spill [source, seq, key, value] of its first
+        # occurrence into runs ordered by position
+        positioned = []
+        for group in _iter_key_groups(heapq.merge(*[_iter_merge_run(path) for path in runs], key=_merge_entry_key)):
+            # Last value of each source, in source order
+            values = {}
+            for _, index, _, value in group:
+                values[index] = value
+            order = sorted(values)
+            winner = order[-1] if prefer == "last" else order[0]
+
+            if len(set(values.values())) > 1:
+                report["conflicts"] += 1
+                if len(report["conflict_list"]) < max_conflicts:
+                    report["conflict_list"].append({
+                        "key": group[0][0],
+                        "chosen": {"source": report["sources"][winner], "value": values[winner]},
+                        "others": [
+                            {"source": report["sources"][index], "value": values[index]}
+                            for index in order if index != winner and values[index] != values[winner]
+                        ],
+                    })
+                else:
+                    report["truncated"] = True
+
+            batch.append([group[0][1], group[0][2], group[0][0], values[winner]])
+            if len(batch) >= run_entries:
+                positioned.append(_write_merge_run(batch, run_dir, _merge_position_key))
+                batch = []
+        if batch:
+            positioned.append(_write_merge_run(batch, run_dir, _merge_position_key))
+            batch = []
+        for path in runs:
+            os.remove(path)
+        positioned = _combine_merge_runs(positioned, run_dir, fan_in, _merge_position_key)
+
+        fd, temp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=dest_dir)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as out:
+                out.write("{")
+                streams = [_iter_merge_run(run_path) for run_path in positioned]
+                for _, _, key, value in heapq.merge(*streams, key=_merge_position_key):
+                    out.write(",\n  " if report["entries"] else "\n  ")
+                    out.write(json.dumps(key, ensure_ascii=False))
+                    out.write(": ")
+                    out.write(json.dumps(value, ensure_ascii=False))
+                    report["entries"] += 1
+                out.write("\n}\n" if report["entries"] else "}\n")
+            os.chmod(temp_path, _new_file_mode(dest_path))
+            os.replace(temp_path, dest_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+    return report
+
+
+def merge_command(argv):
+    parser = argparse.ArgumentParser(
+        prog="install_plugin.py merge",
+        description="Merge several mtool dictionaries per language into translations/<lang>.json.",
+    )
+    parser.add_argument("project", help="RPG Maker project root")
+    parser.add_argument(
+        "--lang",
+        nargs="+",
+        action="append",
+        required=True,
+        metavar=("LANG", "FILE"),
+        help="language code followed by its source files in precedence order; repeatable",
+    )
+    parser.add_argument(
+        "--prefer",
+        choices=["last", "first"],
+        default="last",
+        help="which source wins when a key has different values (default: last)",
+    )
+    parser.add_argument("--report", help="write the merge and conflict report as JSON to this path")
+    parser.add_argument("--max-conflicts", type=int, default=MERGE_MAX_CONFLICTS,
+                        help=f"conflicts listed per language (default: {MERGE_MAX_CONFLICTS}); all are counted")
+    args = parser.parse_args(argv)
+
+    for spec in args.lang:
+        if len(spec) < 2:
+            parser.error(f"--lang {spec[0]} needs at least one source file")
+
+    _, www_dir = resolve_project_paths(Path(args.project).resolve())
+    translations_dir = os.path.join(www_dir, "translations")
+    reports = {}
+    failed = False
+    for language, *sources in args.lang:
+        dest_path = os.path.join(translations_dir, f"{language}.json")
+        try:
+            result = merge_translation_files(sources, dest_path, args.prefer, max_conflicts=args.max_conflicts)
+        except (TranslationFileError, OSError) as e:
+            print(f"Error: could not merge {language}: {e}")
+            failed = True
+            continue
+        reports[language] = result
+        print(
+            f"Merged {len(sources)} files into translations/{language}.json: "
+            f"{result['entries']} entries, {result['conflicts']} conflicts"
+        )
+        for conflict in result["conflict_list"][:5]:
+            key = conflict["key"].replace("\n", "\\n")
+            print(f"  {key[:60]} -> {conflict['chosen']['source']}")
+
+    if reports:
+        write_manifest(translations_dir)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+        print(f"Report written to {args.report}")
+    return 1 if failed else 0
+
+
+def shard_command(argv):
+    parser = argparse.ArgumentParser(
+        prog="install_plugin.py shard",
+        description="Split an installed translation into a core shard and per-map shards.",
+    )
+    parser.add_argument("project", nargs="?", default=".", help="RPG Maker project root")
+    parser.add_argument("--lang", default="zh", help="language code (default: zh)")
+    parser.add_argument("--dictionary", help="source dictionary (default: translations/<lang>.json)")
+    args = parser.parse_args(argv)
+
+    _, www_dir = resolve_project_paths(Path(args.project).resolve())
+    compile_shards(www_dir, args.lang, args.dictionary)
+
+
+def install_project(target_dir, www_dir, script_dir, timings=None, incremental=False):
+    # Run every install step; per-step durations are recorded into timings.
+    # In incremental mode, outputs recorded as current in the state file are skipped
+    state = load_install_state(www_dir) if incremental else None
+    steps = (
+        ("copy_plugin", lambda: copy_plugin_file(script_dir, www_dir, state)),
+        ("update_plugins_js", lambda: update_plugins_js(www_dir, state)),
+        ("install_translation", lambda: install_translation(target_dir, www_dir, state)),
+        ("write_manifest", lambda: write_manifest(os.path.join(www_dir, "translations"), state)),
+    )
+    results = {}
+    for name, step in steps:
+        start = time.perf_counter()
+        results[name] = step()
+        if timings is not None:
+            timings[name] = round(time.perf_counter() - start, 4)
+
+    if state is not None:
+        save_install_state(state)
+    return results
+
+
+def batch_install_project(project, script_dir, incremental=False):
+    # Worker for the batch command: never raises, always returns a result dict
+    result = {"project": project, "status": "installed", "reason": None, "translation": False, "timings": {}}
+    log = io.StringIO()
+    start = time.perf_counter()
+
+    with contextlib.redirect_stdout(log):
+        try:
+            target_dir, www_dir = resolve_project_paths(Path(project).resolve())
+        except SystemExit as e:
+            result["status"] = "skipped"
+            result["reason"] = str(e).splitlines()[0]
+        else:
+            try:
+                steps = install_project(target_dir, www_dir, script_dir, result["timings"], incremental)
+                result["translation"] = bool(steps["install_translation"])
+            except Exception as e:
+                result["status"] = "failed"
+                result["reason"] = f"{type(e).__name__}: {e}"
+
+    result["timings"]["total"] = round(time.perf_counter() - start, 4)
+    result["log"] = log.getvalue()
+    return result
+
+
+def expand_projects(patterns):
+    # Literal paths are kept as given; glob patterns expand to matching directories
+    projects = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(path for path in glob.glob(pattern) if os.path.isdir(path))
+        else:
+            matches = [pattern]
+        for path in matches:
+            if path not in projects:
+                projects.append(path)
+    return projects
+
+
+def batch_install(projects, script_dir, jobs=None, incremental=False):
+    worker = partial(batch_install_project, script_dir=script_dir, incremental=incremental)
+    if jobs == 1 or len(projects) <= 1:
+        return [worker(project) for project in projects]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(worker, projects))
+
+
+def summarize_batch(results, elapsed):
+    summary = {"installed": 0, "skipped": 0, "failed": 0, "total": len(results), "seconds": round(elapsed, 4)}
+    for result in results:
+        summary[result["status"]] += 1
+
+    step_totals = {}
+    for result in results:
+        for step, seconds in result["timings"].items():
+            if step != "total":
+                step_totals[step] = round(step_totals.get(step, 0) + seconds, 4)
+    summary["step_seconds"] = step_totals
+    return summary
+
+
+def batch_command(argv):
+    parser = argparse.ArgumentParser(
+        prog="install_plugin.py batch",
+        description="Install the plugin into many RPG Maker projects on a process pool.",
+    )
+    parser.add_argument("projects", nargs="*", help="project roots or glob patterns (e.g. 'builds/*')")
+    parser.add_argument("--from-file", help="file with one project root or glob per line")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--report", help="write a JSON summary report to this path")
+    parser.add_argument("--incremental", action="store_true", help="skip outputs that are already up to date")
+    args = parser.parse_args(argv)
+
+    patterns = list(args.projects)
+    if args.from_file:
+        with open(args.from_file, "r", encoding="utf-8") as f:
+            patterns.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+    projects = expand_projects(patterns)
+    if not projects:
+        parser.error("no projects given")
+
+    script_dir = str(Path(__file__).resolve().parent)
+    start = time.perf_counter()
+    results = batch_install(projects, script_dir, args.jobs, args.incremental)
+    summary = summarize_batch(results, time.perf_counter() - start)
+
+    for result in results:
+        reason = f" ({result['reason']})" if result["reason"] else ""
+        print(f"[{result['status']:>9}] {result['timings']['total']:8.3f}s  {result['project']}{reason}")
+    print(
+        f"Batch complete: {summary['installed']} installed, {summary['skipped']} skipped, "
+        f"{summary['failed']} failed in {summary['seconds']:.2f}s"
+    )
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump({"summary": summary, "projects": results}, f, ensure_ascii=False, indent=2)
+        print(f"Report written to {args.report}")
+
+    return 1 if summary["failed"] else 0
+
+
+COMMANDS = {
+    "shard": shard_command,
+    "prebake": prebake_command,
+    "misses": misses_command,
+    "coverage": coverage_command,
+    "pack": pack_command,
+    "compress": compress_command,
+    "validate": validate_command,
+    "merge": merge_command,
+    "batch": batch_command,
+}
+
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        return COMMANDS[sys.argv[1]](sys.argv[2:])
+
     target_dir, www_dir, script_dir = get_paths()
     print(f"Target directory: {target_dir}")
 
-    copy_plugin_file(script_dir, www_dir)
-    update_plugins_js(www_dir)
-    install_translation(target_dir, www_dir)
+    install_project(target_dir, www_dir, script_dir, incremental="--incremental" in sys.argv[1:])
 
     print("Installation complete!")
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
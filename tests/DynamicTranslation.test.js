@@ -299,6 +299,255 @@ describe('DynamicTranslation System', () => {
         });
     });
 
+    describe('Loaded Language Limit', () => {
+        const loadWithLimit = (limit) => {
+            PluginManager.parameters = () => ({
+                'Default Language': 'zh',
+                'Translation Path': 'translations/',
+                'Auto Detect Translations': 'false',
+                'Translation Mode': 'simple',
+                'Max Loaded Languages': String(limit)
+            });
+            XMLHttpRequest.prototype.mockData = {
+                zh: { 'Level': '等級' },
+                en: { 'Level': 'Level' },
+                ja: { 'Level': 'レベル' }
+            };
+            global.loadPlugin();
+            const tm = window.$translationManager;
+            tm._availableLanguages = ['zh', 'en', 'ja'];
+            tm.loadLanguage('zh', () => { tm._isInitialized = true; });
+            return tm;
+        };
+
+        test('should evict the least recently used language', () => {
+            const tm = loadWithLimit(2);
+
+            tm.setLanguage('en');
+            tm.setLanguage('ja');
+
+            expect(Object.keys(tm._translations).sort()).toEqual(['en', 'ja']);
+            expect(tm.getAvailableLanguages()).toEqual(['zh', 'en', 'ja']);
+            expect(tm.getStatus().languageCache).toEqual({
+                capacity: 2,
+                resident: ['en', 'ja'],
+                evicted: ['zh'],
+                evictions: 1
+            });
+        });
+
+        test('should keep a recently used language resident', () => {
+            const tm = loadWithLimit(2);
+
+            tm.setLanguage('en');
+            tm.setLanguage('zh');
+            tm.setLanguage('ja');
+
+            expect(Object.keys(tm._translations).sort()).toEqual(['ja', 'zh']);
+            expect(tm.getStatus().languageCache.evicted).toEqual(['en']);
+        });
+
+        test('should reload an evicted language when it is selected again', () => {
+            const tm = loadWithLimit(1);
+            const loadSpy = jest.spyOn(tm, 'loadLanguage');
+
+            tm.setLanguage('en');
+            expect(Object.keys(tm._translations)).toEqual(['en']);
+
+            tm.setLanguage('zh');
+            expect(loadSpy.mock.calls.map((call) => call[0])).toEqual(['en', 'zh']);
+            expect(tm.translate('Level')).toBe('等級');
+
+            const status = tm.getStatus().languageCache;
+            expect(status.resident).toEqual(['zh']);
+            expect(status.evicted).toEqual(['en']);
+            expect(status.evictions).toBe(2);
+            loadSpy.mockRestore();
+        });
+
+        test('should drop derived indexes and map shards of evicted languages', () => {
+            const tm = loadWithLimit(1);
+            tm.translate('Level');
+            expect(tm._mapShards.zh).toBeDefined();
+
+            tm.setLanguage('en');
+            expect(tm._mapShards.zh).toBeUndefined();
+            expect(tm._translationCaches.zh).toBeUndefined();
+        });
+
+        test('should never evict the current language', () => {
+            const tm = loadWithLimit(1);
+
+            tm.loadLanguage('en');
+            tm.loadLanguage('ja');
+
+            expect(tm.getCurrentLanguage()).toBe('zh');
+            expect(tm._translations.zh).toBeDefined();
+            expect(Object.keys(tm._translations).sort()).toEqual(['ja', 'zh']);
+        });
+
+        test('should keep every language when the limit is 0', () => {
+            const tm = loadWithLimit(0);
+
+            tm.setLanguage('en');
+            tm.setLanguage('ja');
+
+            expect(Object.keys(tm._translations).sort()).toEqual(['en', 'ja', 'zh']);
+            expect(tm.getStatus().languageCache.evictions).toBe(0);
+        });
+    });
+
+    describe('Asynchronous Loading', () => {
+        const originalSend = XMLHttpRequest.prototype.send;
+        let deferred;
+
+        // 攔截 XHR，直到呼叫 respond 才回應
+        const deferRequests = () => {
+            deferred = [];
+            XMLHttpRequest.prototype.send = function () { deferred.push(this); };
+        };
+        const respond = (url) => {
+            const index = deferred.findIndex((xhr) => xhr.url === url);
+            const xhr = deferred.splice(index, 1)[0];
+            originalSend.call(xhr);
+        };
+
+        const loadManager = () => {
+            PluginManager.parameters = () => ({
+                'Default Language': 'zh',
+                'Translation Path': 'translations/',
+                'Auto Detect Translations': 'false',
+                'Translation Mode': 'simple',
+                'Max Loaded Languages': '0'
+            });
+            XMLHttpRequest.prototype.mockData = {
+                zh: { 'Level': '等級' },
+                en: { 'Level': 'Level' },
+                ja: { 'Level': 'レベル' },
+                ko: { 'Level': '레벨' }
+            };
+            global.loadPlugin();
+            const tm = window.$translationManager;
+            tm.loadLanguage('zh', () => { tm._isInitialized = true; });
+            return tm;
+        };
+
+        afterEach(() => {
+            XMLHttpRequest.prototype.send = originalSend;
+            delete global.Worker;
+        });
+
+        test('should return a promise that resolves when the language is loaded', async () => {
+            const tm = loadManager();
+
+            await expect(tm.loadLanguage('en')).resolves.toBe(true);
+            await expect(tm.loadLanguage('missing')).resolves.toBe(false);
+        });
+
+        test('should limit the number of concurrent loads', async () => {
+            const tm = loadManager();
+            deferRequests();
+
+            const loads = ['en', 'ja', 'ko'].map((language) => tm.loadLanguage(language));
+            expect(deferred.map((xhr) => xhr.url)).toEqual(['translations/en.json', 'translations/ja.json']);
+            expect(tm.getStatus().loadingLanguages).toEqual(['en', 'ja', 'ko']);
+
+            respond('translations/en.json');
+            expect(deferred.map((xhr) => xhr.url)).toEqual(['translations/ja.json', 'translations/ko.json']);
+            respond('translations/ja.json');
+            respond('translations/ko.json');
+
+            expect(await Promise.all(loads)).toEqual([true, true, true]);
+            expect(tm.getStatus().loadingLanguages).toEqual([]);
+        });
+
+        test('should share a pending load of the same language', () => {
+            const tm = loadManager();
+            deferRequests();
+            const callback = jest.fn();
+
+            tm.loadLanguage('en', callback);
+            tm.loadLanguage('en', callback);
+            expect(deferred).toHaveLength(1);
+
+            respond('translations/en.json');
+            expect(callback).toHaveBeenCalledTimes(2);
+            expect(callback).toHaveBeenCalledWith(true);
+        });
+
+        test('should keep the previous language until the new one is ready', async () => {
+            const tm = loadManager();
+            deferRequests();
+
+            const switched = tm.setLanguage('ja');
+            expect(tm.getCurrentLanguage()).toBe('zh');
+            expect(tm.translate('Level')).toBe('等級');
+
+            respond('translations/ja.json');
+            await expect(switched).resolves.toBe(true);
+            expect(tm.getCurrentLanguage()).toBe('ja');
+            expect(tm.translate('Level')).toBe('レベル');
+        });
+
+        test('should switch to the last requested language', async () => {
+            const tm = loadManager();
+            deferRequests();
+
+            const first = tm.setLanguage('en');
+            const second = tm.setLanguage('ja');
+            respond('translations/ja.json');
+            respond('translations/en.json');
+
+            await expect(first).resolves.toBe(false);
+            await expect(second).resolves.toBe(true);
+            expect(tm.getCurrentLanguage()).toBe('ja');
+        });
+
+        test('should parse large files in a worker', async () => {
+            const messages = [];
+            global.Worker = class {
+                postMessage(message, transfer) {
+                    messages.push({ message, transfer });
+                    const text = new TextDecoder().decode(new Uint8Array(message.buffer));
+                    setTimeout(() => this.onmessage({ data: { id: message.id, result: JSON.parse(text) } }), 0);
+                }
+            };
+            const tm = loadManager();
+            TranslationManager.WORKER_PARSE_THRESHOLD = 0;
+
+            const loaded = tm.loadLanguage('en');
+            expect(tm._translations.en).toBeUndefined();
+            await expect(loaded).resolves.toBe(true);
+
+            expect(messages).toHaveLength(1);
+            expect(messages[0].transfer).toEqual([messages[0].message.buffer]);
+            expect(tm._translations.en).toEqual({ 'Level': 'Level' });
+        });
+
+        test('should parse small files on the main thread', () => {
+            global.Worker = jest.fn();
+            const tm = loadManager();
+
+            tm.loadLanguage('en');
+            expect(global.Worker).not.toHaveBeenCalled();
+            expect(tm._translations.en).toEqual({ 'Level': 'Level' });
+        });
+
+        test('should fall back to the main thread when the worker fails', async () => {
+            global.Worker = class {
+                postMessage() {
+                    setTimeout(() => this.onerror({ message: 'blocked' }), 0);
+                }
+                terminate() { }
+            };
+            const tm = loadManager();
+            TranslationManager.WORKER_PARSE_THRESHOLD = 0;
+
+            await expect(tm.loadLanguage('en')).resolves.toBe(true);
+            expect(tm._translations.en).toEqual({ 'Level': 'Level' });
+        });
+    });
+
     describe('Substring Extraction', () => {
         test('should extract substring translation in full mode', (done) => {
             // Enable full mode
@@ -399,6 +648,259 @@ describe('DynamicTranslation System', () => {
         });
     });
 
+    describe('Substring Index', () => {
+        const enableFullMode = () => {
+            PluginManager.parameters = () => ({
+                'Default Language': 'zh',
+                'Translation Path': 'translations/',
+                'Auto Detect Translations': 'false',
+                'Translation Mode': 'full'
+            });
+            global.loadPlugin();
+        };
+
+        // 原本逐一掃描所有 key 的實作，作為比對基準
+        const linearScan = (tm, dictionary, text) => {
+            if (dictionary[text] !== undefined) return dictionary[text];
+            for (const key in dictionary) {
+                const keyIndex = key.indexOf(text);
+                if (keyIndex !== -1 && key !== text) {
+                    return tm._extractCorrespondingTranslation(text, key, dictionary[key], keyIndex);
+                }
+            }
+            return text;
+        };
+
+        test('should build the index when a language finishes loading in full mode', (done) => {
+            enableFullMode();
+            const tm = window.$translationManager;
+            XMLHttpRequest.prototype.mockData = { zh: { 'Hello world': '你好世界' } };
+
+            tm.loadLanguage('zh', () => {
+                expect(tm._substringIndexes.zh).toBeDefined();
+                expect(tm._substringIndexes.zh.dictionary).toBe(tm._translations.zh);
+                done();
+            });
+        });
+
+        test('should not build the index in simple mode', (done) => {
+            PluginManager.parameters = () => ({
+                'Default Language': 'zh',
+                'Translation Path': 'translations/',
+                'Auto Detect Translations': 'false',
+                'Translation Mode': 'simple'
+            });
+            global.loadPlugin();
+            const tm = window.$translationManager;
+            tm.loadLanguage('zh', () => {
+                expect(tm._substringIndexes.zh).toBeUndefined();
+                done();
+            });
+        });
+
+        test('should match the linear scan result for hits and misses', (done) => {
+            enableFullMode();
+            const tm = window.$translationManager;
+            const dictionary = {
+                'Line 1\nLine 2\nLine 3': '行 1\n行 2\n行 3',
+                'The quick brown fox': '敏捷的棕色狐狸',
+                'brown bear': '棕熊',
+                '12': '十二',
+                'X': '叉',
+                'あいうえお、かきくけこ': '啊咿嗚欸喔，咖嘰庫給摳',
+                'Another line with fox inside': '另一行裡面有狐狸'
+            };
+            XMLHttpRequest.prototype.mockData = { zh: dictionary };
+
+            tm.loadLanguage('zh', () => {
+                tm.setLanguage('zh');
+                tm._isInitialized = true;
+                const queries = ['brown', 'fox', 'Line 2', 'quick', 'かきくけこ', '1', 'X', 'o', 'missing', 'zz', 'あ'];
+                queries.forEach((query) => {
+                    expect(tm.translate(query)).toBe(linearScan(tm, tm._translations.zh, query));
+                });
+                done();
+            });
+        });
+
+        test('should rebuild the index when the dictionary is replaced', () => {
+            enableFullMode();
+            const tm = window.$translationManager;
+            tm._isInitialized = true;
+            tm._currentLanguage = 'zh';
+            tm._translations = { zh: { 'Good morning': '早安' } };
+            expect(tm.translate('morning')).not.toBe('morning');
+
+            tm._translations = { zh: { 'Good evening': '晚安' } };
+            expect(tm.translate('morning')).toBe('morning');
+            expect(tm.translate('evening')).not.toBe('evening');
+        });
+    });
+
+    describe('Normalized Keys', () => {
+        const loadManager = (mode) => {
+            PluginManager.parameters = () => ({
+                'Default Language': 'zh',
+                'Translation Path': 'translations/',
+                'Auto Detect Translations': 'false',
+                'Translation Mode': mode || 'simple'
+            });
+            XMLHttpRequest.prototype.mockData = {
+                zh: {
+                    'Hello world': '你好世界',
+                    '\\C[1]Potion\\C[0] obtained!': '得到了\\C[1]藥水\\C[0]！',
+                    '\\N[1] joined the party.\nWelcome!': '\\N[1] 加入了隊伍。\n歡迎！',
+                    'The door is locked and the key is gone': '門鎖上了，鑰匙也不見了'
+                }
+            };
+            global.loadPlugin();
+            const tm = window.$translationManager;
+            tm.loadLanguage('zh', () => { tm._isInitialized = true; });
+            return tm;
+        };
+
+        test('should build the index on the first lookup miss', () => {
+            const tm = loadManager();
+            expect(tm._normalizedIndexes.zh).toBeUndefined();
+
+            expect(tm.translate('Hello world')).toBe('你好世界');
+            expect(tm._normalizedIndexes.zh).toBeUndefined();
+
+            tm.translate('Hello  world');
+            expect(tm._normalizedIndexes.zh.dictionary).toBe(tm._translations.zh);
+        });
+
+        test('should match keys that differ only in spacing', () => {
+            const tm = loadManager();
+            expect(tm.translate('Hello   world')).toBe('你好世界');
+            expect(tm.translate('Hello\u3000world ')).toBe('你好世界');
+            expect(tm.translate('\\N[1]  joined the party.\n Welcome!')).toBe('\\N[1] 加入了隊伍。\n歡迎！');
+        });
+
+        test('should keep line breaks significant', () => {
+            const tm = loadManager();
+            tm._translations.zh['Good\nmorning'] = '早\n安';
+            tm._invalidateDictionary('zh');
+
+            expect(tm.translate('Hello\nworld')).toBe('Hello\nworld');
+            expect(tm.translate('Good morning')).toBe('Good morning');
+            expect(tm.translate('\\N[1] joined the party. Welcome!')).toBe('\\N[1] joined the party. Welcome!');
+            expect(tm.translate('\\C[2]\nHello world')).toBe('\\C[2]\nHello world');
+            expect(tm.translate('Good \r\n morning')).toBe('早\n安');
+        });
+
+        test('should carry escape code arguments from the input into the translation', () => {
+            const tm = loadManager();
+            expect(tm.translate('\\C[4]Potion\\C[0] obtained!')).toBe('得到了\\C[4]藥水\\C[0]！');
+            expect(tm.translate('\\N[3] joined the party.\nWelcome!')).toBe('\\N[3] 加入了隊伍。\n歡迎！');
+        });
+
+        test('should wrap the translation with leading and trailing codes', () => {
+            const tm = loadManager();
+            expect(tm.translate('\\C[2]\\{Hello world\\C[0]')).toBe('\\C[2]\\{你好世界\\C[0]');
+        });
+
+        test('should not drop codes it cannot place', () => {
+            const tm = loadManager();
+            expect(tm.translate('Hello \\V[5] world')).toBe('Hello \\V[5] world');
+            expect(tm.translate('\\C[1]Potion obtained!')).toBe('\\C[1]Potion obtained!');
+        });
+
+        test('should resolve near misses before the substring scan in full mode', () => {
+            const tm = loadManager('full');
+            const findSpy = jest.spyOn(tm._getSubstringIndex('zh'), 'find');
+
+            expect(tm.translate('\\C[3]The door is locked  and the key is gone')).toBe('\\C[3]門鎖上了，鑰匙也不見了');
+            expect(findSpy).not.toHaveBeenCalled();
+            findSpy.mockRestore();
+        });
+    });
+
+    describe('Translation Cache', () => {
+        const loadWithCacheSize = (size) => {
+            PluginManager.parameters = () => ({
+                'Default Language': 'zh',
+                'Translation Path': 'translations/',
+                'Auto Detect Translations': 'false',
+                'Translation Mode': 'simple',
+                'Translation Cache Size': String(size)
+            });
+            global.loadPlugin();
+            const tm = window.$translationManager;
+            tm._isInitialized = true;
+            tm._currentLanguage = 'zh';
+            tm._translations = { zh: { 'Level': '等級', 'HP': '生命值', 'MP': '魔力' } };
+            return tm;
+        };
+
+        test('should serve repeated lookups from the cache', () => {
+            const tm = loadWithCacheSize(100);
+            const lookupSpy = jest.spyOn(tm, '_lookupTranslation');
+
+            expect(tm.translate('Level')).toBe('等級');
+            expect(tm.translate('Level')).toBe('等級');
+            expect(lookupSpy.mock.calls.length).toBe(1);
+
+            const status = tm.getStatus();
+            expect(status.cache.hits).toBe(1);
+            expect(status.cache.misses).toBe(1);
+            expect(status.cache.size).toBe(1);
+            lookupSpy.mockRestore();
+        });
+
+        test('should cache untranslated text', () => {
+            const tm = loadWithCacheSize(100);
+            const lookupSpy = jest.spyOn(tm, '_lookupTranslation');
+
+            expect(tm.translate('Unknown')).toBe('Unknown');
+            expect(tm.translate('Unknown')).toBe('Unknown');
+            expect(lookupSpy.mock.calls.length).toBe(1);
+            lookupSpy.mockRestore();
+        });
+
+        test('should evict the least recently used entry when full', () => {
+            const tm = loadWithCacheSize(2);
+            tm.translate('Level');
+            tm.translate('HP');
+            tm.translate('Level'); // Level 變為最近使用
+            tm.translate('MP'); // 淘汰 HP
+
+            const cache = tm._getTranslationCache('zh');
+            expect(cache.size()).toBe(2);
+            expect(cache.get('HP')).toBeUndefined();
+            expect(cache.get('Level')).toBe('等級');
+            expect(tm.getStatus().cache.evictions).toBe(1);
+        });
+
+        test('should not cache when the cache size is 0', () => {
+            const tm = loadWithCacheSize(0);
+            expect(tm.translate('Level')).toBe('等級');
+            expect(tm.getStatus().cache.size).toBe(0);
+        });
+
+        test('should clear the cache when the language changes', () => {
+            const tm = loadWithCacheSize(100);
+            tm._translations.en = { 'Level': 'Lv' };
+            tm.translate('Level');
+
+            tm.setLanguage('en');
+            expect(tm.getStatus().cache.size).toBe(0);
+            expect(tm.translate('Level')).toBe('Lv');
+        });
+
+        test('should clear the cache when a language is reloaded', (done) => {
+            const tm = loadWithCacheSize(100);
+            tm.translate('Level');
+            XMLHttpRequest.prototype.mockData = { zh: { 'Level': '級別' } };
+
+            tm.loadLanguage('zh', () => {
+                expect(tm.getStatus().cache.size).toBe(0);
+                expect(tm.translate('Level')).toBe('級別');
+                done();
+            });
+        });
+    });
+
     describe('TextManager Integration', () => {
         test('should integrate with TextManager', (done) => {
             const tm = window.$translationManager;
@@ -463,6 +965,88 @@ describe('DynamicTranslation System', () => {
                 done();
             });
         });
+
+        describe('term tables', () => {
+            const initManager = () => {
+                XMLHttpRequest.prototype.mockData = {
+                    zh: { 'Level': '等級', 'Attack': '攻擊力', 'Fight': '戰鬥', 'Save which file?': '要儲存哪個檔案？', 'G': '金幣' },
+                    en: { 'Level': 'Lv', 'Fight': 'Battle' }
+                };
+                global.loadPlugin();
+                const tm = window.$translationManager;
+                tm.loadLanguage('zh', () => {
+                    tm._isInitialized = true;
+                    tm._applyTranslations();
+                });
+                return tm;
+            };
+
+            test('should translate every term once per language', () => {
+                const tm = initManager();
+                const translateSpy = jest.spyOn(tm, 'translate');
+
+                expect(TextManager.basic(0)).toBe('等級');
+                const calls = translateSpy.mock.calls.length;
+                expect(calls).toBeGreaterThan(0);
+
+                for (let i = 0; i < 10; i++) {
+                    expect(TextManager.basic(0)).toBe('等級');
+                    expect(TextManager.param(0)).toBe('攻擊力');
+                    expect(TextManager.command(0)).toBe('戰鬥');
+                    expect(TextManager.message('saveMessage')).toBe('要儲存哪個檔案？');
+                }
+                expect(translateSpy.mock.calls.length).toBe(calls);
+                translateSpy.mockRestore();
+            });
+
+            test('should swap the term table when the language changes', () => {
+                const tm = initManager();
+                expect(TextManager.command(0)).toBe('戰鬥');
+
+                tm.setLanguage('en');
+                expect(TextManager.command(0)).toBe('Battle');
+                expect(TextManager.param(0)).toBe('Attack');
+                expect(TextManager.basic(99)).toBe('');
+
+                tm.setLanguage('zh');
+                expect(tm._termTables.zh).toBeDefined();
+                expect(TextManager.command(0)).toBe('戰鬥');
+            });
+
+            test('should rebuild the term table when the dictionary changes', () => {
+                const tm = initManager();
+                expect(TextManager.basic(1)).toBe('HP');
+
+                tm._translations.zh.HP = '生命值';
+                tm._invalidateDictionary('zh');
+                expect(TextManager.basic(1)).toBe('生命值');
+            });
+
+            test('should not keep untranslated terms before the dictionary loads', () => {
+                global.loadPlugin();
+                const tm = window.$translationManager;
+                tm._isInitialized = false;
+                tm._buildOriginalTextMapping();
+
+                expect(tm._getTermTable().basic[0]).toBe('Level');
+                expect(tm._termTables).toEqual({});
+            });
+
+            test('should translate an accessor currency unit', () => {
+                Object.defineProperty(TextManager, 'currencyUnit', {
+                    get: () => $dataSystem.currencyUnit,
+                    configurable: true
+                });
+                try {
+                    initManager();
+                    expect(TextManager.currencyUnit).toBe('金幣');
+                } finally {
+                    Object.defineProperty(TextManager, 'currencyUnit', {
+                        value: 'G', writable: true, configurable: true, enumerable: true
+                    });
+                }
+            });
+        });
     });
 
     describe('Refresh Callbacks', () => {
@@ -537,6 +1121,121 @@ describe('DynamicTranslation System', () => {
         });
     });
 
+    describe('Window Refresh', () => {
+        class TestWindow extends Window_Base {
+            constructor(text, visible) {
+                super();
+                this.text = text;
+                this.visible = visible !== false;
+                this.refreshCount = 0;
+            }
+
+            refresh() {
+                this.refreshCount++;
+                this.drawText(this.text === null ? 'plain' : window.$translationManager.translate(this.text), 0, 0);
+            }
+        }
+
+        const originalScene = SceneManager._scene;
+        let tm;
+        let scene;
+
+        beforeEach(() => {
+            scene = new Scene_Base();
+            SceneManager._scene = scene;
+            tm = window.$translationManager;
+            tm._translations = { zh: { 'Level': '等級' }, en: { 'Level': 'Lv' } };
+            tm._currentLanguage = 'zh';
+            tm._isInitialized = true;
+        });
+
+        afterEach(() => {
+            SceneManager._scene = originalScene;
+            TranslationManager.REFRESH_FRAME_BUDGET = 4;
+        });
+
+        test('should only track windows that drew translated text', () => {
+            const translated = new TestWindow('Level');
+            const plain = new TestWindow(null);
+            plain.refresh();
+            translated.refresh();
+            plain.refresh();
+
+            expect(Array.from(tm._drawnWindows)).toEqual([translated]);
+        });
+
+        test('should track windows that read translations while drawing', () => {
+            const target = new Window_Base();
+            const other = new Window_Base();
+            tm.drawWindowText(target, 'plain', () => tm.translate('Level'));
+            other.drawText('等級', 0, 0);
+
+            expect(Array.from(tm._drawnWindows)).toEqual([target]);
+        });
+
+        test('should not lose reads when another window draws in between', () => {
+            const reader = new Window_Base();
+            const other = new Window_Base();
+            reader.drawText('plain', 0, 0);
+            other.drawText('plain', 0, 0);
+
+            const text = tm.translate('Level');
+            other.drawText('plain', 0, 0);
+            reader.drawText(text, 0, 0);
+            expect(tm._drawnWindows.has(reader)).toBe(true);
+        });
+
+        test('should track windows that drew TextManager terms', () => {
+            tm._applyTranslations();
+            const status = new Window_Base();
+            tm._pendingReads.length = 0;
+
+            status.drawText(TextManager.basic(0), 0, 0);
+            expect(tm._drawnWindows.has(status)).toBe(true);
+        });
+
+        test('should refresh only tracked windows on the next frames', () => {
+            const translated = new TestWindow('Level');
+            const plain = new TestWindow(null);
+            translated.refresh();
+            plain.refresh();
+
+            tm.setLanguage('en');
+            expect(translated.refreshCount).toBe(1);
+            expect(tm.getStatus().windows).toEqual({ tracked: 1, pending: 1 });
+
+            scene.update();
+            expect(translated.refreshCount).toBe(2);
+            expect(plain.refreshCount).toBe(1);
+            expect(tm.getStatus().windows.pending).toBe(0);
+        });
+
+        test('should spread redraws across frames', () => {
+            TranslationManager.REFRESH_FRAME_BUDGET = 0;
+            const hidden = new TestWindow('Level', false);
+            const windows = [hidden, new TestWindow('Level'), new TestWindow('Level')];
+            windows.forEach((win) => win.refresh());
+
+            tm._refreshAllWindows();
+            tm.updateWindowRefresh();
+            expect(windows.map((win) => win.refreshCount)).toEqual([1, 2, 1]);
+            tm.updateWindowRefresh();
+            tm.updateWindowRefresh();
+            expect(windows.map((win) => win.refreshCount)).toEqual([2, 2, 2]);
+        });
+
+        test('should forget windows of the previous scene', () => {
+            const translated = new TestWindow('Level');
+            translated.refresh();
+            tm._refreshAllWindows();
+
+            SceneManager._scene = new Scene_Base();
+            SceneManager._scene.update();
+            expect(translated.refreshCount).toBe(1);
+            expect(tm.getStatus().windows).toEqual({ tracked: 0, pending: 0 });
+        });
+    });
+
     describe('Status and Debugging', () => {
         test('should get status information', (done) => {
             const tm = window.$translationManager;
@@ -578,6 +1277,88 @@ describe('DynamicTranslation System', () => {
         });
     });
 
+    describe('Profiling', () => {
+        const loadProfiled = () => {
+            PluginManager.parameters = () => ({
+                'Default Language': 'zh',
+                'Translation Path': 'translations/',
+                'Auto Detect Translations': 'false',
+                'Translation Mode': 'full',
+                'Enable Profiling': 'true'
+            });
+            XMLHttpRequest.prototype.mockData = {
+                zh: { 'Level': '等級', 'Hello World': '你好 世界' }
+            };
+            global.loadPlugin();
+            const tm = window.$translationManager;
+            tm.initialize();
+            return tm;
+        };
+
+        test('should be disabled by default', () => {
+            const tm = window.$translationManager;
+            expect(tm.getStatus().profile).toBeNull();
+            expect(tm.exportMissLog().languages).toEqual({});
+        });
+
+        test('should time each instrumented step', () => {
+            const tm = loadProfiled();
+            tm.translate('Level');
+            tm.translate('World');
+            tm.setLanguage('zh');
+
+            const timers = tm.getStatus().profile.timers;
+            expect(timers.translate.count).toBe(2);
+            expect(timers.extractCorrespondingTranslation.count).toBe(1);
+            expect(timers['loadLanguage.fetch'].count).toBe(1);
+            expect(timers['loadLanguage.parse'].count).toBe(1);
+            expect(timers.applyTranslations.count).toBeGreaterThan(0);
+            expect(timers.translate.average).toBe(timers.translate.total / 2);
+        });
+
+        test('should count missed source strings', () => {
+            const tm = loadProfiled();
+            tm.translate('Unknown');
+            tm.translate('Unknown');
+            tm.translate('Other');
+            tm.translate('Level');
+
+            const log = tm.exportMissLog();
+            expect(log.version).toBe(1);
+            expect(log.languages.zh).toEqual([
+                { text: 'Unknown', count: 2 },
+                { text: 'Other', count: 1 }
+            ]);
+            expect(tm.getStatus().profile.misses).toEqual({ unique: 2, total: 3 });
+        });
+
+        test('should not log fully translated multi-line messages as misses', () => {
+            const tm = loadProfiled();
+            tm._translations.zh['Line 1'] = '行 1';
+            tm._translations.zh['Line 2'] = '行 2';
+            tm._invalidateDictionary('zh');
+
+            expect(tm.translateMessage(['Line 1', 'Line 2'])).toBe('行 1\n行 2');
+            expect(tm.exportMissLog().languages).toEqual({});
+
+            expect(tm.translateMessage(['Line 1', 'Unknown line'])).toBe('行 1\nUnknown line');
+            expect(tm.exportMissLog().languages.zh).toEqual([{ text: 'Unknown line', count: 1 }]);
+        });
+
+        test('should start and stop through the static API', () => {
+            TranslationManager.setProfiling(true);
+            const tm = window.$translationManager;
+            tm._isInitialized = true;
+            tm._currentLanguage = 'zh';
+            tm._translations = { zh: {} };
+            tm.translate('Missing');
+            expect(TranslationManager.exportMissLog().languages.zh).toEqual([{ text: 'Missing', count: 1 }]);
+
+            TranslationManager.setProfiling(false);
+            expect(tm.getStatus().profile).toBeNull();
+        });
+    });
+
     describe('Static Methods', () => {
         test('should use static setLanguage method', (done) => {
             const tm = window.$translationManager;
@@ -689,6 +1470,85 @@ describe('DynamicTranslation System', () => {
             }, 100);
         });
 
+        describe('with translations/manifest.json', () => {
+            const manifest = {
+                version: 1,
+                languages: [
+                    { code: 'zh', file: 'zh.json', size: 10, entries: 1, hash: 'sha256:0' },
+                    { code: 'en', file: 'en.json', size: 10, entries: 1, hash: 'sha256:1' },
+                    { code: 'ja', file: 'ja.json', size: 10, entries: 1, hash: 'sha256:2' }
+                ]
+            };
+
+            const loadWithManifest = () => {
+                PluginManager.parameters = () => ({
+                    'Default Language': 'zh',
+                    'Translation Path': 'translations/',
+                    'Auto Detect Translations': 'true',
+                    'Translation Mode': 'simple'
+                });
+                XMLHttpRequest.prototype.mockData = {
+                    manifest: manifest,
+                    zh: { 'Level': '等級' },
+                    en: { 'Level': 'Level' },
+                    ja: { 'Level': 'レベル' }
+                };
+                const openSpy = jest.spyOn(XMLHttpRequest.prototype, 'open');
+                global.loadPlugin();
+                openSpy.mockRestore();
+                return openSpy.mock.calls.map((call) => call[1]);
+            };
+
+            afterEach(() => {
+                ConfigManager.language = 'zh';
+            });
+
+            test('should only fetch the manifest and the startup language', () => {
+                const urls = loadWithManifest();
+                const tm = window.$translationManager;
+
+                expect(urls).toEqual(['translations/manifest.json', 'translations/zh.json']);
+                expect(tm._isInitialized).toBe(true);
+                expect(Object.keys(tm._translations)).toEqual(['zh']);
+                expect(tm.getAvailableLanguages()).toEqual(['zh', 'en', 'ja']);
+                expect(tm.getStatus().manifestLoaded).toBe(true);
+            });
+
+            test('should start with the language saved in ConfigManager', () => {
+                ConfigManager.language = 'ja';
+                const urls = loadWithManifest();
+                const tm = window.$translationManager;
+
+                expect(urls).toEqual(['translations/manifest.json', 'translations/ja.json']);
+                expect(tm.getCurrentLanguage()).toBe('ja');
+                expect(tm.translate('Level')).toBe('レベル');
+            });
+
+            test('should load other languages on demand', () => {
+                loadWithManifest();
+                const tm = window.$translationManager;
+
+                tm.setLanguage('en');
+                expect(Object.keys(tm._translations).sort()).toEqual(['en', 'zh']);
+                expect(tm.getCurrentLanguage()).toBe('en');
+            });
+
+            test('should probe languages when the manifest is missing', () => {
+                PluginManager.parameters = () => ({
+                    'Default Language': 'zh',
+                    'Translation Path': 'translations/',
+                    'Auto Detect Translations': 'true',
+                    'Translation Mode': 'simple'
+                });
+                XMLHttpRequest.prototype.mockData = { zh: { 'Level': '等級' } };
+                global.loadPlugin();
+                const tm = window.$translationManager;
+
+                expect(tm.getStatus().manifestLoaded).toBe(false);
+                expect(tm.getAvailableLanguages()).toEqual(['zh']);
+            });
+        });
+
         test('should use default language when auto-detect is disabled', (done) => {
             PluginManager.parameters = () => ({
                 'Default Language': 'zh',
@@ -707,6 +1567,420 @@ describe('DynamicTranslation System', () => {
                 done();
             }, 100);
         });
+
+        test('should use manifest files for the default language when auto-detect is disabled', () => {
+            PluginManager.parameters = () => ({
+                'Default Language': 'zh',
+                'Translation Path': 'translations/',
+                'Auto Detect Translations': 'false',
+                'Translation Mode': 'simple'
+            });
+            XMLHttpRequest.prototype.mockData = {
+                manifest: {
+                    version: 1,
+                    languages: [
+                        { code: 'zh', file: 'zh.json', shards: { core: 'zh/core.json', maps: { '1': 'zh/Map001.json' } } },
+                        { code: 'en', file: 'en.json' }
+                    ]
+                },
+                zh: { 'Level': '等級', 'Hello': '你好' },
+                core: { 'Level': '等級（共用）' },
+                Map001: { 'Hello': '你好（地圖）' }
+            };
+            global.loadPlugin();
+            const tm = window.$translationManager;
+            tm.initialize();
+
+            expect(tm.getStatus().manifestLoaded).toBe(true);
+            expect(tm.getAvailableLanguages()).toEqual(['zh']);
+            expect(tm.translate('Level')).toBe('等級（共用）');
+            DataManager.loadMapData(1);
+            expect(tm.translate('Hello')).toBe('你好（地圖）');
+        });
+    });
+
+    describe('Map Shards', () => {
+        const loadSharded = () => {
+            PluginManager.parameters = () => ({
+                'Default Language': 'zh',
+                'Translation Path': 'translations/',
+                'Auto Detect Translations': 'true',
+                'Translation Mode': 'simple'
+            });
+            XMLHttpRequest.prototype.mockData = {
+                manifest: {
+                    version: 1,
+                    languages: [{
+                        code: 'zh',
+                        file: 'zh.json',
+                        shards: {
+                            core: 'zh/core.json',
+                            maps: { '1': 'zh/Map001.json', '2': 'zh/Map002.json', '3': 'zh/Map003.json' }
+                        }
+                    }]
+                },
+                zh: { 'Level': '等級', 'Hello': '你好', 'Bye': '再見' },
+                core: { 'Level': '等級' },
+                Map001: { 'Hello': '你好' },
+                Map002: { 'Bye': '再見' },
+                Map003: { 'Level': '不應覆蓋', 'Thanks': '謝謝' }
+            };
+            global.loadPlugin();
+            return window.$translationManager;
+        };
+
+        test('should load only the core shard at boot', () => {
+            const tm = loadSharded();
+            expect(tm._isInitialized).toBe(true);
+            expect(tm.translate('Level')).toBe('等級');
+            expect(tm.translate('Hello')).toBe('Hello');
+        });
+
+        test('should load the map shard when map data is loaded', () => {
+            const tm = loadSharded();
+            tm.translate('Hello'); // 先快取未命中的結果
+
+            DataManager.loadMapData(1);
+            expect(tm.translate('Hello')).toBe('你好');
+            expect(tm.getStatus().mapShards).toEqual([1]);
+        });
+
+        test('should evict the least recently used map shard', () => {
+            const tm = loadSharded();
+            DataManager.loadMapData(1);
+            DataManager.loadMapData(2);
+            DataManager.loadMapData(3);
+
+            expect(tm.getStatus().mapShards).toEqual([2, 3]);
+            expect(tm.translate('Hello')).toBe('Hello');
+            expect(tm.translate('Bye')).toBe('再見');
+            expect(tm.translate('Thanks')).toBe('謝謝');
+            // 分片不會覆蓋或移除共用分片中的項目
+            expect(tm.translate('Level')).toBe('等級');
+        });
+
+        test('should keep the language indexes when a map shard loads', () => {
+            const tm = loadSharded();
+            tm._enableSubstringExtraction = true;
+            tm.translate('Missing');
+            const substringIndex = tm._getSubstringIndex('zh');
+            const normalizedIndex = tm._getNormalizedIndex('zh');
+
+            DataManager.loadMapData(3);
+            expect(tm._getSubstringIndex('zh')).toBe(substringIndex);
+            expect(tm._getNormalizedIndex('zh')).toBe(normalizedIndex);
+            expect(tm._translations.zh).toEqual({ 'Level': '等級' });
+            expect(tm.translate('  Thanks  ')).toBe('謝謝');
+            expect(tm.translate('Than')).toBe('謝');
+            expect(tm.getStatus().translationCount).toBe(2);
+        });
+
+        test('should match multi-line keys from map shards', () => {
+            const tm = loadSharded();
+            XMLHttpRequest.prototype.mockData.Map001 = { 'Hello\nBye': '你好\n再見' };
+            DataManager.loadMapData(1);
+
+            expect(tm.translateMessage(['Level', 'Hello', 'Bye'])).toBe('等級\n你好\n再見');
+        });
+
+        test('should report the map as not loaded until its shard arrives', () => {
+            const tm = loadSharded();
+            const originalSend = XMLHttpRequest.prototype.send;
+            let pendingRequest = null;
+            XMLHttpRequest.prototype.send = function () {
+                pendingRequest = this;
+            };
+
+            DataManager.loadMapData(2);
+            expect(DataManager.isMapLoaded()).toBe(false);
+
+            XMLHttpRequest.prototype.send = originalSend;
+            pendingRequest.send();
+            expect(DataManager.isMapLoaded()).toBe(true);
+            expect(tm.translate('Bye')).toBe('再見');
+        });
+    });
+
+    describe('Binary Translation Pack', () => {
+        const fs = require('fs');
+        const path = require('path');
+        const fixture = (name) => path.join(__dirname, 'fixtures', name);
+        const readPack = (name) => {
+            const buffer = fs.readFileSync(fixture(name));
+            return buffer.buffer.slice(buffer.byteOffset, buffer.byteOffset + buffer.byteLength);
+        };
+        const sample = JSON.parse(fs.readFileSync(fixture('pack_sample.json'), 'utf8'));
+
+        const loadPacked = (pack, mode) => {
+            PluginManager.parameters = () => ({
+                'Default Language': 'zh',
+                'Translation Path': 'translations/',
+                'Auto Detect Translations': 'true',
+                'Translation Mode': mode || 'simple'
+            });
+            XMLHttpRequest.prototype.mockData = {
+                manifest: { version: 1, languages: [{ code: 'zh', file: 'zh.json', pack: 'zh.dtp' }] },
+                zh: { 'はい': '是（JSON）' },
+                'zh.dtp': pack
+            };
+            global.loadPlugin();
+            const tm = window.$translationManager;
+            tm.initialize();
+            return tm;
+        };
+
+        ['pack_sample.dtp', 'pack_sample_nohash.dtp'].forEach((name) => {
+            test(`should look up every entry of ${name}`, () => {
+                const dictionary = new TranslationManager.BinaryDictionary(readPack(name));
+
+                Object.keys(sample).forEach((key) => {
+                    expect(dictionary.get(key)).toBe(sample[key]);
+                    expect(dictionary.has(key)).toBe(true);
+                });
+                expect(dictionary.get('存在しない')).toBeUndefined();
+                expect(dictionary.has('はい ')).toBe(false);
+                expect(dictionary.keys()).toEqual(Object.keys(sample));
+                expect(dictionary.size()).toBe(Object.keys(sample).length);
+            });
+        });
+
+        test('should reject data that is not a translation pack', () => {
+            expect(() => new TranslationManager.BinaryDictionary(new ArrayBuffer(8))).toThrow();
+            expect(() => new TranslationManager.BinaryDictionary(new Uint8Array(64).buffer)).toThrow();
+        });
+
+        test('should load the pack listed in the manifest', () => {
+            const tm = loadPacked(readPack('pack_sample.dtp'));
+
+            expect(tm.translate('はい')).toBe('是');
+            expect(tm.translate('一行目\n二行目')).toBe('第一行\n第二行');
+            expect(tm.getStatus().dictionaryFormat).toBe('pack');
+            expect(tm.getStatus().translationCount).toBe(Object.keys(sample).length);
+        });
+
+        test('should match multi-line keys without keeping decoded pack keys', () => {
+            const tm = loadPacked(readPack('pack_sample.dtp'));
+            const dictionary = tm._translations.zh;
+            const keysSpy = jest.spyOn(dictionary, 'keys');
+
+            expect(tm.translateMessage(['はい', '一行目', '二行目'])).toBe('是\n第一行\n第二行');
+            expect(keysSpy).not.toHaveBeenCalled();
+            tm._messageIndexes.zh._keys.forEach((candidates) => {
+                candidates.forEach((candidate) => expect(typeof candidate.ref).toBe('number'));
+            });
+            keysSpy.mockRestore();
+        });
+
+        test('should not decode every pack key when it loads', () => {
+            const tm = loadPacked(readPack('pack_sample.dtp'));
+            const stringSpy = jest.spyOn(tm._translations.zh, '_string');
+
+            expect(tm._normalizedIndexes.zh).toBeUndefined();
+            expect(tm.translate('はい')).toBe('是');
+            expect(tm._normalizedIndexes.zh).toBeUndefined();
+            expect(stringSpy.mock.calls.length).toBeLessThan(Object.keys(sample).length);
+            stringSpy.mockRestore();
+        });
+
+        test('should fall back to JSON when the pack cannot be read', () => {
+            const tm = loadPacked(new Uint8Array(100).buffer);
+
+            expect(tm.translate('はい')).toBe('是（JSON）');
+            expect(tm.getStatus().dictionaryFormat).toBe('json');
+        });
+
+        test('should support substring extraction and added entries', () => {
+            const tm = loadPacked(readPack('pack_sample.dtp'), 'full');
+            const dictionary = tm._translations.zh;
+
+            expect(tm.translate('二行目')).toBe('第二行');
+
+            dictionary.set('新しい', '新的');
+            tm._invalidateDictionary('zh');
+            expect(tm.translate('新しい')).toBe('新的');
+            expect(dictionary.size()).toBe(Object.keys(sample).length + 1);
+
+            dictionary.delete('新しい');
+            tm._invalidateDictionary('zh');
+            expect(tm.translate('新しい')).toBe('新しい');
+        });
+    });
+
+    describe('Compressed Translations', () => {
+        const zlib = require('zlib');
+        const originalFetch = global.fetch;
+        const dictionary = { 'はい': '是（壓縮檔）', 'いいえ': '否' };
+
+        const loadCompressed = (fetchImpl) => {
+            global.fetch = jest.fn(fetchImpl);
+            PluginManager.parameters = () => ({
+                'Default Language': 'zh',
+                'Translation Path': 'translations/',
+                'Auto Detect Translations': 'true',
+                'Translation Mode': 'simple'
+            });
+            XMLHttpRequest.prototype.mockData = {
+                manifest: { version: 1, languages: [{ code: 'zh', file: 'zh.json', compressed: { gzip: 'zh.json.gz' } }] },
+                zh: { 'はい': '是（JSON）' }
+            };
+            global.loadPlugin();
+            return window.$translationManager;
+        };
+        const gzipResponse = () => Promise.resolve(new Response(zlib.gzipSync(JSON.stringify(dictionary))));
+
+        afterEach(() => {
+            global.fetch = originalFetch;
+        });
+
+        test('should fetch and inflate the gzip copy listed in the manifest', async () => {
+            const openSpy = jest.spyOn(XMLHttpRequest.prototype, 'open');
+            const tm = loadCompressed(gzipResponse);
+
+            expect(await tm.loadLanguage('zh')).toBe(true);
+            expect(global.fetch).toHaveBeenCalledWith('translations/zh.json.gz');
+            expect(openSpy).not.toHaveBeenCalledWith('GET', 'translations/zh.json');
+            expect(tm.translate('はい')).toBe('是（壓縮檔）');
+            openSpy.mockRestore();
+        });
+
+        test('should use the body as is when the server already decoded it', async () => {
+            const tm = loadCompressed(() => Promise.resolve(new Response(JSON.stringify(dictionary), {
+                headers: { 'Content-Encoding': 'gzip' }
+            })));
+
+            expect(await tm.loadLanguage('zh')).toBe(true);
+            expect(tm.translate('いいえ')).toBe('否');
+        });
+
+        test('should fall back to JSON when the gzip copy is missing or corrupt', async () => {
+            const warn = jest.spyOn(console, 'warn').mockImplementation(() => { });
+            let tm = loadCompressed(() => Promise.resolve(new Response('', { status: 404 })));
+            expect(await tm.loadLanguage('zh')).toBe(true);
+            expect(tm.translate('はい')).toBe('是（JSON）');
+
+            tm = loadCompressed(() => Promise.resolve(new Response(new Uint8Array([0x1f, 0x8b, 1, 2, 3]))));
+            expect(await tm.loadLanguage('zh')).toBe(true);
+            expect(tm.translate('はい')).toBe('是（JSON）');
+            expect(warn.mock.calls[0][0]).toBe('壓縮翻譯檔載入失敗，改用 JSON:');
+            warn.mockRestore();
+        });
+
+        test('should read the JSON file when DecompressionStream is unavailable', async () => {
+            const original = global.DecompressionStream;
+            delete global.DecompressionStream;
+            try {
+                const tm = loadCompressed(gzipResponse);
+                expect(await tm.loadLanguage('zh')).toBe(true);
+                expect(global.fetch).not.toHaveBeenCalled();
+                expect(tm.translate('はい')).toBe('是（JSON）');
+            } finally {
+                global.DecompressionStream = original;
+            }
+        });
+    });
+
+    describe('Prebaked Data', () => {
+        let loadDatabase;
+        let loadDataFile;
+
+        const loadPrebaked = (language) => {
+            PluginManager.parameters = () => ({
+                'Default Language': 'zh',
+                'Translation Path': 'translations/',
+                'Auto Detect Translations': 'true',
+                'Translation Mode': 'simple'
+            });
+            ConfigManager.language = language;
+            XMLHttpRequest.prototype.mockData = {
+                manifest: {
+                    version: 1,
+                    languages: [
+                        { code: 'zh', file: 'zh.json', data: 'data_zh/' },
+                        { code: 'en', file: 'en.json' }
+                    ]
+                },
+                zh: { 'Hello': '你好' },
+                en: { 'Hello': 'Hi', '你好': '不應再翻譯' },
+                'data/Actors.json': [null, { name: 'Harold' }],
+                'data_zh/Actors.json': [null, { name: '哈羅德' }]
+            };
+            DataManager._databaseFiles = [{ name: '$dataActors', src: 'Actors.json' }];
+            loadDatabase = jest.fn();
+            loadDataFile = jest.fn();
+            DataManager.loadDatabase = loadDatabase;
+            DataManager.loadDataFile = loadDataFile;
+            global.loadPlugin();
+            return window.$translationManager;
+        };
+
+        afterEach(() => {
+            ConfigManager.language = 'zh';
+            DataManager._databaseFiles = [];
+            delete global.$dataActors;
+        });
+
+        test('should read data files from the prebaked directory of the current language', () => {
+            const tm = loadPrebaked('zh');
+            DataManager.loadDatabase();
+            expect(loadDatabase).toHaveBeenCalled();
+
+            DataManager.loadDataFile('$dataActors', 'Actors.json');
+            expect(loadDataFile).toHaveBeenCalledWith('$dataActors', '../data_zh/Actors.json');
+            expect(tm.getStatus().dataDirectory).toBe('data_zh/');
+        });
+
+        test('should read original data files for languages without prebaked data', () => {
+            const tm = loadPrebaked('en');
+            DataManager.loadDatabase();
+
+            DataManager.loadDataFile('$dataActors', 'Actors.json');
+            expect(loadDataFile).toHaveBeenCalledWith('$dataActors', 'Actors.json');
+            expect(tm.getDataDirectory()).toBeNull();
+        });
+
+        test('should reuse the manifest read before the database', () => {
+            const tm = loadPrebaked('zh');
+            DataManager.loadDatabase();
+            const openSpy = jest.spyOn(XMLHttpRequest.prototype, 'open');
+
+            tm.initialize();
+            expect(tm._isInitialized).toBe(true);
+            expect(openSpy).not.toHaveBeenCalledWith('GET', 'translations/manifest.json');
+            openSpy.mockRestore();
+        });
+
+        test('should skip runtime message lookup when the data is prebaked', () => {
+            const tm = loadPrebaked('zh');
+            DataManager.loadDatabase();
+            tm.initialize();
+            const translateSpy = jest.spyOn(tm, 'translate');
+
+            const gameMessage = new Game_Message();
+            gameMessage.add('你好');
+            expect(tm.isDataPrebaked()).toBe(true);
+            expect(gameMessage.allText()).toBe('你好');
+            expect(translateSpy).not.toHaveBeenCalled();
+            translateSpy.mockRestore();
+        });
+
+        test('should swap in the original data set when switching to a language without prebaked data', () => {
+            const tm = loadPrebaked('zh');
+            DataManager.loadDatabase();
+            tm.initialize();
+
+            tm.setLanguage('en');
+            expect(global.$dataActors[1].name).toBe('Harold');
+            expect(tm.getDataDirectory()).toBeNull();
+            expect(tm.isDataPrebaked()).toBe(false);
+
+            const gameMessage = new Game_Message();
+            gameMessage.add('Hello');
+            expect(gameMessage.allText()).toBe('Hi');
+
+            tm.setLanguage('zh');
+            expect(global.$dataActors[1].name).toBe('哈羅德');
+            expect(tm.isDataPrebaked()).toBe(true);
+        });
     });
 
     describe('Window_Options Integration', () => {
@@ -795,65 +2069,93 @@ describe('DynamicTranslation System', () => {
     });
 
     describe('Game_Message Integration', () => {
-        test('should translate messages added to Game_Message', () => {
-            const gameMessage = new Game_Message();
+        const initManager = (translations) => {
+            // 每次載入外掛都會再包一層 allText，先還原成只有一層
+            Game_Message.prototype.allText = function () { return (this._texts || []).join('\n'); };
+            global.loadPlugin();
             const tm = window.$translationManager;
             tm._isInitialized = true;
             tm._currentLanguage = 'zh';
-            tm._translations = {
-                zh: {
-                    'Test message': '測試訊息'
-                }
-            };
-            
+            tm._translations = { zh: translations };
+            return tm;
+        };
+
+        test('should translate the assembled message', () => {
+            initManager({ 'Test message': '測試訊息' });
+            const gameMessage = new Game_Message();
+
             gameMessage.add('Test message');
-            expect(gameMessage._texts).toContain('測試訊息');
+            expect(gameMessage._texts).toContain('Test message');
+            expect(gameMessage.allText()).toBe('測試訊息');
         });
 
         test('should handle uninitialized translation manager', () => {
             const gameMessage = new Game_Message();
             const tm = window.$translationManager;
             tm._isInitialized = false;
-            
+
             gameMessage.add('Test message');
-            expect(gameMessage._texts).toContain('Test message');
+            expect(gameMessage.allText()).toBe('Test message');
         });
-    });
 
-    describe('Window_Message Integration', () => {
-        test('should translate multiline messages', () => {
-            const windowMessage = new Window_Message();
-            const tm = window.$translationManager;
-            tm._isInitialized = true;
-            tm._currentLanguage = 'zh';
-            tm._translations = {
-                zh: {
-                    'Line 1\nLine 2': '行 1\n行 2'
-                }
-            };
-            
-            windowMessage._textState = { text: 'Line 1\nLine 2' };
-            windowMessage.startMessage();
-            
-            expect(windowMessage._textState.text).toBe('行 1\n行 2');
+        test('should translate multiline messages as a whole', () => {
+            initManager({ 'Line 1\nLine 2': '行 1\n行 2', 'Line 1': '不應使用' });
+            const gameMessage = new Game_Message();
+
+            gameMessage.add('Line 1');
+            gameMessage.add('Line 2');
+            expect(gameMessage.allText()).toBe('行 1\n行 2');
         });
 
         test('should translate line by line when full translation fails', () => {
+            initManager({ 'Line 1': '行 1', 'Line 2': '行 2' });
+            const gameMessage = new Game_Message();
+
+            gameMessage.add('Line 1');
+            gameMessage.add('');
+            gameMessage.add('Line 2');
+            expect(gameMessage.allText()).toBe('行 1\n\n行 2');
+        });
+
+        test('should apply multi-line keys that span part of the message', () => {
+            initManager({
+                'Line 2\nLine 3': '行 2\n行 3',
+                'Line 2\nLine 3\nLine 4': '行 2 至 4',
+                'Line 1': '行 1',
+                'Line 3': '不應使用'
+            });
+            const gameMessage = new Game_Message();
+
+            ['Line 1', 'Line 2', 'Line 3', 'Line 5'].forEach((line) => gameMessage.add(line));
+            expect(gameMessage.allText()).toBe('行 1\n行 2\n行 3\nLine 5');
+
+            gameMessage._texts = ['Line 2', 'Line 3', 'Line 4'];
+            expect(gameMessage.allText()).toBe('行 2 至 4');
+        });
+
+        test('should translate each message only once', () => {
+            const tm = initManager({ 'Line 1': '行 1' });
+            const messageSpy = jest.spyOn(tm, 'translateMessage');
+            const gameMessage = new Game_Message();
+
+            gameMessage.add('Line 1');
+            gameMessage.allText();
+            gameMessage.allText();
+            expect(messageSpy.mock.calls.length).toBe(1);
+
+            gameMessage.add('Line 2');
+            expect(gameMessage.allText()).toBe('行 1\nLine 2');
+            expect(messageSpy.mock.calls.length).toBe(2);
+            messageSpy.mockRestore();
+        });
+
+        test('should not translate again in Window_Message.startMessage', () => {
+            initManager({ 'Line 1': '行 1' });
             const windowMessage = new Window_Message();
-            const tm = window.$translationManager;
-            tm._isInitialized = true;
-            tm._currentLanguage = 'zh';
-            tm._translations = {
-                zh: {
-                    'Line 1': '行 1',
-                    'Line 2': '行 2'
-                }
-            };
-            
-            windowMessage._textState = { text: 'Line 1\nLine 2' };
+
+            windowMessage._textState = { text: 'Line 1' };
             windowMessage.startMessage();
-            
-            expect(windowMessage._textState.text).toBe('行 1\n行 2');
+            expect(windowMessage._textState.text).toBe('Line 1');
         });
     });
 
@@ -14,11 +14,25 @@ global.XMLHttpRequest = class XMLHttpRequest {
         // The url will be something like 'translations/zh.json'
         // We need to map this to the actual file path if it exists, or mock the response
 
+        if (this.mockData && this.mockData[this.url]) {
+            this.status = 200;
+            this.responseText = JSON.stringify(this.mockData[this.url]);
+            if (this.onload) this.onload();
+            return;
+        }
+
         if (this.url.startsWith('translations/')) {
             const lang = path.basename(this.url, '.json');
             if (this.mockData && this.mockData[lang]) {
                 this.status = 200;
-                this.responseText = JSON.stringify(this.mockData[lang]);
+                if (this.mockData[lang] instanceof ArrayBuffer) {
+                    this.response = this.mockData[lang];
+                } else if (this.responseType === 'arraybuffer') {
+                    const bytes = Buffer.from(JSON.stringify(this.mockData[lang]), 'utf8');
+                    this.response = bytes.buffer.slice(bytes.byteOffset, bytes.byteOffset + bytes.length);
+                } else {
+                    this.responseText = JSON.stringify(this.mockData[lang]);
+                }
                 if (this.onload) this.onload();
                 return;
             }
@@ -79,6 +93,12 @@ global.Game_Interpreter = class {
 
 global.Game_Message = class {
     add(text) { this._texts = this._texts || []; this._texts.push(text); }
+    allText() { return (this._texts || []).join('\n'); }
+};
+
+global.Window_Base = class {
+    drawText() { }
+    drawTextEx() { return 0; }
 };
 
 global.Window_Message = class {
@@ -100,11 +120,17 @@ global.SoundManager = {
 };
 
 global.DataManager = {
-    onLoad: function (_object) { }
+    _databaseFiles: [],
+    loadDatabase: function () { },
+    loadDataFile: function (_name, _src) { },
+    onLoad: function (_object) { },
+    loadMapData: function (_mapId) { },
+    isMapLoaded: function () { return true; }
 };
 
 global.Scene_Base = class {
     create() { }
+    update() { }
 };
 
 global.Window_Command = class {
@@ -48,6 +48,25 @@ def _install_translation_from_file(tmp_path, content, filename):
     return install_translation(str(tmp_path), str(www_dir))
 
 
+def _make_data_files(www_dir, files):
+    """Write data/*.json files for a project."""
+    data_dir = Path(www_dir) / "data"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    for name, content in files.items():
+        (data_dir / name).write_text(json.dumps(content, ensure_ascii=False), encoding="utf-8")
+    return data_dir
+
+
+def _event_page(*commands):
+    """Build an event page from (code, parameters) tuples."""
+    return {"list": [{"code": code, "indent": 0, "parameters": params} for code, params in commands]}
+
+
+def _map(*pages, display_name=""):
+    """Build a MapXXX.json object with a single event."""
+    return {"displayName": display_name, "events": [None, {"id": 1, "pages": list(pages)}]}
+
+
 class TestGetPaths:
     """Tests for get_paths()."""
 
@@ -279,6 +298,30 @@ class TestInstallTranslation:
         _install_translation_from_file(tmp_path, '{"x": "y"}', "tr.json")
         assert (tmp_path / "www" / "translations").exists()
 
+    def test_skips_file_that_fails_full_validation(self, tmp_path, capsys):
+        _make_rpg_project(tmp_path)
+        entries = ", ".join(f'"k{i}": "v{i}"' for i in range(40))
+        (tmp_path / "a_broken.json").write_text("{" + entries + ', "bad": 1}', encoding="utf-8")
+        (tmp_path / "b_good.json").write_text('{"good": "好"}', encoding="utf-8")
+
+        with patch("os.listdir", return_value=["a_broken.json", "b_good.json"]):
+            from install_plugin import install_translation
+
+            result = install_translation(str(tmp_path), str(tmp_path / "www"))
+
+        assert result is True
+        dest = tmp_path / "www" / "translations" / "zh.json"
+        assert json.loads(dest.read_text(encoding="utf-8")) == {"good": "好"}
+        assert "a_broken.json is not a valid translation file" in capsys.readouterr().out
+        # No temp files are left behind
+        assert sorted(p.name for p in dest.parent.iterdir()) == ["zh.json"]
+
+    def test_copy_preserves_bytes(self, tmp_path):
+        content = '{\n  "鍵": "值",\n  "k": "v"\n}\n'
+        _install_translation_from_file(tmp_path, content, "zh.json")
+        dest = tmp_path / "www" / "translations" / "zh.json"
+        assert dest.read_text(encoding="utf-8") == content
+
     def test_exported_structure_translations_in_root(self, tmp_path):
         """Exported structure: translations should be in project root, not www/translations."""
         # Create exported structure (no www, js directly in root)
@@ -296,6 +339,255 @@ class TestInstallTranslation:
         assert not (tmp_path / "www" / "translations").exists()
 
 
+class TestStreamingReader:
+    """Tests for iter_json_object_items() and sniff_translation_file()."""
+
+    def test_matches_json_loads_with_tiny_chunks(self):
+        from install_plugin import iter_json_object_items
+
+        data = {
+            "レベル": "等級",
+            "line 1\nline 2": "行 1\n行 2",
+            "escaped \"quote\" \\ \u00e9": "跳脫字元",
+            "number": 12345.5e-3,
+            "literals": [True, False, None],
+            "nested": {"a": {"b": "c"}},
+            "emoji 🎮": "🎮",
+        }
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+        chunks = [text[i:i + 1] for i in range(len(text))]
+        assert list(iter_json_object_items(chunks)) == list(data.items())
+
+    @pytest.mark.parametrize(
+        "text",
+        ["", "[1, 2]", '{"a" "b"}', '{"a": "b",}', '{"a": "b"} trailing', '{"a": "b"', "{1: 2}"],
+    )
+    def test_rejects_malformed_documents(self, text):
+        from install_plugin import TranslationFileError, iter_json_object_items
+
+        with pytest.raises(TranslationFileError):
+            list(iter_json_object_items([text]))
+
+    def test_sniff_reads_only_the_first_entries(self, tmp_path):
+        from install_plugin import sniff_translation_file
+
+        entries = ", ".join(f'"k{i}": "v{i}"' for i in range(40))
+        path = tmp_path / "big.json"
+        # Garbage after the sniffed prefix is not read
+        path.write_text("{" + entries + ", " + "x" * (1024 * 1024) + "}", encoding="utf-8")
+        assert sniff_translation_file(str(path), max_entries=32) is True
+
+    def test_sniff_rejects_non_string_values(self, tmp_path):
+        from install_plugin import sniff_translation_file
+
+        path = tmp_path / "mixed.json"
+        path.write_text('{"a": "b", "c": 1}', encoding="utf-8")
+        assert sniff_translation_file(str(path)) is False
+
+    def test_sniff_accepts_utf8_bom(self, tmp_path):
+        from install_plugin import sniff_translation_file
+
+        path = tmp_path / "bom.json"
+        path.write_bytes(b"\xef\xbb\xbf" + '{"a": "甲"}'.encode("utf-8"))
+        assert sniff_translation_file(str(path)) is True
+
+    def test_sniff_does_not_decode_non_string_values(self, tmp_path):
+        import install_plugin
+
+        path = tmp_path / "data.json"
+        path.write_text('{"a": [' + "1, " * 200000 + "1]}", encoding="utf-8")
+        with patch.object(install_plugin, "_json_decoder", wraps=install_plugin._json_decoder) as decoder:
+            assert install_plugin.sniff_translation_file(str(path)) is False
+        # Only the key is decoded
+        assert decoder.raw_decode.call_count == 1
+
+    def test_large_value_is_decoded_a_few_times(self, tmp_path):
+        import install_plugin
+
+        path = tmp_path / "large.json"
+        path.write_text(json.dumps({"a": "x" * (4 * 1024 * 1024)}), encoding="utf-8")
+        with patch.object(install_plugin, "_json_decoder", wraps=install_plugin._json_decoder) as decoder:
+            assert install_plugin.sniff_translation_file(str(path)) is True
+        # Retries wait for the buffer to double instead of decoding per chunk
+        assert decoder.raw_decode.call_count < 16
+
+
+class TestWriteManifest:
+    """Tests for write_manifest()."""
+
+    def test_lists_each_language_with_size_entries_and_hash(self, tmp_path):
+        import hashlib
+
+        from install_plugin import write_manifest
+
+        zh = tmp_path / "zh.json"
+        zh.write_text('{"a": "甲", "b": "乙"}', encoding="utf-8")
+        (tmp_path / "en.json").write_text('{"a": "A"}', encoding="utf-8")
+
+        manifest = write_manifest(str(tmp_path))
+
+        assert manifest["version"] == 1
+        assert [entry["code"] for entry in manifest["languages"]] == ["en", "zh"]
+        zh_entry = manifest["languages"][1]
+        assert zh_entry["file"] == "zh.json"
+        assert zh_entry["size"] == zh.stat().st_size
+        assert zh_entry["entries"] == 2
+        assert zh_entry["hash"] == "sha256:" + hashlib.sha256(zh.read_bytes()).hexdigest()
+        on_disk = json.loads((tmp_path / "manifest.json").read_text(encoding="utf-8"))
+        assert on_disk == manifest
+
+    def test_skips_invalid_files_and_itself(self, tmp_path, capsys):
+        from install_plugin import write_manifest
+
+        (tmp_path / "zh.json").write_text('{"a": "b"}', encoding="utf-8")
+        (tmp_path / "broken.json").write_text("not json", encoding="utf-8")
+        (tmp_path / "list.json").write_text("[1, 2]", encoding="utf-8")
+        write_manifest(str(tmp_path))
+
+        manifest = write_manifest(str(tmp_path))
+        assert [entry["code"] for entry in manifest["languages"]] == ["zh"]
+        assert "Warning: skipping broken.json" in capsys.readouterr().out
+
+    def test_main_writes_manifest_for_installed_translation(self, tmp_path):
+        _make_rpg_project(tmp_path)
+        (tmp_path / "mtool.json").write_text('{"x": "y"}', encoding="utf-8")
+
+        with patch("sys.argv", ["install_plugin.py", str(tmp_path)]):
+            from install_plugin import main
+
+            main()
+
+        manifest_path = tmp_path / "www" / "translations" / "manifest.json"
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        assert [entry["code"] for entry in manifest["languages"]] == ["zh"]
+
+
+class TestIterTextUnits:
+    """Tests for iter_text_units()."""
+
+    def _texts(self, filename, data):
+        from install_plugin import iter_text_units, unit_text
+
+        return [unit_text(unit) for unit in iter_text_units(filename, data)]
+
+    def test_groups_consecutive_message_lines(self):
+        page = _event_page(
+            (101, ["", 0, 0, 2, "ハロルド"]),
+            (401, ["一行目"]),
+            (401, ["二行目"]),
+            (0, []),
+            (405, ["スクロール"]),
+        )
+        texts = self._texts("Map001.json", _map(page, display_name="村"))
+        assert texts == ["村", "ハロルド", "一行目\n二行目", "スクロール"]
+
+    def test_extracts_choices_and_name_changes(self):
+        page = _event_page(
+            (102, [["はい", "いいえ"], 1, 0, 2, 0]),
+            (402, [0, "はい"]),
+            (320, [1, "新しい名前"]),
+        )
+        texts = self._texts("CommonEvents.json", [None, page])
+        assert texts == ["はい", "いいえ", "はい", "新しい名前"]
+
+    def test_extracts_database_fields_and_system_terms(self):
+        assert self._texts("Items.json", [None, {"name": "薬草", "description": "回復", "note": "x"}]) == [
+            "薬草",
+            "回復",
+        ]
+        system = {
+            "gameTitle": "タイトル",
+            "currencyUnit": "G",
+            "elements": ["", "炎"],
+            "terms": {"basic": ["レベル"], "params": [], "commands": [None], "messages": {"victory": "%1の勝利！"}},
+        }
+        assert self._texts("System.json", system) == ["タイトル", "G", "炎", "レベル", "%1の勝利！"]
+
+    def test_slots_can_be_rewritten(self):
+        from install_plugin import iter_text_units
+
+        data = [None, {"name": "薬草", "description": ""}]
+        for unit in iter_text_units("Items.json", data):
+            for container, key in unit:
+                container[key] = "草藥"
+        assert data[1]["name"] == "草藥"
+
+
+class TestCompileShards:
+    """Tests for compile_shards() and the shard command."""
+
+    def _setup(self, tmp_path):
+        _make_rpg_project(tmp_path)
+        www = tmp_path / "www"
+        translations = www / "translations"
+        translations.mkdir()
+        dictionary = {
+            "一行目\n二行目": "第一行\n第二行",
+            "村": "村莊",
+            "共通": "共通的",
+            "薬草": "草藥",
+            "未使用": "未使用的",
+        }
+        (translations / "zh.json").write_text(json.dumps(dictionary, ensure_ascii=False), encoding="utf-8")
+        _make_data_files(
+            www,
+            {
+                "Map001.json": _map(
+                    _event_page((401, ["一行目"]), (401, ["二行目"]), (101, ["", 0, 0, 2]), (401, ["共通"]))
+                ),
+                "Map002.json": _map(_event_page((401, ["共通 "])), display_name="村"),
+                "Items.json": [None, {"name": "薬草", "description": ""}],
+                "MapInfos.json": [None, {"name": "共通"}],
+            },
+        )
+        return www, translations
+
+    def test_assigns_keys_to_core_and_map_shards(self, tmp_path):
+        from install_plugin import compile_shards
+
+        www, translations = self._setup(tmp_path)
+        result = compile_shards(str(www), "zh")
+
+        core = json.loads((translations / "zh" / "core.json").read_text(encoding="utf-8"))
+        map1 = json.loads((translations / "zh" / "Map001.json").read_text(encoding="utf-8"))
+        map2 = json.loads((translations / "zh" / "Map002.json").read_text(encoding="utf-8"))
+        assert map1 == {"一行目\n二行目": "第一行\n第二行"}
+        assert map2 == {"村": "村莊"}
+        # Shared between maps, used by the database, or unreferenced
+        assert core == {"共通": "共通的", "薬草": "草藥", "未使用": "未使用的"}
+        assert result == {"core": 3, "maps": {1: 1, 2: 1}}
+
+    def test_manifest_lists_shards(self, tmp_path):
+        from install_plugin import compile_shards
+
+        www, translations = self._setup(tmp_path)
+        compile_shards(str(www), "zh")
+
+        manifest = json.loads((translations / "manifest.json").read_text(encoding="utf-8"))
+        assert manifest["languages"][0]["shards"] == {
+            "core": "zh/core.json",
+            "maps": {"1": "zh/Map001.json", "2": "zh/Map002.json"},
+        }
+
+    def test_removes_stale_map_shards(self, tmp_path):
+        from install_plugin import compile_shards
+
+        www, translations = self._setup(tmp_path)
+        (translations / "zh").mkdir()
+        (translations / "zh" / "Map099.json").write_text("{}", encoding="utf-8")
+        compile_shards(str(www), "zh")
+        assert not (translations / "zh" / "Map099.json").exists()
+
+    def test_shard_command_via_main(self, tmp_path, capsys):
+        www, translations = self._setup(tmp_path)
+        with patch("sys.argv", ["install_plugin.py", "shard", str(tmp_path), "--lang", "zh"]):
+            from install_plugin import main
+
+            main()
+        assert (translations / "zh" / "core.json").exists()
+        assert "map shards" in capsys.readouterr().out
+
+
 class TestPluginConfig:
     """Tests for PLUGIN_CONFIG constant."""
 
@@ -362,3 +654,733 @@ class TestMain:
         # Should succeed (returncode 0) or fail gracefully, but not with "Invalid target directory"
         assert "Invalid target directory:" not in result.stderr
         assert (unicode_dir / "www" / "js" / "plugins" / "DynamicTranslation.js").exists()
+
+
+class TestBatchInstall:
+    """Tests for batch_install / batch_command"""
+
+    def _project(self, root, name, translation=None):
+        project = root / name
+        project.mkdir()
+        _make_rpg_project(project)
+        _make_plugins_js(project)
+        if translation is not None:
+            (project / "zh.json").write_text(json.dumps(translation, ensure_ascii=False), encoding="utf-8")
+        return project
+
+    def test_reports_installed_skipped_and_failed(self, tmp_path):
+        from install_plugin import batch_install
+
+        good = self._project(tmp_path, "good", {"はい": "是"})
+        bare = self._project(tmp_path, "bare")
+        not_a_game = tmp_path / "docs"
+        not_a_game.mkdir()
+
+        results = batch_install([str(good), str(bare), str(not_a_game)], str(PROJECT_ROOT), jobs=2)
+
+        assert [r["project"] for r in results] == [str(good), str(bare), str(not_a_game)]
+        assert [r["status"] for r in results] == ["installed", "installed", "skipped"]
+        assert results[0]["translation"] is True
+        assert results[1]["translation"] is False
+        assert "Invalid target directory" in results[2]["reason"]
+        assert (good / "www" / "js" / "plugins" / "DynamicTranslation.js").exists()
+        assert (good / "www" / "translations" / "manifest.json").exists()
+        assert set(results[0]["timings"]) >= {"copy_plugin", "update_plugins_js", "install_translation", "total"}
+
+    def test_failure_in_one_project_does_not_stop_others(self, tmp_path):
+        from install_plugin import batch_install
+
+        good = self._project(tmp_path, "good")
+        missing_plugin_dir = tmp_path / "empty_script_dir"
+        missing_plugin_dir.mkdir()
+
+        failed = batch_install([str(good)], str(missing_plugin_dir), jobs=1)
+        assert failed[0]["status"] == "failed"
+        assert "FileNotFoundError" in failed[0]["reason"]
+
+        ok = batch_install([str(good)], str(PROJECT_ROOT), jobs=1)
+        assert ok[0]["status"] == "installed"
+
+    def test_expand_projects_globs_and_dedupes(self, tmp_path):
+        from install_plugin import expand_projects
+
+        a = self._project(tmp_path, "a")
+        b = self._project(tmp_path, "b")
+        (tmp_path / "notes.txt").write_text("x", encoding="utf-8")
+
+        projects = expand_projects([str(tmp_path / "*"), str(a)])
+        assert projects == [str(a), str(b)]
+
+    def test_command_writes_report_and_exit_code(self, tmp_path, capsys):
+        from install_plugin import batch_command
+
+        good = self._project(tmp_path, "good", {"はい": "是"})
+        report = tmp_path / "report.json"
+
+        assert batch_command([str(good), str(tmp_path / "missing"), "--jobs", "1", "--report", str(report)]) == 0
+        data = json.loads(report.read_text(encoding="utf-8"))
+        assert data["summary"]["installed"] == 1
+        assert data["summary"]["skipped"] == 1
+        assert data["summary"]["total"] == 2
+        assert "Target directory" not in capsys.readouterr().out
+        assert "Installed zh.json to translations/zh.json" in data["projects"][0]["log"]
+
+
+class TestIncrementalInstall:
+    """Tests for install_project(incremental=True)"""
+
+    def _setup(self, tmp_path):
+        _make_rpg_project(tmp_path)
+        _make_plugins_js(tmp_path)
+        (tmp_path / "zh.json").write_text(json.dumps({"はい": "是"}, ensure_ascii=False), encoding="utf-8")
+        return str(tmp_path), str(tmp_path / "www")
+
+    def test_second_run_skips_current_outputs(self, tmp_path, capsys):
+        from install_plugin import STATE_NAME, install_project
+
+        target_dir, www_dir = self._setup(tmp_path)
+        install_project(target_dir, www_dir, str(PROJECT_ROOT), incremental=True)
+        assert (tmp_path / "www" / STATE_NAME).exists()
+        capsys.readouterr()
+
+        with patch("install_plugin.copy_file_atomic") as copy_plugin, patch(
+            "install_plugin.copy_translation_file"
+        ) as copy_translation, patch("install_plugin.sniff_translation_file") as sniff:
+            results = install_project(target_dir, www_dir, str(PROJECT_ROOT), incremental=True)
+
+        copy_plugin.assert_not_called()
+        copy_translation.assert_not_called()
+        sniff.assert_not_called()
+        assert results["copy_plugin"] is False
+        assert results["install_translation"] is True
+        out = capsys.readouterr().out
+        assert "plugins.js is up to date" in out
+        assert "manifest.json is up to date" in out
+
+    def test_unreadable_candidate_is_skipped(self, tmp_path):
+        import install_plugin
+
+        target_dir, www_dir = self._setup(tmp_path)
+        (tmp_path / "gone.json").write_text("{}", encoding="utf-8")
+        file_signature = install_plugin.file_signature
+
+        def flaky_signature(path):
+            return None if path.endswith("gone.json") else file_signature(path)
+
+        with patch("install_plugin.file_signature", side_effect=flaky_signature):
+            assert install_plugin.install_translation(target_dir, www_dir, install_plugin.load_install_state(www_dir)) is True
+        assert (tmp_path / "www" / "translations" / "zh.json").exists()
+
+    def test_changed_translation_is_reinstalled(self, tmp_path):
+        from install_plugin import install_project
+
+        target_dir, www_dir = self._setup(tmp_path)
+        install_project(target_dir, www_dir, str(PROJECT_ROOT), incremental=True)
+
+        (tmp_path / "zh.json").write_text(json.dumps({"はい": "是的", "いいえ": "否"}, ensure_ascii=False), encoding="utf-8")
+        install_project(target_dir, www_dir, str(PROJECT_ROOT), incremental=True)
+
+        installed = json.loads((tmp_path / "www" / "translations" / "zh.json").read_text(encoding="utf-8"))
+        assert installed == {"はい": "是的", "いいえ": "否"}
+        manifest = json.loads((tmp_path / "www" / "translations" / "manifest.json").read_text(encoding="utf-8"))
+        assert manifest["languages"][0]["entries"] == 2
+
+    def test_modified_output_is_rewritten(self, tmp_path):
+        from install_plugin import install_project
+
+        target_dir, www_dir = self._setup(tmp_path)
+        install_project(target_dir, www_dir, str(PROJECT_ROOT), incremental=True)
+
+        plugin = tmp_path / "www" / "js" / "plugins" / "DynamicTranslation.js"
+        plugin.write_text("// edited", encoding="utf-8")
+        results = install_project(target_dir, www_dir, str(PROJECT_ROOT), incremental=True)
+
+        assert results["copy_plugin"] is True
+        assert plugin.read_bytes() == (PROJECT_ROOT / "DynamicTranslation.js").read_bytes()
+
+    def test_writes_leave_no_temp_files(self, tmp_path):
+        from install_plugin import install_project
+
+        target_dir, www_dir = self._setup(tmp_path)
+        install_project(target_dir, www_dir, str(PROJECT_ROOT), incremental=True)
+
+        leftovers = [path.name for path in (tmp_path / "www").rglob(".tmp-*")]
+        assert leftovers == []
+
+
+class TestPrebakeData:
+    """Tests for prebake_data() and the prebake command."""
+
+    def _setup(self, tmp_path):
+        _make_rpg_project(tmp_path)
+        www = tmp_path / "www"
+        translations = www / "translations"
+        translations.mkdir()
+        dictionary = {
+            "一行目\n二行目": "第一行\n第二行\n第三行",
+            "三行目": "另一行",
+            "はい": "是",
+            "薬草": "草藥",
+            "村": "村莊",
+        }
+        (translations / "zh.json").write_text(json.dumps(dictionary, ensure_ascii=False), encoding="utf-8")
+        _make_data_files(
+            www,
+            {
+                "Map001.json": _map(
+                    _event_page(
+                        (401, ["一行目"]),
+                        (401, ["二行目"]),
+                        (101, ["", 0, 0, 2]),
+                        (401, ["三行目 "]),
+                        (401, ["未翻訳"]),
+                        (102, [["はい", "いいえ"], 1]),
+                    ),
+                    display_name="村",
+                ),
+                "Items.json": [None, {"name": "薬草", "description": ""}],
+                "Tilesets.json": [None, {"name": "村"}],
+            },
+        )
+        return www, translations
+
+    def test_writes_translated_data_directory(self, tmp_path):
+        from install_plugin import prebake_data
+
+        www, _ = self._setup(tmp_path)
+        stats = prebake_data(str(www), "zh")
+
+        baked = json.loads((www / "data_zh" / "Map001.json").read_text(encoding="utf-8"))
+        commands = baked["events"][1]["pages"][0]["list"]
+        assert baked["displayName"] == "村莊"
+        # Extra translated lines stay in the last line of the message
+        assert [c["parameters"][0] for c in commands[:2]] == ["第一行", "第二行\n第三行"]
+        # Falls back to line by line lookups, including the trimmed form
+        assert [c["parameters"][0] for c in commands[3:5]] == ["另一行", "未翻訳"]
+        assert commands[5]["parameters"][0] == ["是", "いいえ"]
+
+        items = json.loads((www / "data_zh" / "Items.json").read_text(encoding="utf-8"))
+        assert items[1]["name"] == "草藥"
+        # Files without text are copied untouched
+        assert (www / "data_zh" / "Tilesets.json").read_bytes() == (www / "data" / "Tilesets.json").read_bytes()
+        assert stats["files"] == 3
+        assert json.loads((www / "data" / "Items.json").read_text(encoding="utf-8"))[1]["name"] == "薬草"
+
+    def test_bakes_multi_line_keys_inside_longer_messages(self):
+        from install_plugin import bake_text_unit
+
+        params = [["A"], ["B"], ["C"], ["D"]]
+        unit = [(p, 0) for p in params]
+        dictionary = {"B\nC": "乙\n丙", "A": "甲", "C": "不應使用"}
+
+        assert bake_text_unit(unit, dictionary) == 3
+        assert [p[0] for p in params] == ["甲", "乙", "丙", "D"]
+
+    def test_manifest_lists_prebaked_data(self, tmp_path):
+        from install_plugin import prebake_data
+
+        www, translations = self._setup(tmp_path)
+        prebake_data(str(www), "zh")
+
+        manifest = json.loads((translations / "manifest.json").read_text(encoding="utf-8"))
+        assert manifest["languages"][0]["data"] == "data_zh/"
+
+    def test_removes_stale_data_files(self, tmp_path):
+        from install_plugin import prebake_data
+
+        www, _ = self._setup(tmp_path)
+        (www / "data_zh").mkdir()
+        (www / "data_zh" / "Map099.json").write_text("{}", encoding="utf-8")
+        prebake_data(str(www), "zh")
+        assert not (www / "data_zh" / "Map099.json").exists()
+
+    def test_prebake_command_via_main(self, tmp_path):
+        www, _ = self._setup(tmp_path)
+        with patch("sys.argv", ["install_plugin.py", "prebake", str(tmp_path), "--lang", "zh"]):
+            from install_plugin import main
+
+            main()
+        assert (www / "data_zh" / "Map001.json").exists()
+
+
+class TestCoverage:
+    """Tests for measure_coverage() and the coverage command."""
+
+    def _setup(self, tmp_path):
+        _make_rpg_project(tmp_path)
+        www = tmp_path / "www"
+        translations = www / "translations"
+        translations.mkdir()
+        dictionary = {"一行目\n二行目": "第一行\n第二行", "三行目": "另一行", "はい": "是", "薬草": "草藥", "村": "村莊"}
+        (translations / "zh.json").write_text(json.dumps(dictionary, ensure_ascii=False), encoding="utf-8")
+        _make_data_files(
+            www,
+            {
+                "Map001.json": _map(
+                    _event_page(
+                        (401, ["一行目"]),
+                        (401, ["二行目"]),
+                        (101, ["", 0, 0, 2]),
+                        (401, ["三行目 "]),
+                        (401, ["未翻訳"]),
+                        (102, [["はい", "いいえ"], 1]),
+                    ),
+                    display_name="村",
+                ),
+                "Map002.json": _map(_event_page((401, ["いいえ"]))),
+                "MapInfos.json": [None, {"id": 1, "name": "始まりの村"}, {"id": 2, "name": "森"}],
+                "Items.json": [None, {"name": "薬草", "description": ""}],
+                "Tilesets.json": [None, {"name": "未翻訳"}],
+            },
+        )
+        return www, translations
+
+    def test_reports_per_file_coverage_and_untranslated_texts(self, tmp_path):
+        from install_plugin import measure_coverage
+
+        www, _ = self._setup(tmp_path)
+        result = measure_coverage(str(www), "zh", jobs=1)
+
+        files = {report["file"]: report for report in result["files"]}
+        assert list(files) == ["Items.json", "Map001.json", "Map002.json"]
+        # 村, the two-line message and はい are translated; the second message
+        # only matches its trimmed first line
+        assert files["Map001.json"] == {
+            "file": "Map001.json", "units": 5, "translated": 3, "partial": 1, "untranslated": 1,
+            "coverage": 0.6, "map": 1, "name": "始まりの村",
+        }
+        assert files["Map002.json"]["coverage"] == 0.0
+        assert files["Items.json"]["coverage"] == 1.0
+        assert result["untranslated"] == [
+            {"text": "いいえ", "count": 2, "files": ["Map001.json", "Map002.json"]},
+            {"text": "未翻訳", "count": 1, "files": ["Map001.json"]},
+        ]
+        assert result["summary"]["units"] == 7
+        assert result["summary"]["translated"] == 4
+        assert result["summary"]["coverage"] == round(4 / 7, 4)
+
+    def test_repeat_runs_only_rescan_changed_files(self, tmp_path):
+        from install_plugin import COVERAGE_CACHE_NAME, measure_coverage
+
+        www, translations = self._setup(tmp_path)
+        assert measure_coverage(str(www), "zh", jobs=1)["summary"]["scanned"] == 3
+        assert (www / COVERAGE_CACHE_NAME).exists()
+        assert measure_coverage(str(www), "zh", jobs=1)["summary"]["scanned"] == 0
+
+        # A dictionary change needs no rescan; a data file change rescans only that file
+        dictionary = json.loads((translations / "zh.json").read_text(encoding="utf-8"))
+        dictionary["いいえ"] = "否"
+        (translations / "zh.json").write_text(json.dumps(dictionary, ensure_ascii=False), encoding="utf-8")
+        result = measure_coverage(str(www), "zh", jobs=1)
+        assert result["summary"]["scanned"] == 0
+        assert result["untranslated"] == [{"text": "未翻訳", "count": 1, "files": ["Map001.json"]}]
+
+        _make_data_files(www, {"Map002.json": _map(_event_page((401, ["新しい"])))})
+        result = measure_coverage(str(www), "zh", jobs=1)
+        assert result["summary"]["scanned"] == 1
+        assert {item["text"] for item in result["untranslated"]} == {"未翻訳", "新しい"}
+
+        assert measure_coverage(str(www), "zh", jobs=1, incremental=False)["summary"]["scanned"] == 3
+
+    def test_scans_on_a_process_pool(self, tmp_path):
+        from install_plugin import measure_coverage
+
+        www, _ = self._setup(tmp_path)
+        pooled = measure_coverage(str(www), "zh", jobs=2, incremental=False)
+        sequential = measure_coverage(str(www), "zh", jobs=1, incremental=False)
+        assert pooled["files"] == sequential["files"]
+        assert pooled["untranslated"] == sequential["untranslated"]
+
+    def test_coverage_command_via_main(self, tmp_path, capsys):
+        www, _ = self._setup(tmp_path)
+        (www / "data" / "Troops.json").write_text("[", encoding="utf-8")
+        report = tmp_path / "coverage.json"
+
+        with patch("sys.argv", ["install_plugin.py", "coverage", str(tmp_path), "--output", str(report), "--jobs", "1"]):
+            from install_plugin import main
+
+            assert main() == 1
+        out = capsys.readouterr().out
+        assert "Warning: failed to read data/Troops.json" in out
+        assert "4 of 7 text units translated" in out
+        result = json.loads(report.read_text(encoding="utf-8"))
+        assert result["summary"]["unreadable"] == 1
+        assert "error" in next(report for report in result["files"] if report["file"] == "Troops.json")
+
+
+class TestAggregateMissLogs:
+    """Tests for aggregate_miss_logs() and the misses command."""
+
+    def _log(self, path, languages):
+        path.write_text(json.dumps({"version": 1, "languages": languages}, ensure_ascii=False), encoding="utf-8")
+        return str(path)
+
+    def test_ranks_by_sessions_then_hits(self, tmp_path):
+        from install_plugin import aggregate_miss_logs
+
+        first = self._log(tmp_path / "a.json", {"zh": [{"text": "戦う", "count": 1}, {"text": "逃げる", "count": 50}]})
+        second = self._log(tmp_path / "b.json", {"zh": [{"text": "戦う", "count": 3}], "en": [{"text": "道具", "count": 9}]})
+
+        ranked = aggregate_miss_logs([first, second], language="zh")
+        assert ranked == [
+            {"text": "戦う", "count": 4, "sessions": 2},
+            {"text": "逃げる", "count": 50, "sessions": 1},
+        ]
+
+    def test_skips_translated_texts_and_bad_logs(self, tmp_path, capsys):
+        from install_plugin import aggregate_miss_logs
+
+        log = self._log(tmp_path / "a.json", {"zh": [{"text": "戦う", "count": 1}, {"text": "逃げる", "count": 2}]})
+        bad = tmp_path / "bad.json"
+        bad.write_text("not json", encoding="utf-8")
+
+        ranked = aggregate_miss_logs([log, str(bad)], dictionary={"逃げる": "逃跑"})
+        assert [item["text"] for item in ranked] == ["戦う"]
+        assert "skipping" in capsys.readouterr().out
+
+    def test_misses_command_writes_dictionary(self, tmp_path):
+        self._log(tmp_path / "a.json", {"zh": [{"text": "戦う", "count": 1}, {"text": "逃げる", "count": 2}]})
+        output = tmp_path / "todo.json"
+        with patch("sys.argv", ["install_plugin.py", "misses", str(tmp_path / "*.json"), "--output", str(output)]):
+            from install_plugin import main
+
+            main()
+        assert list(json.loads(output.read_text(encoding="utf-8")).items()) == [("逃げる", "逃げる"), ("戦う", "戦う")]
+
+
+class TestTranslationPack:
+    """Tests for pack_translation() and the pack command."""
+
+    FIXTURES = PROJECT_ROOT / "tests" / "fixtures"
+
+    @pytest.mark.parametrize(
+        "fixture,hash_index,encoding",
+        [("pack_sample.dtp", True, "auto"), ("pack_sample_nohash.dtp", False, "utf-8")],
+    )
+    def test_matches_fixture_read_by_plugin_tests(self, tmp_path, fixture, hash_index, encoding):
+        """The JS tests read these fixtures; the format must not drift."""
+        from install_plugin import pack_translation
+
+        dest = tmp_path / fixture
+        pack_translation(str(self.FIXTURES / "pack_sample.json"), str(dest), hash_index, encoding)
+        assert dest.read_bytes() == (self.FIXTURES / fixture).read_bytes()
+
+    def test_header_and_string_deduplication(self, tmp_path):
+        import hashlib
+
+        from install_plugin import pack_translation
+
+        source = tmp_path / "zh.json"
+        source.write_text(json.dumps({"はい": "是", "Yes": "是", "HP": "HP"}, ensure_ascii=False), encoding="utf-8")
+        header = pack_translation(str(source))
+
+        assert (tmp_path / "zh.dtp").exists()
+        assert header["entries"] == 3
+        assert header["strings"] == 4
+        assert header["buckets"] == 8
+        assert header["source_sha256"] == hashlib.sha256(source.read_bytes()).digest()
+
+    def test_picks_the_smaller_string_encoding(self, tmp_path):
+        from install_plugin import pack_translation
+
+        source = tmp_path / "zh.json"
+        source.write_text(json.dumps({"いいえ": "不是", "攻撃力": "攻擊力"}, ensure_ascii=False), encoding="utf-8")
+        assert pack_translation(str(source))["encoding"] == "utf-16"
+        assert pack_translation(str(source), encoding="utf-8")["encoding"] == "utf-8"
+
+        source.write_text(json.dumps({"Yes": "Oui", "No": "Non"}), encoding="utf-8")
+        assert pack_translation(str(source))["encoding"] == "utf-8"
+
+    def test_rejects_non_string_values(self, tmp_path):
+        from install_plugin import TranslationFileError, pack_translation
+
+        source = tmp_path / "zh.json"
+        source.write_text('{"a": 1}', encoding="utf-8")
+        with pytest.raises(TranslationFileError):
+            pack_translation(str(source))
+        assert not (tmp_path / "zh.dtp").exists()
+
+    def test_manifest_lists_pack_while_current(self, tmp_path, capsys):
+        from install_plugin import pack_translation, write_manifest
+
+        source = tmp_path / "zh.json"
+        source.write_text(json.dumps({"はい": "是"}, ensure_ascii=False), encoding="utf-8")
+        pack_translation(str(source))
+        assert write_manifest(str(tmp_path))["languages"][0]["pack"] == "zh.dtp"
+
+        source.write_text(json.dumps({"はい": "是的"}, ensure_ascii=False), encoding="utf-8")
+        assert "pack" not in write_manifest(str(tmp_path))["languages"][0]
+        assert "out of date" in capsys.readouterr().out
+
+    def test_pack_command_via_main(self, tmp_path):
+        _make_rpg_project(tmp_path)
+        translations = tmp_path / "www" / "translations"
+        translations.mkdir()
+        for code in ("zh", "en"):
+            (translations / f"{code}.json").write_text(json.dumps({"はい": code}), encoding="utf-8")
+
+        with patch("sys.argv", ["install_plugin.py", "pack", str(tmp_path)]):
+            from install_plugin import main
+
+            main()
+        manifest = json.loads((translations / "manifest.json").read_text(encoding="utf-8"))
+        assert [entry["pack"] for entry in manifest["languages"]] == ["en.dtp", "zh.dtp"]
+
+
+class TestCompressTranslations:
+    """Tests for compress_translation() and the compress command."""
+
+    def test_gzip_copy_inflates_to_source(self, tmp_path):
+        import gzip
+
+        from install_plugin import compress_translation
+
+        source = tmp_path / "zh.json"
+        source.write_text(json.dumps({f"テキスト{i}": f"文字{i}" for i in range(2000)}, ensure_ascii=False),
+                          encoding="utf-8")
+        sizes = compress_translation(str(source))
+
+        compressed = tmp_path / "zh.json.gz"
+        assert sizes == {"gzip": compressed.stat().st_size}
+        assert gzip.decompress(compressed.read_bytes()) == source.read_bytes()
+        assert sizes["gzip"] < source.stat().st_size
+
+    def test_gzip_copy_is_reproducible(self, tmp_path):
+        from install_plugin import compress_translation
+
+        source = tmp_path / "zh.json"
+        source.write_text(json.dumps({"はい": "是"}, ensure_ascii=False), encoding="utf-8")
+        compress_translation(str(source))
+        first = (tmp_path / "zh.json.gz").read_bytes()
+        compress_translation(str(source))
+        assert (tmp_path / "zh.json.gz").read_bytes() == first
+
+    def test_manifest_lists_compressed_copy_while_current(self, tmp_path, capsys):
+        from install_plugin import compress_translation, write_manifest
+
+        source = tmp_path / "zh.json"
+        source.write_text(json.dumps({"はい": "是"}, ensure_ascii=False), encoding="utf-8")
+        compress_translation(str(source))
+        assert write_manifest(str(tmp_path))["languages"][0]["compressed"] == {"gzip": "zh.json.gz"}
+
+        source.write_text(json.dumps({"はい": "是的"}, ensure_ascii=False), encoding="utf-8")
+        assert "compressed" not in write_manifest(str(tmp_path))["languages"][0]
+        assert "zh.json.gz is out of date" in capsys.readouterr().out
+
+    def test_manifest_skips_corrupt_copy(self, tmp_path, capsys):
+        from install_plugin import compress_translation, write_manifest
+
+        source = tmp_path / "zh.json"
+        source.write_text(json.dumps({"はい": "是"}, ensure_ascii=False), encoding="utf-8")
+        compress_translation(str(source))
+        compressed = tmp_path / "zh.json.gz"
+        compressed.write_bytes(compressed.read_bytes()[:-6])
+
+        assert "compressed" not in write_manifest(str(tmp_path))["languages"][0]
+        assert "failed to read zh.json.gz" in capsys.readouterr().out
+
+    def test_brotli_copy(self, tmp_path):
+        brotli = pytest.importorskip("brotli")
+        from install_plugin import compress_translation, write_manifest
+
+        source = tmp_path / "zh.json"
+        source.write_text(json.dumps({"はい": "是"}, ensure_ascii=False), encoding="utf-8")
+        compress_translation(str(source), ("gzip", "br"))
+
+        assert brotli.decompress((tmp_path / "zh.json.br").read_bytes()) == source.read_bytes()
+        assert write_manifest(str(tmp_path))["languages"][0]["compressed"] == {"gzip": "zh.json.gz", "br": "zh.json.br"}
+
+    def test_compress_command_via_main(self, tmp_path):
+        _make_rpg_project(tmp_path)
+        translations = tmp_path / "www" / "translations"
+        translations.mkdir()
+        for code in ("zh", "en"):
+            (translations / f"{code}.json").write_text(json.dumps({"はい": code}), encoding="utf-8")
+
+        with patch("sys.argv", ["install_plugin.py", "compress", str(tmp_path), "--lang", "zh"]):
+            from install_plugin import main
+
+            main()
+        manifest = json.loads((translations / "manifest.json").read_text(encoding="utf-8"))
+        assert [entry.get("compressed") for entry in manifest["languages"]] == [None, {"gzip": "zh.json.gz"}]
+        assert not (translations / "en.json.gz").exists()
+
+
+class TestValidate:
+    """Tests for validate_entry(), validate_translation_file() and the validate command."""
+
+    def _write(self, path, content):
+        path.write_text(json.dumps(content, ensure_ascii=False), encoding="utf-8")
+        return str(path)
+
+    @pytest.mark.parametrize(
+        "key,value,codes",
+        [
+            ("%1 appeared!", "%1 出現了！", []),
+            ("%1 took %2 damage!", "%1 受到了傷害！", [("placeholder", "error")]),
+            ("Gained %1", "得到了 %1 %3", [("placeholder", "error")]),
+            ("\\V[1] gold", "\\v[1] 金幣", []),
+            ("\\N[1] joined", "\\N[2] 加入了", [("escape-code", "error")]),
+            ("\\C[2]Hi\\C[0]", "嗨", [("escape-code", "warning")]),
+            ("First\nSecond", "第一第二", [("line-count", "warning")]),
+            ("Level", 5, [("value-type", "error")]),
+            ("Level", None, [("value-type", "error")]),
+        ],
+    )
+    def test_validate_entry(self, key, value, codes):
+        from install_plugin import validate_entry
+
+        assert [(code, severity) for code, severity, _ in validate_entry(key, value)] == codes
+
+    def test_counts_every_issue_but_lists_a_bounded_number(self, tmp_path):
+        from install_plugin import validate_translation_file
+
+        path = self._write(tmp_path / "zh.json", {f"%1 item {i}": f"物品 {i}" for i in range(25)})
+        report = validate_translation_file(path, max_issues=10, chunk_entries=4)
+
+        assert report["entries"] == 25
+        assert report["errors"] == 25
+        assert report["codes"] == {"placeholder": 25}
+        assert len(report["issues"]) == 10
+        assert report["truncated"] is True
+        assert report["issues"][0] == {
+            "key": "%1 item 0", "code": "placeholder", "severity": "error", "message": "missing %1"
+        }
+
+    def test_pool_matches_sequential_report(self, tmp_path):
+        from install_plugin import validate_translation_files
+
+        content = {f"%1 line {i}\nnext": (f"第 {i} 行" if i % 3 else f"%1 第 {i} 行\n下一行") for i in range(50)}
+        path = self._write(tmp_path / "zh.json", content)
+
+        sequential = validate_translation_files([path], jobs=1, chunk_entries=7)
+        pooled = validate_translation_files([path], jobs=2, chunk_entries=7)
+        assert pooled["files"] == sequential["files"]
+        assert sequential["summary"]["errors"] == 33
+
+    def test_reports_unreadable_files(self, tmp_path):
+        from install_plugin import validate_translation_file
+
+        path = tmp_path / "zh.json"
+        path.write_text('{"Level": "等級", "HP"', encoding="utf-8")
+        report = validate_translation_file(str(path))
+
+        assert report["entries"] == 1
+        assert report["error"]
+
+    def test_validate_command_prints_json_report(self, tmp_path, capsys):
+        translations = tmp_path / "translations"
+        translations.mkdir()
+        self._write(translations / "zh.json", {"Level": "等級"})
+        self._write(translations / "en.json", {"First\nSecond": "One line"})
+        self._write(translations / "manifest.json", {"version": 1, "languages": []})
+
+        with patch("sys.argv", ["install_plugin.py", "validate", str(translations), "--jobs", "1"]):
+            from install_plugin import main
+
+            assert main() == 0
+        report = json.loads(capsys.readouterr().out)
+        assert [Path(item["path"]).name for item in report["files"]] == ["en.json", "zh.json"]
+        assert report["summary"]["warnings"] == 1
+
+        with patch("sys.argv", ["install_plugin.py", "validate", str(translations), "--jobs", "1", "--strict"]):
+            assert main() == 1
+
+
+class TestMergeTranslations:
+    """Tests for merge_translation_files() and the merge command."""
+
+    def _write(self, path, content):
+        path.write_text(json.dumps(content, ensure_ascii=False), encoding="utf-8")
+        return str(path)
+
+    def _sources(self, tmp_path):
+        base = self._write(tmp_path / "base.json", {f"text {i}": f"譯文 {i}" for i in range(10)})
+        dlc = self._write(tmp_path / "dlc.json", {"text 3": "DLC 3", "dlc 1": "追加 1", "text 5": "譯文 5"})
+        patch_file = self._write(tmp_path / "patch.json", {"text 3": "修正 3", "text 7": "修正 7"})
+        return [base, dlc, patch_file]
+
+    @pytest.mark.parametrize("prefer", ["last", "first"])
+    def test_matches_in_memory_merge_across_many_runs(self, tmp_path, prefer):
+        from install_plugin import merge_translation_files
+
+        sources = self._sources(tmp_path)
+        loaded = [json.loads(Path(source).read_text(encoding="utf-8")) for source in sources]
+        expected = {}
+        for content in loaded if prefer == "last" else reversed(loaded):
+            expected.update(content)
+        # The first source's order, then new keys as they appear
+        first_seen = list(dict.fromkeys(key for content in loaded for key in content))
+
+        dest = tmp_path / "out" / "zh.json"
+        report = merge_translation_files(sources, str(dest), prefer, run_entries=2, fan_in=2)
+
+        assert json.loads(dest.read_text(encoding="utf-8")) == expected
+        assert list(json.loads(dest.read_text(encoding="utf-8"))) == first_seen
+        assert first_seen[10] == "dlc 1"
+        assert report["runs"] == 8
+        assert report["entries"] == 11
+        assert report["source_entries"] == [10, 3, 2]
+
+    def test_reports_conflicting_values(self, tmp_path):
+        from install_plugin import merge_translation_files
+
+        sources = self._sources(tmp_path)
+        report = merge_translation_files(sources, str(tmp_path / "zh.json"))
+
+        # "text 5" has the same value in both sources and is not a conflict
+        assert report["conflicts"] == 2
+        assert report["conflict_list"][0] == {
+            "key": "text 3",
+            "chosen": {"source": sources[2], "value": "修正 3"},
+            "others": [{"source": sources[0], "value": "譯文 3"}, {"source": sources[1], "value": "DLC 3"}],
+        }
+
+        report = merge_translation_files(sources, str(tmp_path / "zh.json"), max_conflicts=1)
+        assert report["conflicts"] == 2
+        assert len(report["conflict_list"]) == 1
+        assert report["truncated"] is True
+
+    def test_repeated_key_in_one_source_keeps_last_value(self, tmp_path):
+        from install_plugin import merge_translation_files
+
+        source = tmp_path / "base.json"
+        source.write_text('{"Level": "等級", "HP": "生命", "Level": "級別"}', encoding="utf-8")
+        report = merge_translation_files([str(source)], str(tmp_path / "zh.json"), run_entries=1)
+
+        merged = json.loads((tmp_path / "zh.json").read_text(encoding="utf-8"))
+        assert merged == {"Level": "級別", "HP": "生命"}
+        assert list(merged) == ["Level", "HP"]
+        assert report["conflicts"] == 0
+
+    def test_invalid_source_leaves_output_untouched(self, tmp_path):
+        from install_plugin import TranslationFileError, merge_translation_files
+
+        dest = tmp_path / "zh.json"
+        dest.write_text('{"old": "舊"}', encoding="utf-8")
+        bad = self._write(tmp_path / "bad.json", {"Level": 5})
+
+        with pytest.raises(TranslationFileError):
+            merge_translation_files([self._sources(tmp_path)[0], bad], str(dest))
+        assert dest.read_text(encoding="utf-8") == '{"old": "舊"}'
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["bad.json", "base.json", "dlc.json", "patch.json", "zh.json"]
+
+    def test_merge_command_writes_each_language_and_manifest(self, tmp_path):
+        project = _make_rpg_project(tmp_path)
+        base, dlc, _ = self._sources(tmp_path)
+        english = self._write(tmp_path / "en.json", {"text 1": "Text 1"})
+        report_path = tmp_path / "report.json"
+
+        argv = ["install_plugin.py", "merge", str(project), "--lang", "zh", base, dlc, "--lang", "en", english,
+                "--report", str(report_path)]
+        with patch("sys.argv", argv):
+            from install_plugin import main
+
+            assert main() == 0
+
+        translations = project / "www" / "translations"
+        assert json.loads((translations / "zh.json").read_text(encoding="utf-8"))["text 3"] == "DLC 3"
+        assert json.loads((translations / "en.json").read_text(encoding="utf-8")) == {"text 1": "Text 1"}
+        manifest = json.loads((translations / "manifest.json").read_text(encoding="utf-8"))
+        assert [entry["code"] for entry in manifest["languages"]] == ["en", "zh"]
+        assert json.loads(report_path.read_text(encoding="utf-8"))["zh"]["conflicts"] == 1